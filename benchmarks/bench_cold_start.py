@@ -0,0 +1,148 @@
+# benchmarks/bench_cold_start.py
+"""
+Cold start of the dashboard: import time budget and time to first paint.
+
+Each run launches a fresh interpreter that does what src/main_app.py does on
+launch and records, from the first line of the probe:
+
+    import_main_app_ms       import src.main_app
+    qapplication_ms          QApplication created
+    create_db_and_tables_ms  database checked (already set up, as on every launch after the first)
+    dashboard_init_ms        ContractorProEstimator() built
+    first_paint_ms           first paint event of the dashboard (offscreen platform)
+
+plus process_ms, the wall time from spawning the interpreter until it
+exits right after the first paint. The probe also lists which of
+DEFERRED_MODULES were imported; none of them should be needed before the
+dashboard appears.
+
+The run fails (exit status 1) when the p50 import time of src.main_app is
+over --budget-ms or when a deferred module was imported on the way to the
+first paint, so it can guard against regressions in CI.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--repeat 10] [--projects 500] [--budget-ms 1000] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bench_hot_paths import build_database, summarize
+
+IMPORT_BUDGET_MS = 1000.0
+
+# Only needed once the user exports a PDF or opens one of the other windows
+DEFERRED_MODULES = (
+    'reportlab',
+    'src.pdf_generator', 'src.pdf_worker', 'src.pdf_cache',
+    'src.estimate_line_items_view', 'src.general_info_view',
+    'src.manage_common_data_view', 'src.diagnostics_dialog', 'src.takeoff_importer',
+    'src.clone_project_dialog', 'src.project_cloner',
+)
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+marks = {{}}
+def mark(name):
+    marks[name] = (time.perf_counter() - start) * 1000
+sys.path.append({root!r})
+import src.main_app as main_app
+mark('import_main_app_ms')
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+mark('qapplication_ms')
+main_app.create_db_and_tables()
+mark('create_db_and_tables_ms')
+window = main_app.ContractorProEstimator()
+mark('dashboard_init_ms')
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and 'first_paint_ms' not in marks:
+            mark('first_paint_ms')
+            QTimer.singleShot(0, app.quit)
+        return False
+
+first_paint = FirstPaint()
+app.installEventFilter(first_paint)
+QTimer.singleShot(10000, app.quit) # Never hang if no paint arrives
+window.show()
+app.exec()
+marks['deferred_imported'] = sorted({{d for d in {deferred!r} for m in sys.modules if m == d or m.startswith(d + '.')}})
+window.close()
+print(json.dumps(marks))
+"""
+
+
+def run_probe(env):
+    out = subprocess.run([sys.executable, '-c', PROBE.format(root=ROOT, deferred=DEFERRED_MODULES)],
+                         env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--projects', type=int, default=500)
+    parser.add_argument('--line-items', type=int, default=20, help="Line items per project")
+    parser.add_argument('--budget-ms', type=float, default=IMPORT_BUDGET_MS, help="Budget for the p50 import of src.main_app")
+    parser.add_argument('--output', help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['CONTRACTORPRO_DB_PATH'] = os.path.join(tmp, 'cold_start.db')
+        os.environ['CONTRACTORPRO_METRICS_LOG'] = os.path.join(tmp, 'actions.jsonl')
+        build_database(args.projects, args.line_items, seed=42)
+        env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+
+        run_probe(env) # Warm the OS file cache; a cold disk is not what we measure
+        probes = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            probe = run_probe(env)
+            probe['process_ms'] = (time.perf_counter() - start) * 1000
+            probes.append(probe)
+
+    results = {}
+    for name in ('import_main_app_ms', 'qapplication_ms', 'create_db_and_tables_ms', 'dashboard_init_ms',
+                 'first_paint_ms', 'process_ms'):
+        values = [probe[name] for probe in probes if name in probe]
+        if not values:
+            print(f"{name:26} never reached")
+            continue
+        results[name] = summarize(values)
+        print(f"{name:26} p50 {results[name]['p50_ms']:9.1f} ms   p95 {results[name]['p95_ms']:9.1f} ms")
+
+    deferred_imported = sorted({m for probe in probes for m in probe['deferred_imported']})
+    import_p50 = results['import_main_app_ms']['p50_ms']
+    failures = []
+    if import_p50 > args.budget_ms:
+        failures.append(f"import src.main_app p50 {import_p50:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    if deferred_imported:
+        failures.append(f"imported before the first paint: {', '.join(deferred_imported)}")
+    print()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print(f"OK: import src.main_app p50 {import_p50:.1f} ms (budget {args.budget_ms:.0f} ms), no deferred modules imported")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'results': results, 'deferred_imported': deferred_imported, 'budget_ms': args.budget_ms,
+                       'projects': args.projects, 'line_items_per_project': args.line_items}, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
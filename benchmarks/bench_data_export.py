@@ -0,0 +1,91 @@
+# benchmarks/bench_data_export.py
+"""
+Times the streaming data export (src/data_export.py) and checks its memory stays flat.
+
+A scratch database with N projects x M line items is generated, then each
+dataset is exported to CSV and JSON lines with the read-only 'reporting'
+connection profile, as python -m src.data_export does. For every export the
+wall time, rows per second and the tracemalloc peak are reported; the peak
+of exporting one project is shown next to the peak of exporting all of them,
+and the two should be about the same however many rows the whole export has.
+(Process RSS is not a good measure here: the reporting profile memory-maps
+the database file, so its pages count towards RSS as they are read.)
+
+Usage:
+    python benchmarks/bench_data_export.py [--projects 200] [--line-items 5000] [--repeat 1] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bench_hot_paths import build_database, summarize
+
+
+def run_export(export_data, bind, dataset, path, project_ids, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        summary = export_data(dataset, path, project_ids=project_ids, bind=bind)
+        timings.append((time.perf_counter() - start) * 1000)
+    result = summarize(timings)
+    tracemalloc.start()
+    try:
+        export_data(dataset, path, project_ids=project_ids, bind=bind)
+        result['tracemalloc_peak_kib'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+    result['rows'] = summary['rows']
+    result['rows_per_second'] = round(summary['rows'] / (result['p50_ms'] / 1000)) if result['p50_ms'] else None
+    result['mib'] = round(os.path.getsize(path) / 1024 / 1024, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--line-items', type=int, default=5000, help="Line items per project")
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--output', help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['CONTRACTORPRO_DB_PATH'] = os.path.join(tmp, 'export.db')
+        start = time.perf_counter()
+        build_database(args.projects, args.line_items, seed=42)
+        print(f"Generated {args.projects} projects x {args.line_items} line items "
+              f"in {time.perf_counter() - start:.1f} s\n")
+
+        from src.database import DATABASE_PATH, create_sqlite_engine
+        from src.data_export import export_data
+        bind = create_sqlite_engine(DATABASE_PATH, profile='reporting')
+
+        results = {}
+        for dataset in ('projects', 'line_items'):
+            for fmt in ('csv', 'jsonl'):
+                for scope, project_ids in (('one_project', [1]), ('all', None)):
+                    name = f"{dataset}_{fmt}_{scope}"
+                    path = os.path.join(tmp, f"{name}.{fmt}")
+                    result = run_export(export_data, bind, dataset, path, project_ids, args.repeat)
+                    os.remove(path)
+                    results[name] = result
+                    print(f"{name:28} {result['rows']:9} rows  p50 {result['p50_ms']:10.1f} ms  "
+                          f"{result['rows_per_second'] or 0:9,} rows/s  {result['mib']:7.1f} MiB  "
+                          f"peak {result['tracemalloc_peak_kib']:9.1f} KiB")
+        bind.dispose()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'projects': args.projects, 'line_items_per_project': args.line_items, 'results': results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
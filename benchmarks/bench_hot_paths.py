@@ -0,0 +1,306 @@
+# benchmarks/bench_hot_paths.py
+"""
+Times the estimator's hot paths on synthetic data, headlessly.
+
+A scratch database with N projects x M line items is generated (see
+synthetic_data.py), then the real window code runs under the offscreen Qt
+platform:
+
+    dashboard_load_projects       ContractorProEstimator.load_projects()
+    open_line_items               EstimateLineItemsWindow(...) for one project
+    load_line_items               EstimateLineItemsWindow.load_line_items()
+    calculate_and_display_totals  EstimateLineItemsWindow.calculate_and_display_totals()
+    export_estimate_to_pdf        EstimateLineItemsWindow.export_estimate_to_pdf() until the worker finishes
+                                  (file dialog answered automatically)
+    render_pdf_in_memory          generate_pdf_estimate() into a BytesIO, without the UI
+    render_pdf_cached             render_pdf_cached() of an unchanged estimate: cache key and file copy
+    enter_line_items_immediate    --entry-rows line items typed in one by one, each committed on its own
+    enter_line_items_staged       the same rows staged (Stage edits until Save) and saved in one transaction
+    create_db_and_tables          first start on an empty database, in a fresh interpreter per run
+
+Each scenario reports p50/p95/min/max wall time, the queries and rows of one
+run (from src.instrumentation) and the tracemalloc peak of one extra run.
+Results are written as JSON so runs on different versions can be compared.
+
+Usage:
+    python benchmarks/bench_hot_paths.py [--projects 200] [--line-items 1000] [--repeat 20]
+                                         [--only load_line_items,...] [--output results.json]
+                                         [--compare previous.json]
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+SEED_PROBE = """
+import json, sys, time, tracemalloc
+sys.path.append({root!r})
+tracemalloc.start()
+import src.database as database
+start = time.perf_counter()
+database.create_db_and_tables()
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'peak_kib': tracemalloc.get_traced_memory()[1] / 1024}}))
+"""
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(timings_ms):
+    return {
+        'runs': len(timings_ms),
+        'p50_ms': round(percentile(timings_ms, 50), 3),
+        'p95_ms': round(percentile(timings_ms, 95), 3),
+        'min_ms': round(min(timings_ms), 3),
+        'max_ms': round(max(timings_ms), 3),
+        'mean_ms': round(statistics.fmean(timings_ms), 3),
+    }
+
+
+def measure(name, func, repeat, warmup=1):
+    """Times func() `repeat` times after a warm-up, then measures one more run for queries and memory."""
+    from src.instrumentation import track_action
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    result = summarize(timings)
+
+    with track_action(f"bench:{name}") as stats:
+        func()
+    if stats is not None:
+        result['queries'] = stats.queries
+        result['rows'] = stats.rows
+
+    tracemalloc.start()
+    try:
+        func()
+        result['tracemalloc_peak_kib'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+    print(f"{name:30} p50 {result['p50_ms']:9.2f} ms   p95 {result['p95_ms']:9.2f} ms   "
+          f"queries {result.get('queries', '-'):>5}   peak {result['tracemalloc_peak_kib']:9.1f} KiB")
+    return result
+
+
+def measure_seed(repeat, tmp_dir):
+    """create_db_and_tables() on a new database file, each run in a fresh interpreter."""
+    timings, peaks = [], []
+    for run in range(repeat):
+        env = dict(os.environ, CONTRACTORPRO_DB_PATH=os.path.join(tmp_dir, f"seed_{run}.db"))
+        out = subprocess.run([sys.executable, '-c', SEED_PROBE.format(root=ROOT)],
+                             env=env, capture_output=True, text=True, check=True).stdout
+        probe = json.loads(out.strip().splitlines()[-1])
+        timings.append(probe['ms'])
+        peaks.append(probe['peak_kib'])
+    result = summarize(timings)
+    result['tracemalloc_peak_kib'] = round(max(peaks), 1)
+    print(f"{'create_db_and_tables':30} p50 {result['p50_ms']:9.2f} ms   p95 {result['p95_ms']:9.2f} ms   "
+          f"queries {'-':>5}   peak {result['tracemalloc_peak_kib']:9.1f} KiB")
+    return result
+
+
+def build_database(projects, line_items, seed):
+    from src import database
+    from synthetic_data import generate_dataset
+    bulk_engine = database.create_sqlite_engine(database.DATABASE_PATH, profile='bulk-load')
+    database.Base.metadata.create_all(bulk_engine)
+    database.ensure_indexes(bulk_engine)
+    database.ensure_project_search_index(bulk_engine)
+    counts = generate_dataset(bulk_engine, projects, line_items, seed)
+    # Stamped as fully set up, so the app skips its own seeding
+    database.set_schema_version(database.SCHEMA_VERSION, bulk_engine)
+    bulk_engine.dispose()
+    return counts
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def max_rss_kib():
+    try:
+        import resource
+    except ImportError: # Not available on Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss # bytes on macOS, KiB elsewhere
+
+
+def compare(previous_path, current):
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+    print(f"\nCompared with {previous_path} ({previous['meta'].get('git_commit')}):")
+    for name, result in current['results'].items():
+        old = previous['results'].get(name)
+        if not old:
+            continue
+        delta = (result['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0.0
+        print(f"{name:30} p50 {old['p50_ms']:9.2f} -> {result['p50_ms']:9.2f} ms ({delta:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--line-items', type=int, default=1000, help="Line items per project")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--pdf-repeat', type=int, default=5)
+    parser.add_argument('--entry-rows', type=int, default=200, help="Line items typed in per run of the enter_line_items scenarios")
+    parser.add_argument('--entry-repeat', type=int, default=5)
+    parser.add_argument('--seed-repeat', type=int, default=5, help="Runs of the create_db_and_tables scenario")
+    parser.add_argument('--only', help="Comma-separated scenario names")
+    parser.add_argument('--output', help="Where to write the JSON results (default: benchmarks/results/)")
+    parser.add_argument('--compare', help="Previous results JSON to compare against")
+    args = parser.parse_args()
+    only = set(args.only.split(',')) if args.only else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before src.database is imported: the engine is bound at import
+        os.environ['CONTRACTORPRO_DB_PATH'] = os.path.join(tmp, 'bench.db')
+        os.environ['CONTRACTORPRO_METRICS_LOG'] = os.path.join(tmp, 'actions.jsonl')
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        # Every export scenario must really render; render_pdf_cached uses its own cache below
+        os.environ['CONTRACTORPRO_PDF_CACHE_MB'] = '0'
+
+        start = time.perf_counter()
+        counts = build_database(args.projects, args.line_items, args.seed)
+        print(f"Generated {counts['projects']} projects x {args.line_items} line items "
+              f"in {time.perf_counter() - start:.1f} s\n")
+
+        from PySide6.QtWidgets import QApplication, QMessageBox, QFileDialog
+        app = QApplication.instance() or QApplication([])
+        for name in ('information', 'warning', 'critical'):
+            setattr(QMessageBox, name, staticmethod(lambda *a, **k: QMessageBox.Ok))
+        QMessageBox.question = staticmethod(lambda *a, **k: QMessageBox.Yes)
+        pdf_path = os.path.join(tmp, 'estimate.pdf')
+        QFileDialog.getSaveFileName = staticmethod(lambda *a, **k: (pdf_path, 'PDF Files (*.pdf)'))
+
+        from src.database import create_db_and_tables
+        from src.main_app import ContractorProEstimator
+        from src.estimate_line_items_view import EstimateLineItemsWindow
+        from src.estimate_loader import load_estimate, pdf_payload
+        from src.pdf_generator import generate_pdf_estimate
+        from src.pdf_cache import PdfCache, render_pdf_cached
+        create_db_and_tables()
+
+        dashboard = ContractorProEstimator()
+        project_id = max(1, args.projects // 2)
+        line_items_window = EstimateLineItemsWindow(project_id=project_id, db_session=dashboard.db_session)
+
+        def open_line_items():
+            window = EstimateLineItemsWindow(project_id=project_id, db_session=dashboard.db_session)
+            window.deleteLater()
+            app.processEvents()
+
+        def export_estimate_to_pdf():
+            # The render runs on a worker thread; wait for it like the user would
+            line_items_window.export_estimate_to_pdf()
+            while line_items_window.pdf_export_task is not None:
+                app.processEvents()
+                time.sleep(0.001)
+
+        # The renderer alone, into memory: no dialog, database or worker thread involved
+        pdf_data = pdf_payload(load_estimate(dashboard.db_session, project_id))
+
+        def render_pdf_in_memory():
+            generate_pdf_estimate(*pdf_data, io.BytesIO())
+
+        pdf_cache = PdfCache(os.path.join(tmp, 'pdf_cache'), max_bytes=64 * 1024 * 1024)
+        cached_pdf_path = os.path.join(tmp, 'cached.pdf')
+
+        def render_pdf_cached_scenario():
+            render_pdf_cached(*pdf_data, cached_pdf_path, cache=pdf_cache)
+
+        # Typing in a takeoff on another project, so the line items of the measured one stay put
+        entry_window = EstimateLineItemsWindow(project_id=1 if project_id != 1 else 2, db_session=dashboard.db_session)
+        entry_window.clear_form()
+
+        def enter_line_items(staged):
+            entry_window.stage_edits_checkbox.setChecked(staged)
+            for n in range(args.entry_rows):
+                entry_window.description_input.setText(f"Takeoff line {n + 1}")
+                entry_window.quantity_input.setValue(n % 9 + 1)
+                entry_window.unit_input.setText('EA')
+                entry_window.unit_cost_input.setValue(12.5)
+                entry_window.markup_percentage_input.setValue(10.0)
+                entry_window.add_or_update_line_item()
+            if staged:
+                entry_window.save_staged_changes()
+
+        scenarios = [
+            ('dashboard_load_projects', dashboard.load_projects, args.repeat),
+            ('open_line_items', open_line_items, args.repeat),
+            ('load_line_items', line_items_window.load_line_items, args.repeat),
+            ('calculate_and_display_totals', line_items_window.calculate_and_display_totals, args.repeat),
+            ('export_estimate_to_pdf', export_estimate_to_pdf, args.pdf_repeat),
+            ('render_pdf_in_memory', render_pdf_in_memory, args.pdf_repeat),
+            ('render_pdf_cached', render_pdf_cached_scenario, args.repeat), # The warm-up run fills the cache
+            ('enter_line_items_immediate', lambda: enter_line_items(False), args.entry_repeat),
+            ('enter_line_items_staged', lambda: enter_line_items(True), args.entry_repeat),
+        ]
+        results = {}
+        for name, func, repeat in scenarios:
+            if only is None or name in only:
+                results[name] = measure(name, func, repeat)
+        if only is None or 'create_db_and_tables' in only:
+            results['create_db_and_tables'] = measure_seed(args.seed_repeat, tmp)
+
+        line_items_window.close()
+        entry_window.close()
+        dashboard.close()
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sqlite': sqlite3.sqlite_version,
+            'projects': args.projects,
+            'line_items_per_project': args.line_items,
+            'seed': args.seed,
+            'max_rss_kib': max_rss_kib(),
+        },
+        'results': results,
+    }
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"hot_paths-{time.strftime('%Y%m%d-%H%M%S')}-{report['meta']['git_commit'] or 'nogit'}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_pdf_large_tables.py
+"""
+Compares the classic and large-table PDF layouts as estimates grow.
+
+Each size is rendered into memory in both modes (see
+EstimatePdfTemplate.large_table_threshold). The classic layout measures every
+cell of one Table and splits it across pages, so its time per line item
+rises with the size of the estimate; the large-table layout should stay flat.
+Line items are fed to the large-table render from a generator, as a caller
+streaming rows would. The tracemalloc peak of each render is reported too.
+
+Usage:
+    python benchmarks/bench_pdf_large_tables.py [--line-items 500 2000 8000] [--classic-max 8000] [--output results.json]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from bench_pdf_template import PROJECT_DATA
+
+SUMMARY = {'total_direct_cost': 1000.0, 'markup_percentage': 10.0}
+
+
+def line_items(count):
+    for n in range(count):
+        yield {'description': f"Custom work item {n + 1} for Concrete - Formwork {n % 8 + 1}" + " (phase 2)" * (n % 3),
+               'category': 'Material', 'uom': 'EA', 'quantity': float(n % 9 + 1), 'unit_cost': 12.5,
+               'total': (n % 9 + 1) * 12.5 * 1.1}
+
+
+def render(count, large_table):
+    from src.pdf_generator import generate_pdf_estimate
+    items = line_items(count) if large_table else list(line_items(count))
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        stats = generate_pdf_estimate(PROJECT_DATA, items, SUMMARY, io.BytesIO(), large_table=large_table)
+        seconds = time.perf_counter() - start
+        peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+    return {'pages': stats['pages'], 'bytes': stats['bytes'], 'ms': round(seconds * 1000, 1),
+            'ms_per_line_item': round(seconds * 1000 / count, 4), 'tracemalloc_peak_kib': round(peak_kib, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--line-items', type=int, nargs='+', default=[500, 2000, 8000])
+    parser.add_argument('--classic-max', type=int, default=8000, help="Skip the classic layout above this many line items")
+    parser.add_argument('--output', help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    results = {}
+    for count in args.line_items:
+        modes = [('large_table', True)] + ([('classic', False)] if count <= args.classic_max else [])
+        for name, large_table in modes:
+            result = render(count, large_table)
+            results.setdefault(str(count), {})[name] = result
+            print(f"{count:7} line items  {name:12} {result['pages']:5} pages  {result['ms']:10.1f} ms  "
+                  f"{result['ms_per_line_item']:7.3f} ms/item   peak {result['tracemalloc_peak_kib']:9.1f} KiB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_pdf_template.py
+"""
+Measures the per-render overhead of the PDF template on small estimates.
+
+Small estimates (a handful of line items) are rendered into memory two ways:
+with a new EstimatePdfTemplate for every render, which rebuilds the sample
+stylesheet, paragraph styles and table styles as every export used to, and
+with the shared template from get_default_template(). The difference is the
+overhead the cached template saves on each export. The import cost of
+src.pdf_generator is measured in a fresh interpreter as well; it no longer
+registers fonts, so producing no PDF costs no font loading.
+
+Usage:
+    python benchmarks/bench_pdf_template.py [--line-items 5 25 100] [--repeat 200] [--output results.json]
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bench_hot_paths import summarize
+
+IMPORT_PROBE = """
+import json, sys, time
+sys.path.append({root!r})
+start = time.perf_counter()
+import src.pdf_generator as pdf_generator
+print(json.dumps({{'import_ms': (time.perf_counter() - start) * 1000, 'fonts_registered': pdf_generator._fonts_registered}}))
+"""
+
+PROJECT_DATA = {
+    'project_id': 1, 'project_name': 'Kitchen Remodel #00001', 'project_address': '12 Main St, Springfield, IL, 62701',
+    'estimate_date': '2025-03-01', 'bid_due_date': '2025-03-15', 'project_start_date': '2025-04-01',
+    'completion_date': '2025-06-30', 'client_name': 'Smith Family Trust', 'client_contact': 'Jane Smith',
+    'client_phone': '555-123-4567', 'client_email': 'jane@example.com', 'client_address': '98 Oak Ave, Springfield, IL, 62701',
+    'scope_of_work': 'Remove existing cabinets and counters, install new cabinets, counters and tile backsplash.',
+    'project_notes': 'Owner supplies appliances.',
+}
+
+
+def line_items(count):
+    return [
+        {'description': f"Line item {n + 1}", 'category': 'Material', 'uom': 'EA',
+         'quantity': float(n % 9 + 1), 'unit_cost': 12.5, 'total': (n % 9 + 1) * 12.5 * 1.1}
+        for n in range(count)
+    ]
+
+
+def time_renders(render, repeat):
+    render() # Warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        timings.append((time.perf_counter() - start) * 1000)
+    return summarize(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--line-items', type=int, nargs='+', default=[5, 25, 100])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--output', help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    probe = json.loads(subprocess.run([sys.executable, '-c', IMPORT_PROBE.format(root=ROOT)],
+                                      capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1])
+    print(f"import src.pdf_generator: {probe['import_ms']:.1f} ms (fonts registered at import: {probe['fonts_registered']})\n")
+
+    from src.pdf_generator import EstimatePdfTemplate, generate_pdf_estimate
+    summary = {'total_direct_cost': 1000.0, 'markup_percentage': 10.0}
+    results = {'import': probe, 'renders': {}}
+    # Styles, table styles and fonts alone: what every render paid before the template was shared
+    results['template_build'] = time_renders(lambda: EstimatePdfTemplate().styles, args.repeat)
+    print(f"template build: p50 {results['template_build']['p50_ms']:.3f} ms (p95 {results['template_build']['p95_ms']:.3f})\n")
+    for count in args.line_items:
+        items = line_items(count)
+        fresh = time_renders(lambda: generate_pdf_estimate(PROJECT_DATA, items, summary, io.BytesIO(),
+                                                           template=EstimatePdfTemplate()), args.repeat)
+        shared = time_renders(lambda: generate_pdf_estimate(PROJECT_DATA, items, summary, io.BytesIO()), args.repeat)
+        saved = fresh['p50_ms'] - shared['p50_ms']
+        results['renders'][str(count)] = {'fresh_template': fresh, 'shared_template': shared, 'saved_p50_ms': round(saved, 3)}
+        print(f"{count:5} line items: fresh template p50 {fresh['p50_ms']:7.2f} ms (p95 {fresh['p95_ms']:7.2f})   "
+              f"shared p50 {shared['p50_ms']:7.2f} ms (p95 {shared['p95_ms']:7.2f})   saved {saved:6.2f} ms/render")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_project_clone.py
+"""
+Times set-based project cloning (src/project_cloner.py) against an ORM copy.
+
+A scratch database is generated with --line-items line items per project.
+Project 1 is then copied repeatedly, once with clone_project (INSERT ...
+SELECT, with quantities scaled and markups reset so the transforms are
+measured too) and once the ORM way, loading every line item and adding a
+new LineItem object per row. Wall time and query counts are reported for
+both; clone_project's should stay a handful of statements whatever the
+number of line items.
+
+Usage:
+    python benchmarks/bench_project_clone.py [--line-items 10000] [--repeat 5] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bench_hot_paths import build_database, summarize
+
+COPIED_FIELDS = ('description', 'quantity', 'unit', 'unit_cost', 'markup_percentage', 'total_cost', 'notes',
+                 'is_common_item', 'common_item_id', 'cost_code_id')
+
+
+def orm_clone(Session, Project, LineItem, source_id, name):
+    # The straightforward copy clone_project replaces: every line item becomes two Python objects
+    session = Session()
+    try:
+        source = session.get(Project, source_id)
+        columns = [c.name for c in Project.__table__.columns if c.name not in ('id', 'project_name')]
+        copy = Project(project_name=name, **{c: getattr(source, c) for c in columns})
+        copy.line_items = [LineItem(**{f: getattr(item, f) * 1.1 if f == 'quantity' else getattr(item, f)
+                                       for f in COPIED_FIELDS})
+                           for item in source.line_items]
+        session.add(copy)
+        session.commit()
+    finally:
+        session.close()
+
+
+def run(label, clone, repeat, track_action):
+    timings = []
+    for n in range(repeat):
+        start = time.perf_counter()
+        clone(f"{label} {n}")
+        timings.append((time.perf_counter() - start) * 1000)
+    result = summarize(timings)
+    with track_action(f"bench:{label}") as tracked:
+        clone(f"{label} tracked")
+    if tracked is not None:
+        result['queries'] = tracked.queries
+    print(f"{label:14} p50 {result['p50_ms']:9.1f} ms   p95 {result['p95_ms']:9.1f} ms   "
+          f"queries {result.get('queries', '-')}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--line-items', type=int, default=10000, help="Line items in the project being copied")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['CONTRACTORPRO_DB_PATH'] = os.path.join(tmp, 'clone.db')
+        os.environ['CONTRACTORPRO_METRICS_LOG'] = os.path.join(tmp, 'actions.jsonl')
+        build_database(2, args.line_items, seed=42)
+        print(f"Copying a project with {args.line_items} line items\n")
+
+        from sqlalchemy import select, func
+        from src.database import engine, Session, Project, LineItem
+        from src.instrumentation import track_action
+        from src.project_cloner import clone_project
+
+        results = {
+            'clone_project': run('clone_project', lambda name: clone_project(
+                1, name, quantity_factor=1.1, markup_percentage=10.0), args.repeat, track_action),
+            'orm_copy': run('orm_copy', lambda name: orm_clone(Session, Project, LineItem, 1, name),
+                            args.repeat, track_action),
+        }
+        with engine.connect() as connection:
+            copied = connection.execute(
+                select(func.count()).select_from(LineItem).join(Project)
+                .where(Project.project_name == 'clone_project tracked')
+            ).scalar()
+        assert copied == args.line_items, copied
+        engine.dispose()
+
+    speedup = results['orm_copy']['p50_ms'] / results['clone_project']['p50_ms']
+    print(f"\nclone_project is {speedup:.1f}x faster than the ORM copy")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'line_items': args.line_items, 'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
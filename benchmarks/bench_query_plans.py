@@ -0,0 +1,90 @@
+# benchmarks/bench_query_plans.py
+"""
+Shows the query plans of the hot line item queries before and after ensure_indexes().
+
+A scratch database is built with the current schema, its indexes are dropped
+to mimic a database created before they existed, and then each query is
+explained and timed. ensure_indexes() is run and everything is repeated, so
+the plans can be seen switching from SCAN to SEARCH.
+
+Usage:
+    python benchmarks/bench_query_plans.py [--projects 200] [--line-items 100]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sqlalchemy import text
+from src.database import Base, create_sqlite_engine, ensure_indexes
+
+HOT_QUERIES = {
+    'load_line_items': "SELECT * FROM line_items WHERE project_id = :pid",
+    'totals': "SELECT SUM(quantity * unit_cost), SUM(quantity * unit_cost * (1 + markup_percentage / 100)) FROM line_items WHERE project_id = :pid",
+    'delete_cost_code': "SELECT id FROM line_items WHERE cost_code_id = :cid",
+    'delete_common_item': "SELECT id FROM line_items WHERE common_item_id = :ciid",
+}
+
+
+def populate(engine, projects, line_items):
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO common_items (id, name) VALUES (:id, :name)"),
+                     [{'id': i, 'name': f"Item {i}"} for i in range(1, 51)])
+        conn.execute(text("INSERT INTO cost_codes (id, code, name) VALUES (:id, :code, :name)"),
+                     [{'id': i, 'code': f"{i:02d} 00 00", 'name': f"Code {i}"} for i in range(1, 51)])
+        conn.execute(text("INSERT INTO projects (id, project_name) VALUES (:id, :name)"),
+                     [{'id': i, 'name': f"Project {i}"} for i in range(1, projects + 1)])
+        conn.execute(
+            text("INSERT INTO line_items (project_id, description, quantity, unit_cost, markup_percentage, cost_code_id, common_item_id) "
+                 "VALUES (:pid, 'item', :q, :c, :m, :cid, :ciid)"),
+            [
+                {'pid': pid, 'q': rng.uniform(1, 100), 'c': rng.uniform(1, 500), 'm': rng.choice([0, 10, 15, 20]),
+                 'cid': rng.randint(1, 50), 'ciid': rng.randint(1, 50)}
+                for pid in range(1, projects + 1) for _ in range(line_items)
+            ],
+        )
+
+
+def report(engine, label, projects, repeat=50):
+    print(f"\n== {label} ==")
+    params = {'pid': projects // 2, 'cid': 7, 'ciid': 7}
+    with engine.connect() as conn:
+        for name, sql in HOT_QUERIES.items():
+            plan = [row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql), params)]
+            start = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(text(sql), params).fetchall()
+            elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+            print(f"{name:20s} {elapsed_ms:8.3f} ms  {' | '.join(plan)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--line-items', type=int, default=100, help="Line items per project")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(os.path.join(tmp, 'bench.db'))
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+        populate(engine, args.projects, args.line_items)
+
+        report(engine, "Without indexes", args.projects)
+        ensure_indexes(engine)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        report(engine, "After ensure_indexes()", args.projects)
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
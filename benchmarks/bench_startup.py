@@ -0,0 +1,70 @@
+# benchmarks/bench_startup.py
+"""
+Measures database start-up cost: importing src.database and running create_db_and_tables().
+
+Each measurement runs in a fresh interpreter against a scratch database so
+import caches and module state do not leak between runs. "cold" is the first
+start on an empty file (tables, indexes, seed data); "warm" is every later
+start, which should only read PRAGMA user_version.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--budget-ms 50]
+
+Exits with status 1 if the median warm start exceeds the budget.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+PROBE = """
+import json, sys, time
+sys.path.append({root!r})
+start = time.perf_counter()
+import src.database as database
+imported = time.perf_counter()
+database.create_db_and_tables()
+done = time.perf_counter()
+print(json.dumps({{'import_ms': (imported - start) * 1000, 'init_ms': (done - imported) * 1000}}))
+"""
+
+
+def run_probe(db_path):
+    env = dict(os.environ, CONTRACTORPRO_DB_PATH=db_path)
+    out = subprocess.run(
+        [sys.executable, '-c', PROBE.format(root=ROOT)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=50.0, help="Allowed median warm create_db_and_tables() time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'startup.db')
+        cold = run_probe(db_path)
+        warm = [run_probe(db_path) for _ in range(args.runs)]
+
+    warm_init = statistics.median(r['init_ms'] for r in warm)
+    warm_import = statistics.median(r['import_ms'] for r in warm)
+    print(f"cold: import {cold['import_ms']:.1f} ms, init {cold['init_ms']:.1f} ms")
+    print(f"warm: import {warm_import:.1f} ms, init {warm_init:.1f} ms (median of {args.runs})")
+
+    if warm_init > args.budget_ms:
+        print(f"FAIL: warm init {warm_init:.1f} ms is over the {args.budget_ms:.1f} ms budget")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/bench_takeoff_import.py
+"""
+Times takeoff imports (src/takeoff_importer.py) of large CSV files.
+
+A takeoff CSV with --rows rows is written in the layout a takeoff tool
+exports (Item, Qty, UOM, Unit Price, Markup %, Cost Code, Common Item,
+Notes), with common items and cost codes taken from the synthetic catalog
+and about 1% of the rows broken in ways the importer must reject. Each run
+imports the file into a fresh project and reports wall time, rows per
+second, queries, and the tracemalloc peak of one extra run, which should
+stay flat as --rows grows.
+
+Usage:
+    python benchmarks/bench_takeoff_import.py [--rows 100000] [--repeat 3] [--output results.json]
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bench_hot_paths import build_database, summarize
+
+HEADER = ['Item', 'Qty', 'UOM', 'Unit Price', 'Markup %', 'Cost Code', 'Common Item', 'Notes']
+BROKEN_ROWS = [
+    ['', '4', 'EA', '12.50', '', '', '', 'no description'],
+    ['Drywall patch', 'lots', 'SF', '3.10', '', '', '', 'quantity is text'],
+    ['Trim', '12', 'LF', '-1', '', '', '', 'negative cost'],
+    ['Blocking', '8', 'EA', '2.25', '', '99 99 99', '', 'unknown cost code'],
+    ['Fixture', '1', 'EA', '80', '', '', 'Gold Faucet', 'unknown common item'],
+]
+
+
+def write_takeoff_csv(path, rows, cost_codes, seed=42):
+    from synthetic_data import MATERIALS, LABOR, EQUIPMENT, UNITS
+    rng = random.Random(seed)
+    catalog = MATERIALS + LABOR + EQUIPMENT
+    rejected = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for n in range(rows):
+            if n % 100 == 99:
+                writer.writerow(BROKEN_ROWS[rejected % len(BROKEN_ROWS)])
+                rejected += 1
+            elif rng.random() < 0.6:
+                name, unit, cost = rng.choice(catalog)
+                writer.writerow(['', f"{rng.uniform(1, 250):.2f}", '', f"${cost * rng.uniform(0.9, 1.15):,.2f}",
+                                 rng.choice(['', '10', '15%']), rng.choice(cost_codes), name, ''])
+            else:
+                writer.writerow([f"Takeoff item {n + 1}", f"{rng.uniform(1, 250):.2f}", rng.choice(UNITS),
+                                 f"{rng.uniform(5, 400):.2f}", rng.choice(['0', '10', '20']), rng.choice(cost_codes), '',
+                                 'Verify on site' if rng.random() < 0.2 else ''])
+    return rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['CONTRACTORPRO_DB_PATH'] = os.path.join(tmp, 'import.db')
+        os.environ['CONTRACTORPRO_METRICS_LOG'] = os.path.join(tmp, 'actions.jsonl')
+        build_database(10, 10, seed=42)
+
+        from sqlalchemy import select
+        from src.database import Session, Project, CostCode
+        from src.instrumentation import track_action
+        from src.takeoff_importer import import_takeoff
+
+        session = Session()
+        cost_codes = list(session.execute(select(CostCode.code)).scalars())
+        takeoff_path = os.path.join(tmp, 'takeoff.csv')
+        expected_rejects = write_takeoff_csv(takeoff_path, args.rows, cost_codes)
+        print(f"Takeoff file: {args.rows} rows ({expected_rejects} broken), "
+              f"{os.path.getsize(takeoff_path) / 1024 / 1024:.1f} MiB\n")
+
+        def new_project():
+            project = Project(project_name=f"Takeoff import {time.perf_counter_ns()}", overhead_percentage=10.0,
+                              profit_percentage=8.0)
+            session.add(project)
+            session.commit()
+            return project.id
+
+        rejects_path = os.path.join(tmp, 'takeoff.rejected.csv')
+        timings = []
+        for _ in range(args.repeat):
+            project_id = new_project()
+            start = time.perf_counter()
+            stats = import_takeoff(project_id, takeoff_path, rejects_path=rejects_path)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert stats['rejected'] == expected_rejects, stats['rejects'][:5]
+        result = summarize(timings)
+
+        with track_action('bench:import_takeoff') as tracked:
+            import_takeoff(new_project(), takeoff_path, rejects_path=rejects_path)
+        if tracked is not None:
+            result['queries'] = tracked.queries
+
+        tracemalloc.start()
+        try:
+            import_takeoff(new_project(), takeoff_path, rejects_path=rejects_path)
+            result['tracemalloc_peak_kib'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        finally:
+            tracemalloc.stop()
+        session.close()
+
+    result.update(rows=args.rows, imported=stats['imported'], rejected=stats['rejected'],
+                  rows_per_second=round(args.rows / (result['p50_ms'] / 1000)))
+    print(f"\nimport_takeoff  p50 {result['p50_ms']:9.1f} ms   p95 {result['p95_ms']:9.1f} ms   "
+          f"{result['rows_per_second']:,} rows/s   queries {result.get('queries', '-')}   "
+          f"peak {result['tracemalloc_peak_kib']:,.1f} KiB")
+    print(f"{stats['imported']} imported, {stats['rejected']} rejected")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
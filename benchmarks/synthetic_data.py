@@ -0,0 +1,211 @@
+# benchmarks/synthetic_data.py
+"""
+Deterministic synthetic data for benchmarks.
+
+generate_dataset() fills an empty database (created with the current schema)
+with MasterFormat groups, cost codes, common items, N projects and M line
+items per project. The same seed always produces the same rows, so runs on
+different versions of the code measure the same data. Rows are written with
+Core executemany; the rollup and search triggers fill in as they would for
+data entered through the app.
+
+Usage (standalone):
+    python benchmarks/synthetic_data.py out.db [--projects 100] [--line-items 500] [--seed 42]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sqlalchemy import text
+from src.database import MFGroup, CostCode, CommonItem, Project, LineItem
+
+DIVISIONS = [
+    ('01', 'General Requirements'), ('02', 'Existing Conditions'), ('03', 'Concrete'),
+    ('04', 'Masonry'), ('05', 'Metals'), ('06', 'Wood, Plastics, and Composites'),
+    ('07', 'Thermal and Moisture Protection'), ('08', 'Openings'), ('09', 'Finishes'),
+    ('10', 'Specialties'), ('22', 'Plumbing'), ('23', 'HVAC'), ('26', 'Electrical'),
+    ('31', 'Earthwork'), ('32', 'Exterior Improvements'),
+]
+SECTION_NAMES = [
+    'Preparation', 'Formwork', 'Reinforcing', 'Cast-in-Place', 'Framing', 'Sheathing',
+    'Insulation', 'Membranes', 'Doors', 'Windows', 'Drywall', 'Tile', 'Painting',
+    'Fixtures', 'Piping', 'Ductwork', 'Wiring', 'Lighting', 'Grading', 'Paving',
+]
+MATERIALS = [
+    ('2x4 Lumber', 'EA', 3.5), ('2x6 Lumber', 'EA', 5.75), ('Plywood Sheet 3/4"', 'EA', 48.0),
+    ('Drywall 1/2" 4x8', 'EA', 14.25), ('Concrete Mix 3000psi', 'CY', 165.0), ('Rebar #4', 'LF', 0.85),
+    ('Batt Insulation R-19', 'SF', 0.95), ('Asphalt Shingles', 'SQ', 110.0), ('Ceramic Tile', 'SF', 4.5),
+    ('Interior Paint', 'GAL', 38.0), ('PEX Pipe 3/4"', 'LF', 0.9), ('Romex 12/2', 'LF', 0.75),
+    ('Interior Door Slab', 'EA', 95.0), ('Vinyl Window 3x4', 'EA', 285.0), ('Gravel Base', 'TON', 32.0),
+]
+LABOR = [
+    ('Carpenter', 'HR', 65.0), ('Laborer', 'HR', 42.0), ('Electrician', 'HR', 95.0),
+    ('Plumber', 'HR', 98.0), ('Painter', 'HR', 55.0), ('Tile Setter', 'HR', 70.0),
+]
+EQUIPMENT = [('Skid Steer Rental', 'DAY', 325.0), ('Dumpster 20yd', 'EA', 550.0), ('Scaffold Rental', 'WK', 210.0)]
+CLIENTS = [
+    'Smith Family Trust', 'Oak Ridge Properties', 'Harbor View HOA', 'Greenfield Schools',
+    'Johnson Dental', 'Summit Retail Group', 'Riverside Church', 'Maple Street LLC',
+    'Northside Medical', 'Blue Sky Apartments', 'City of Fairview', 'Carter & Sons',
+]
+PROJECT_KINDS = ['Kitchen Remodel', 'Bathroom Renovation', 'Office Fit-Out', 'Roof Replacement',
+                 'Basement Finish', 'Retail Build-Out', 'Deck Addition', 'Garage Conversion']
+CITIES = [('Springfield', 'IL', '62701'), ('Fairview', 'TX', '75069'), ('Riverton', 'WY', '82501'),
+          ('Madison', 'WI', '53703'), ('Salem', 'OR', '97301')]
+STREETS = ['Main St', 'Oak Ave', 'Pine Rd', 'Maple Dr', 'Cedar Ln', 'Elm St', 'Lakeview Blvd']
+STATUSES = ['Bidding', 'Awarded', 'In Progress', 'Completed', 'Lost', 'On Hold']
+UNITS = ['EA', 'LF', 'SF', 'CY', 'HR', 'LS']
+CHUNK_SIZE = 10000
+
+
+def _chunked(rows, size=CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _date(rng, year_from=2023, year_to=2026):
+    return f"{rng.randint(year_from, year_to)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def catalog_rows(rng, sections_per_division=8):
+    """Returns (mf_groups, cost_codes, common_items) row dicts."""
+    mf_groups, cost_codes, common_items = [], [], []
+    group_id = 0
+    for division, division_name in DIVISIONS:
+        group_id += 1
+        division_id = group_id
+        mf_groups.append({'id': division_id, 'code': f"{division} 00 00", 'name': division_name,
+                          'description': f"Division {division} - {division_name}", 'level': 1, 'parent_id': None})
+        for section in range(1, sections_per_division + 1):
+            group_id += 1
+            section_name = rng.choice(SECTION_NAMES)
+            code = f"{division} {section * 10:02d} 00"
+            mf_groups.append({'id': group_id, 'code': code, 'name': f"{section_name} {section}",
+                              'description': f"{division_name}: {section_name}", 'level': 2, 'parent_id': division_id})
+            cost_codes.append({'id': len(cost_codes) + 1, 'code': code, 'name': f"{division_name} - {section_name} {section}",
+                               'description': None, 'mf_group_id': group_id})
+
+    for kind, catalog in (('Material', MATERIALS), ('Labor', LABOR), ('Equipment', EQUIPMENT)):
+        for name, unit, _ in catalog:
+            division = rng.choice(DIVISIONS)[0]
+            common_items.append({'id': len(common_items) + 1, 'name': name, 'description': f"{name} ({kind.lower()})",
+                                 'unit': unit, 'type': kind, 'mf_code': f"{division} 00 00"})
+    return mf_groups, cost_codes, common_items
+
+
+def project_rows(rng, projects):
+    for project_id in range(1, projects + 1):
+        city, state, zip_code = rng.choice(CITIES)
+        client = rng.choice(CLIENTS)
+        yield {
+            'id': project_id,
+            'project_name': f"{rng.choice(PROJECT_KINDS)} #{project_id:05d}",
+            'client_name': client,
+            'client_contact_person': f"Contact {project_id % 97}",
+            'client_phone': f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            'client_email': f"estimating{project_id}@example.com",
+            'client_address_street': f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+            'client_address_city': city, 'client_address_state': state, 'client_address_zip': zip_code,
+            'project_address': f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+            'project_city': city, 'project_state': state, 'project_zip': zip_code,
+            'estimate_date': _date(rng), 'bid_due_date': _date(rng),
+            'project_start_date': _date(rng), 'completion_date': _date(rng),
+            'project_status': rng.choice(STATUSES),
+            'contract_type': rng.choice(['Lump Sum', 'Cost Plus', 'T&M']),
+            'markup_percentage': rng.choice([10.0, 15.0, 20.0]),
+            'overhead_percentage': rng.choice([5.0, 8.0, 10.0]),
+            'profit_percentage': rng.choice([5.0, 10.0, 12.0]),
+            'scope_of_work': f"Furnish and install materials for {client.lower()} project {project_id}.",
+            'notes': rng.choice(['', 'Owner supplies fixtures.', 'Night work required.', 'Phased schedule.']),
+            'permit_cost': round(rng.uniform(0, 2500), 2), 'bonding_cost': round(rng.uniform(0, 1500), 2),
+            'insurance_cost': round(rng.uniform(0, 1200), 2), 'misc_expenses': round(rng.uniform(0, 800), 2),
+        }
+
+
+def line_item_rows(rng, projects, line_items, common_items, cost_codes):
+    prices = {name: (unit, cost) for name, unit, cost in MATERIALS + LABOR + EQUIPMENT}
+    for project_id in range(1, projects + 1):
+        for n in range(line_items):
+            cost_code = rng.choice(cost_codes)
+            if rng.random() < 0.6:
+                item = rng.choice(common_items)
+                unit, base_cost = prices[item['name']]
+                description = item['description']
+                common_item_id = item['id']
+            else:
+                unit, base_cost = rng.choice(UNITS), rng.uniform(5, 400)
+                description = f"Custom work item {n + 1} for {cost_code['name']}"
+                common_item_id = None
+            yield {
+                'project_id': project_id,
+                'description': description,
+                'quantity': round(rng.uniform(1, 250), 2),
+                'unit': unit,
+                'unit_cost': round(base_cost * rng.uniform(0.9, 1.15), 2),
+                'markup_percentage': rng.choice([0.0, 10.0, 15.0, 20.0]),
+                'notes': '' if rng.random() < 0.8 else 'Verify quantity on site.',
+                'is_common_item': 1 if common_item_id else 0,
+                'common_item_id': common_item_id,
+                'cost_code_id': cost_code['id'],
+            }
+
+
+def generate_dataset(bind, projects=100, line_items=500, seed=42):
+    """
+    Fills an empty database with a deterministic catalog, projects and line items.
+
+    Args:
+        bind: Engine whose database already has the current schema (create_all + triggers).
+        projects (int): Number of projects.
+        line_items (int): Line items per project.
+        seed (int): Random seed; the same seed always gives the same data.
+
+    Returns:
+        dict: Row counts written per table.
+    """
+    rng = random.Random(seed)
+    mf_groups, cost_codes, common_items = catalog_rows(rng)
+    with bind.begin() as conn:
+        conn.execute(MFGroup.__table__.insert(), mf_groups)
+        conn.execute(CostCode.__table__.insert(), cost_codes)
+        conn.execute(CommonItem.__table__.insert(), common_items)
+        for chunk in _chunked(project_rows(rng, projects)):
+            conn.execute(Project.__table__.insert(), chunk)
+        for chunk in _chunked(line_item_rows(rng, projects, line_items, common_items, cost_codes)):
+            conn.execute(LineItem.__table__.insert(), chunk)
+        # Store the direct cost on each project as the app would after editing its line items
+        conn.execute(text("""
+            UPDATE projects SET total_direct_cost = (
+                SELECT total_direct_cost FROM project_rollups r WHERE r.project_id = projects.id
+            )
+        """))
+    return {
+        'mf_groups': len(mf_groups), 'cost_codes': len(cost_codes), 'common_items': len(common_items),
+        'projects': projects, 'line_items': projects * line_items,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Writes a synthetic ContractorPro database.")
+    parser.add_argument('database')
+    parser.add_argument('--projects', type=int, default=100)
+    parser.add_argument('--line-items', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    if os.path.exists(args.database):
+        sys.exit(f"{args.database} already exists; pass a new path.")
+    from src.database import Base, create_sqlite_engine, ensure_indexes, ensure_project_search_index
+    target = create_sqlite_engine(args.database, profile='bulk-load')
+    Base.metadata.create_all(target)
+    ensure_indexes(target)
+    ensure_project_search_index(target)
+    print(generate_dataset(target, args.projects, args.line_items, args.seed))
@@ -0,0 +1,191 @@
+# src/batch_export.py
+"""
+Headless batch export of estimate PDFs.
+
+Selects projects by id, status and/or a date range and renders one PDF per
+project into an output directory, using the same loader (estimate_loader)
+and layout (pdf_generator.generate_pdf_estimate) as the Export to PDF button,
+and sharing its PDF cache, so unchanged estimates are copied, not re-rendered.
+Projects are rendered in parallel on a process pool sized to the CPU count;
+each worker process opens its own read-only connection with the 'reporting'
+profile.
+
+Usage:
+    python -m src.batch_export OUTPUT_DIR [--ids 1 2 3] [--status Bidding ...]
+                               [--from 2025-01-01] [--to 2025-12-31] [--date-field estimate_date]
+                               [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from src.database import Session, Project, DATABASE_PATH, create_sqlite_engine
+
+# Project date columns a batch can be filtered on (dates are stored as YYYY-MM-DD text)
+DATE_FIELDS = ('estimate_date', 'bid_due_date', 'project_start_date', 'completion_date')
+
+_worker_session_factory = None
+
+
+def project_filters(project_ids=None, statuses=None, date_from=None, date_to=None, date_field='estimate_date'):
+    """
+    Returns the WHERE clauses on Project for the given filters (an empty list matches every project).
+
+    Args:
+        project_ids (list): Only these project ids.
+        statuses (list): Only projects with one of these statuses.
+        date_from (str): Earliest date (YYYY-MM-DD, inclusive) of date_field.
+        date_to (str): Latest date (YYYY-MM-DD, inclusive) of date_field.
+        date_field (str): One of DATE_FIELDS.
+    """
+    if date_field not in DATE_FIELDS:
+        raise ValueError(f"Unknown date field '{date_field}'. Choose one of: {', '.join(DATE_FIELDS)}")
+    clauses = []
+    if project_ids:
+        clauses.append(Project.id.in_(project_ids))
+    if statuses:
+        clauses.append(Project.project_status.in_(statuses))
+    date_column = getattr(Project, date_field)
+    if date_from:
+        clauses.append(date_column >= date_from)
+    if date_to:
+        clauses.append(date_column <= date_to)
+    return clauses
+
+
+def select_project_ids(session, project_ids=None, statuses=None, date_from=None, date_to=None, date_field='estimate_date'):
+    """Returns the ids of the projects matching every given filter (see project_filters), in id order."""
+    query = select(Project.id).where(*project_filters(project_ids, statuses, date_from, date_to, date_field))
+    return list(session.execute(query.order_by(Project.id)).scalars())
+
+
+def _init_worker(database_path):
+    # Every process needs its own connections; the reporting profile makes them read-only
+    global _worker_session_factory
+    _worker_session_factory = sessionmaker(bind=create_sqlite_engine(database_path, profile='reporting'))
+
+
+def export_project_pdf(project_id, output_dir, session=None):
+    """
+    Renders one project's estimate into output_dir.
+
+    Returns:
+        dict: project_id, status ('exported', 'skipped' or 'failed'), path, pages, seconds and error.
+    """
+    from src.estimate_loader import load_estimate, pdf_payload
+    from src.pdf_generator import default_pdf_filename
+    from src.pdf_cache import render_pdf_cached
+
+    result = {'project_id': project_id, 'status': 'failed', 'path': None, 'pages': 0, 'seconds': 0.0, 'error': None}
+    start = time.perf_counter()
+    own_session = session is None
+    session = session if session is not None else (_worker_session_factory or Session)()
+    try:
+        estimate = load_estimate(session, project_id)
+        if estimate['project'] is None:
+            result['error'] = "Project not found."
+            return result
+        project_data, line_items_data, financial_summary_data = pdf_payload(estimate)
+        if not line_items_data:
+            result['status'] = 'skipped'
+            result['error'] = "No line items."
+            return result
+        path = os.path.join(output_dir, default_pdf_filename(project_data))
+        result['pages'] = render_pdf_cached(project_data, line_items_data, financial_summary_data, path)['pages']
+        result['path'] = path
+        result['status'] = 'exported'
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        result['seconds'] = time.perf_counter() - start
+        if own_session:
+            session.close()
+    return result
+
+
+def batch_export(output_dir, project_ids, workers=None, database_path=DATABASE_PATH, on_result=None):
+    """
+    Renders the given projects in parallel.
+
+    Args:
+        output_dir (str): Directory for the PDFs (created if missing).
+        project_ids (list): Projects to export.
+        workers (int): Worker processes. Defaults to the CPU count (never more than the number of projects).
+        database_path (str): Database the workers read from.
+        on_result (callable): Called with each project's result dict as it completes.
+
+    Returns:
+        dict: 'results' (per project, in id order), 'exported', 'skipped', 'failed', 'pages',
+        'wall_seconds' and 'render_seconds' (sum over projects).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    results = []
+    if project_ids:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(project_ids)))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(database_path,)) as pool:
+            futures = {pool.submit(export_project_pdf, project_id, output_dir): project_id for project_id in project_ids}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e: # The worker process itself died
+                    result = {'project_id': futures[future], 'status': 'failed', 'path': None, 'pages': 0,
+                              'seconds': 0.0, 'error': f"{type(e).__name__}: {e}"}
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+    results.sort(key=lambda r: r['project_id'])
+    return {
+        'results': results,
+        'exported': sum(1 for r in results if r['status'] == 'exported'),
+        'skipped': sum(1 for r in results if r['status'] == 'skipped'),
+        'failed': sum(1 for r in results if r['status'] == 'failed'),
+        'pages': sum(r['pages'] for r in results),
+        'wall_seconds': time.perf_counter() - start,
+        'render_seconds': sum(r['seconds'] for r in results),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render one estimate PDF per matching project.")
+    parser.add_argument('output_dir')
+    parser.add_argument('--ids', type=int, nargs='+', help="Project ids")
+    parser.add_argument('--status', action='append', help="Project status (repeat for several)")
+    parser.add_argument('--from', dest='date_from', help="Earliest date, YYYY-MM-DD")
+    parser.add_argument('--to', dest='date_to', help="Latest date, YYYY-MM-DD")
+    parser.add_argument('--date-field', default='estimate_date', choices=DATE_FIELDS)
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    from src.database import create_db_and_tables
+    create_db_and_tables()
+    session = Session()
+    try:
+        project_ids = select_project_ids(session, args.ids, args.status, args.date_from, args.date_to, args.date_field)
+    finally:
+        session.close()
+    if not project_ids:
+        print("No projects match the filter.")
+        return 0
+    print(f"Exporting {len(project_ids)} project(s) to {args.output_dir}...")
+
+    def report(result):
+        if result['status'] == 'exported':
+            print(f"  project {result['project_id']}: {result['pages']} pages in {result['seconds']:.2f} s -> {result['path']}")
+        else:
+            print(f"  project {result['project_id']}: {result['status'].upper()} - {result['error']}")
+
+    summary = batch_export(args.output_dir, project_ids, workers=args.workers, on_result=report)
+    print(f"Done in {summary['wall_seconds']:.2f} s ({summary['render_seconds']:.2f} s of rendering): "
+          f"{summary['exported']} exported, {summary['skipped']} skipped, {summary['failed']} failed, "
+          f"{summary['pages']} pages.")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+# src/catalog_loader.py
+"""
+Bulk loader for the MasterFormat catalog, cost codes and common items.
+
+Reads CSV, JSON or JSON-lines files from the data/ directory and upserts them
+in one transaction:
+
+    mf_groups*.csv|json|jsonl     code, name, description, level, parent_code
+    cost_codes*.csv|json|jsonl    code, name, description, mf_code
+    common_items*.csv|json|jsonl  name, description, unit, type, mf_code
+
+Rows are streamed from disk and written with executemany in chunks. Parent
+groups and cost code groups are resolved by code inside SQLite with one
+UPDATE / subquery instead of Python-side object linking, so files with tens
+of thousands of codes load in seconds. Loading the same files again updates
+rows in place.
+
+Usage:
+    python -m src.catalog_loader [data_dir]
+"""
+
+import csv
+import glob
+import json
+import os
+import sys
+
+from sqlalchemy import select, text, bindparam, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.database import engine, MFGroup, CostCode, CommonItem
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+CHUNK_SIZE = 5000
+
+
+def iter_rows(path):
+    """Yields one dict per row of a .csv, .json (list of objects) or .jsonl file."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            yield from csv.DictReader(f)
+    elif ext == '.jsonl':
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif ext == '.json':
+        with open(path, encoding='utf-8') as f:
+            yield from json.load(f)
+    else:
+        raise ValueError(f"Unsupported catalog file type: {path}")
+
+
+def find_files(data_dir, prefix):
+    files = []
+    for ext in ('csv', 'json', 'jsonl'):
+        files.extend(glob.glob(os.path.join(data_dir, f"{prefix}*.{ext}")))
+    return sorted(files)
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _chunks(rows, size=CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _mf_group_rows(paths, stats):
+    for path in paths:
+        for raw in iter_rows(path):
+            code, name = _clean(raw.get('code')), _clean(raw.get('name'))
+            if not code or not name:
+                stats['skipped'] += 1
+                continue
+            yield {
+                'code': code,
+                'name': name,
+                'description': _clean(raw.get('description')),
+                'level': int(raw.get('level') or 0),
+                'parent_code': _clean(raw.get('parent_code')),
+            }
+
+
+def _cost_code_rows(paths, stats):
+    for path in paths:
+        for raw in iter_rows(path):
+            code, name = _clean(raw.get('code')), _clean(raw.get('name'))
+            if not code or not name:
+                stats['skipped'] += 1
+                continue
+            yield {
+                'code': code,
+                'name': name,
+                'description': _clean(raw.get('description')),
+                'mf_code': _clean(raw.get('mf_code')),
+            }
+
+
+def _common_item_rows(paths, stats):
+    for path in paths:
+        for raw in iter_rows(path):
+            name = _clean(raw.get('name'))
+            if not name:
+                stats['skipped'] += 1
+                continue
+            yield {
+                'name': name,
+                'description': _clean(raw.get('description')),
+                'unit': _clean(raw.get('unit')),
+                'type': _clean(raw.get('type')),
+                'mf_code': _clean(raw.get('mf_code')),
+            }
+
+
+def load_mf_groups(connection, paths, stats):
+    table = MFGroup.__table__
+    stmt = sqlite_insert(table).values(
+        code=bindparam('code'), name=bindparam('name'),
+        description=bindparam('description'), level=bindparam('level'),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['code'],
+        set_={'name': stmt.excluded.name, 'description': stmt.excluded.description, 'level': stmt.excluded.level},
+    )
+
+    # Parents are resolved after every group is in, so a child may appear before its parent in the files
+    connection.execute(text("CREATE TEMP TABLE IF NOT EXISTS catalog_parents (code TEXT PRIMARY KEY, parent_code TEXT)"))
+    connection.execute(text("DELETE FROM catalog_parents"))
+    stage = text("INSERT OR REPLACE INTO catalog_parents (code, parent_code) VALUES (:code, :parent_code)")
+
+    for chunk in _chunks(_mf_group_rows(paths, stats)):
+        connection.execute(stmt, chunk)
+        connection.execute(stage, [{'code': r['code'], 'parent_code': r['parent_code']} for r in chunk])
+        stats['mf_groups'] += len(chunk)
+
+    connection.execute(text("""
+        UPDATE mf_groups SET parent_id = (
+            SELECT p.id FROM catalog_parents s JOIN mf_groups p ON p.code = s.parent_code
+            WHERE s.code = mf_groups.code
+        )
+        WHERE code IN (SELECT code FROM catalog_parents)
+    """))
+    connection.execute(text("DROP TABLE catalog_parents"))
+
+
+def load_cost_codes(connection, paths, stats):
+    group_id = select(MFGroup.id).where(MFGroup.code == bindparam('mf_code')).scalar_subquery()
+    stmt = sqlite_insert(CostCode.__table__).values(
+        code=bindparam('code'), name=bindparam('name'),
+        description=bindparam('description'), mf_group_id=group_id,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['code'],
+        set_={'name': stmt.excluded.name, 'description': stmt.excluded.description, 'mf_group_id': stmt.excluded.mf_group_id},
+    )
+    for chunk in _chunks(_cost_code_rows(paths, stats)):
+        connection.execute(stmt, chunk)
+        stats['cost_codes'] += len(chunk)
+
+
+def load_common_items(connection, paths, stats):
+    stmt = sqlite_insert(CommonItem.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['name'],
+        set_={
+            'description': stmt.excluded.description, 'unit': stmt.excluded.unit,
+            'type': stmt.excluded.type, 'mf_code': stmt.excluded.mf_code,
+        },
+    )
+    for chunk in _chunks(_common_item_rows(paths, stats)):
+        connection.execute(stmt, chunk)
+        stats['common_items'] += len(chunk)
+
+
+def load_catalog(data_dir=DATA_DIR, bind=None, only_empty=False):
+    """
+    Upserts every catalog file found in data_dir in a single transaction.
+
+    Args:
+        data_dir (str): Directory holding the catalog files.
+        bind: Engine to load into. Defaults to the application engine.
+        only_empty (bool): Only load tables that have no rows yet (used to seed new databases).
+
+    Returns:
+        dict: Row counts loaded per table, plus 'skipped' for rows missing required fields.
+    """
+    bind = bind if bind is not None else engine
+    stats = {'mf_groups': 0, 'cost_codes': 0, 'common_items': 0, 'skipped': 0}
+    loaders = [
+        (MFGroup, 'mf_groups', load_mf_groups),
+        (CostCode, 'cost_codes', load_cost_codes),
+        (CommonItem, 'common_items', load_common_items),
+    ]
+    with bind.begin() as connection:
+        for model, prefix, loader in loaders:
+            paths = find_files(data_dir, prefix)
+            if not paths:
+                continue
+            if only_empty and connection.execute(select(func.count()).select_from(model)).scalar():
+                continue
+            loader(connection, paths, stats)
+    return stats
+
+
+if __name__ == '__main__':
+    from src.database import create_db_and_tables
+    create_db_and_tables()
+    result = load_catalog(sys.argv[1] if len(sys.argv) > 1 else DATA_DIR)
+    print(f"Loaded {result['mf_groups']} MasterFormat groups, {result['cost_codes']} cost codes and "
+          f"{result['common_items']} common items ({result['skipped']} rows skipped).")
@@ -0,0 +1,124 @@
+# src/clone_project_dialog.py
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QDoubleSpinBox, QCheckBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox, QPushButton, QLabel, QMessageBox, QApplication
+)
+from PySide6.QtCore import Qt
+from sqlalchemy import select
+from src.database import Project, CostCode
+from src.project_cloner import clone_project, used_cost_codes, TEMPLATE_STATUS, NEW_PROJECT_STATUS
+
+
+class CloneProjectDialog(QDialog):
+    """Copies a project (or starts one from a template) with project_cloner.clone_project."""
+
+    def __init__(self, db_session, project_id, parent=None):
+        super().__init__(parent)
+        self.db_session = db_session
+        self.project_id = project_id
+        self.clone_result = None # clone_project() result once the copy is made
+        source = db_session.execute(
+            select(Project.project_name, Project.project_status).where(Project.id == project_id)
+        ).first()
+        self.source_name = source.project_name if source else ""
+        self.source_is_template = source is not None and source.project_status == TEMPLATE_STATUS
+        self.setWindowTitle(f"Copy Project - {self.source_name}")
+        self.setMinimumWidth(520)
+        self.init_ui()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout(self)
+        form_layout = QFormLayout()
+
+        self.name_input = QLineEdit()
+        self.name_input.setPlaceholderText(f"{self.source_name} (copy)")
+        form_layout.addRow("New Project Name:", self.name_input)
+
+        self.quantity_factor_spin = QDoubleSpinBox()
+        self.quantity_factor_spin.setRange(0.01, 100.00)
+        self.quantity_factor_spin.setDecimals(2)
+        self.quantity_factor_spin.setSingleStep(0.05)
+        self.quantity_factor_spin.setValue(1.00)
+        form_layout.addRow("Scale Quantities By:", self.quantity_factor_spin)
+
+        markup_layout = QHBoxLayout()
+        self.reset_markup_checkbox = QCheckBox("Set every line item's markup to")
+        self.markup_percentage_spin = QDoubleSpinBox()
+        self.markup_percentage_spin.setRange(0.00, 100.00)
+        self.markup_percentage_spin.setSuffix("%")
+        self.markup_percentage_spin.setEnabled(False)
+        self.reset_markup_checkbox.toggled.connect(self.markup_percentage_spin.setEnabled)
+        markup_layout.addWidget(self.reset_markup_checkbox)
+        markup_layout.addWidget(self.markup_percentage_spin)
+        markup_layout.addStretch()
+        form_layout.addRow("Markup:", markup_layout)
+
+        self.save_as_template_checkbox = QCheckBox("Save the copy as a template")
+        form_layout.addRow("", self.save_as_template_checkbox)
+        main_layout.addLayout(form_layout)
+
+        # One row per cost code the source uses; each can be swapped for another code in the copy
+        main_layout.addWidget(QLabel("Cost codes:"))
+        all_codes = self.db_session.execute(
+            select(CostCode.id, CostCode.code, CostCode.name).order_by(CostCode.code)
+        ).all()
+        self.used_codes = used_cost_codes(self.db_session, self.project_id)
+        self.cost_codes_table = QTableWidget(len(self.used_codes), 2)
+        self.cost_codes_table.setHorizontalHeaderLabels(["Cost Code", "Use Instead"])
+        self.cost_codes_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.cost_codes_table.verticalHeader().setVisible(False)
+        self.cost_code_combos = []
+        for row, cost_code in enumerate(self.used_codes):
+            item = QTableWidgetItem(f"{cost_code.code} - {cost_code.name}")
+            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+            self.cost_codes_table.setItem(row, 0, item)
+            combo = QComboBox()
+            combo.addItem("(keep)", None)
+            for other in all_codes:
+                if other.id != cost_code.id:
+                    combo.addItem(f"{other.code} - {other.name}", other.id)
+            self.cost_codes_table.setCellWidget(row, 1, combo)
+            self.cost_code_combos.append(combo)
+        main_layout.addWidget(self.cost_codes_table)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.clone_button = QPushButton("Create Project" if self.source_is_template else "Copy Project")
+        self.clone_button.setDefault(True)
+        self.clone_button.clicked.connect(self.clone)
+        button_layout.addWidget(self.clone_button)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_button)
+        main_layout.addLayout(button_layout)
+
+    def cost_code_map(self):
+        return {cost_code.id: combo.currentData()
+                for cost_code, combo in zip(self.used_codes, self.cost_code_combos)
+                if combo.currentData() is not None}
+
+    def clone(self):
+        as_template = self.save_as_template_checkbox.isChecked()
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            self.clone_result = clone_project(
+                self.project_id,
+                self.name_input.text().strip() or None,
+                quantity_factor=self.quantity_factor_spin.value(),
+                markup_percentage=self.markup_percentage_spin.value() if self.reset_markup_checkbox.isChecked() else None,
+                cost_code_map=self.cost_code_map(),
+                status=TEMPLATE_STATUS if as_template else NEW_PROJECT_STATUS,
+            )
+        except ValueError as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.warning(self, "Copy Project", str(e))
+            return
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.critical(self, "Database Error", f"Failed to copy project: {e}")
+            return
+        QApplication.restoreOverrideCursor()
+        QMessageBox.information(self, "Success",
+                                f"Created {'template' if as_template else 'project'} '{self.clone_result['project_name']}' "
+                                f"with {self.clone_result['line_items']} line items.")
+        self.accept()
@@ -0,0 +1,254 @@
+# src/data_export.py
+"""
+Streaming export of raw estimate data to CSV or JSON lines, for accounting and BI.
+
+Two datasets:
+
+    projects     one row per project with its rates, fixed costs and current totals
+                 (from project_rollups, so they reflect every line item change)
+    line_items   one row per line item with its project, common item, cost code
+                 and MasterFormat group resolved, plus its direct and marked-up cost
+
+Exports are filtered like batch_export (project ids, statuses, date range)
+and read with Core selects iterated with yield_per, so rows go from the
+SQLite cursor to the output file CHUNK_SIZE at a time and memory stays flat
+whether the export is ten rows or millions. Line items are selected one
+project at a time, in project id order and then line item id order: SQLite
+then only ever sorts one project's rows, where a single ordered select over
+a filtered set of projects would sort the whole export first.
+
+The file is written next to its final path and renamed into place once
+complete, so a failed export never leaves a half-written file behind.
+
+Usage:
+    python -m src.data_export {projects,line_items} OUTPUT [--format csv|jsonl]
+                              [--ids 1 2 3] [--status Bidding ...]
+                              [--from 2025-01-01] [--to 2025-12-31] [--date-field estimate_date]
+
+OUTPUT may be "-" for standard output; the format then defaults to CSV.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from sqlalchemy import select, func
+from src.database import (engine, Project, LineItem, CommonItem, CostCode, MFGroup, ProjectRollup,
+                          DATABASE_PATH, create_sqlite_engine)
+from src.batch_export import DATE_FIELDS, project_filters
+from src.estimate_engine import FIXED_COST_FIELDS, line_total, rollup_totals
+
+CHUNK_SIZE = 5000
+FORMATS = ('csv', 'jsonl')
+
+PROJECT_COLUMNS = (
+    'id', 'project_name', 'client_name', 'project_status', 'contract_type',
+    'estimate_date', 'bid_due_date', 'project_start_date', 'completion_date',
+    'project_address', 'project_city', 'project_state', 'project_zip',
+    'markup_percentage', 'overhead_percentage', 'profit_percentage',
+    'permit_cost', 'bonding_cost', 'insurance_cost', 'misc_expenses',
+)
+
+
+def projects_query(filters):
+    return (
+        select(
+            *(getattr(Project, column) for column in PROJECT_COLUMNS),
+            # Live sums from the trigger-maintained rollup, not the totals stored on the project at its last save
+            func.coalesce(ProjectRollup.total_direct_cost, 0.0).label('total_direct_cost'),
+            func.coalesce(ProjectRollup.total_cost_with_markup, 0.0).label('total_cost_with_markup'),
+            func.coalesce(ProjectRollup.line_count, 0).label('line_count'),
+        )
+        .outerjoin(ProjectRollup, ProjectRollup.project_id == Project.id)
+        .where(*filters)
+        .order_by(Project.id)
+    )
+
+
+def line_items_query(filters):
+    return (
+        select(
+            LineItem.project_id,
+            Project.project_name,
+            LineItem.id.label('line_item_id'),
+            LineItem.description,
+            LineItem.quantity,
+            LineItem.unit,
+            LineItem.unit_cost,
+            LineItem.markup_percentage,
+            LineItem.notes,
+            LineItem.is_common_item,
+            CommonItem.name.label('common_item_name'),
+            CommonItem.type.label('common_item_type'),
+            CostCode.code.label('cost_code'),
+            CostCode.name.label('cost_code_name'),
+            MFGroup.code.label('mf_group_code'),
+            MFGroup.name.label('mf_group_name'),
+        )
+        .join(Project, Project.id == LineItem.project_id)
+        .outerjoin(CommonItem, CommonItem.id == LineItem.common_item_id)
+        .outerjoin(CostCode, CostCode.id == LineItem.cost_code_id)
+        .outerjoin(MFGroup, MFGroup.id == CostCode.mf_group_id)
+        .where(*filters)
+        .order_by(LineItem.project_id, LineItem.id)
+    )
+
+
+def _with_line_costs(columns, chunk):
+    # direct_cost and total_cost are computed like everywhere else in the app (estimate_engine.line_total)
+    quantity, unit_cost, markup = (columns.index(c) for c in ('quantity', 'unit_cost', 'markup_percentage'))
+    return [(*row, (row[quantity] or 0.0) * (row[unit_cost] or 0.0), line_total(row[quantity], row[unit_cost], row[markup]))
+            for row in chunk]
+
+
+def _with_project_totals(columns, chunk):
+    # final_project_estimate applies the project's rates to the rollup sums, as estimate_engine.rollup_totals does
+    index = {column: i for i, column in enumerate(columns)}
+    direct, marked_up = index['total_direct_cost'], index['total_cost_with_markup']
+    rate_fields = ('overhead_percentage', 'profit_percentage') + FIXED_COST_FIELDS
+    rows = []
+    for row in chunk:
+        rates = {field: row[index[field]] or 0.0 for field in rate_fields}
+        rows.append((*row, rollup_totals(row[direct], row[marked_up], rates)['final_project_estimate']))
+    return rows
+
+
+def _partitions(connection, query):
+    return connection.execution_options(yield_per=CHUNK_SIZE).execute(query).partitions()
+
+
+def _project_chunks(connection, filters):
+    yield from _partitions(connection, projects_query(filters))
+
+
+def _line_item_chunks(connection, filters):
+    # Project ids are few even in a large database; each project's line items are then one indexed select
+    project_ids = connection.execute(select(Project.id).where(*filters).order_by(Project.id)).scalars().all()
+    for project_id in project_ids:
+        yield from _partitions(connection, line_items_query([Project.id == project_id]))
+
+
+DATASETS = {
+    # name: (query builder, chunk source, extra computed columns, chunk transform)
+    'projects': (projects_query, _project_chunks, ('final_project_estimate',), _with_project_totals),
+    'line_items': (line_items_query, _line_item_chunks, ('direct_cost', 'total_cost'), _with_line_costs),
+}
+
+
+def iter_export_chunks(connection, dataset, filters=()):
+    """
+    Streams a dataset from the database.
+
+    Returns:
+        tuple: (column names, iterator of lists of up to CHUNK_SIZE row tuples).
+    """
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}'. Choose one of: {', '.join(DATASETS)}")
+    build_query, chunk_source, extra_columns, transform = DATASETS[dataset]
+    filters = list(filters)
+    columns = [column.name for column in build_query(filters).selected_columns] + list(extra_columns)
+    chunks = chunk_source(connection, filters)
+    if transform is not None:
+        chunks = (transform(columns, chunk) for chunk in chunks)
+    return columns, chunks
+
+
+def _write_csv(f, columns, chunks):
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    count = 0
+    for chunk in chunks:
+        writer.writerows(chunk)
+        count += len(chunk)
+    return count
+
+
+def _write_jsonl(f, columns, chunks):
+    count = 0
+    encode = json.JSONEncoder(default=str).encode
+    for chunk in chunks:
+        f.writelines([encode(dict(zip(columns, row))) + '\n' for row in chunk])
+        count += len(chunk)
+    return count
+
+
+WRITERS = {'csv': _write_csv, 'jsonl': _write_jsonl}
+
+
+def format_for_path(path):
+    """'csv' or 'jsonl' from the file extension (.json counts as JSON lines); CSV when it is neither."""
+    ext = os.path.splitext(path)[1].lower()
+    return 'jsonl' if ext in ('.jsonl', '.json', '.ndjson') else 'csv'
+
+
+def export_data(dataset, output, fmt=None, project_ids=None, statuses=None, date_from=None, date_to=None,
+                date_field='estimate_date', bind=None):
+    """
+    Writes one dataset, filtered by project, to a CSV or JSON-lines file.
+
+    Args:
+        dataset (str): 'projects' or 'line_items'.
+        output (str): Output file path, or a writable text file object.
+        fmt (str): 'csv' or 'jsonl'. Defaults to format_for_path(output).
+        project_ids, statuses, date_from, date_to, date_field: Project filters, as in batch_export.
+        bind: Engine to read from. Defaults to the application engine.
+
+    Returns:
+        dict: 'rows' written, 'columns', 'format' and 'seconds'.
+    """
+    fmt = fmt or (format_for_path(output) if isinstance(output, str) else 'csv')
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown format '{fmt}'. Choose one of: {', '.join(FORMATS)}")
+    filters = project_filters(project_ids, statuses, date_from, date_to, date_field)
+    bind = bind if bind is not None else engine
+    start = time.perf_counter()
+    with bind.connect() as connection:
+        columns, chunks = iter_export_chunks(connection, dataset, filters)
+        if not isinstance(output, str):
+            count = WRITERS[fmt](output, columns, chunks)
+        else:
+            partial_path = f"{output}.part"
+            try:
+                with open(partial_path, 'w', newline='', encoding='utf-8') as f:
+                    count = WRITERS[fmt](f, columns, chunks)
+                os.replace(partial_path, output)
+            except BaseException:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+                raise
+    return {'rows': count, 'columns': columns, 'format': fmt, 'seconds': time.perf_counter() - start}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export projects or line items to CSV or JSON lines.")
+    parser.add_argument('dataset', choices=list(DATASETS))
+    parser.add_argument('output', help='Output file, or "-" for standard output')
+    parser.add_argument('--format', choices=FORMATS, help="Default: from the file extension (CSV for stdout)")
+    parser.add_argument('--ids', type=int, nargs='+', help="Project ids")
+    parser.add_argument('--status', action='append', help="Project status (repeat for several)")
+    parser.add_argument('--from', dest='date_from', help="Earliest date, YYYY-MM-DD")
+    parser.add_argument('--to', dest='date_to', help="Latest date, YYYY-MM-DD")
+    parser.add_argument('--date-field', default='estimate_date', choices=DATE_FIELDS)
+    args = parser.parse_args(argv)
+
+    from src.database import create_db_and_tables
+    create_db_and_tables()
+    reporting_engine = create_sqlite_engine(DATABASE_PATH, profile='reporting') # Read-only, large read cache
+    to_stdout = args.output == '-'
+    try:
+        summary = export_data(args.dataset, sys.stdout if to_stdout else args.output, fmt=args.format,
+                              project_ids=args.ids, statuses=args.status, date_from=args.date_from,
+                              date_to=args.date_to, date_field=args.date_field, bind=reporting_engine)
+    finally:
+        reporting_engine.dispose()
+    if not to_stdout: # Keep standard output clean for the data
+        print(f"Exported {summary['rows']} {args.dataset} rows to {args.output} ({summary['format']}) "
+              f"in {summary['seconds']:.2f} s.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,7 +8,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal
 
-from src.database import SessionLocal, CommonItem, CostCode # Import models
+from src.database import CommonItem, CostCode # Import models
+from src.session_manager import open_window_session
 
 class DataManagementWindow(QDialog):
     data_updated = Signal() # Signal to notify parent (EstimateLineItemsWindow) of updates
@@ -17,7 +18,7 @@ class DataManagementWindow(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Manage Common Items & Cost Codes")
         self.setGeometry(200, 200, 800, 600)
-        self.db_session = SessionLocal()
+        self.db_session = open_window_session() # Closed in done()
 
         self.init_ui()
         self.load_common_items()
@@ -425,6 +426,7 @@ class DataManagementWindow(QDialog):
         self.cc_update_button.setEnabled(False)
         self.cc_delete_button.setEnabled(False)
 
-    def closeEvent(self, event):
+    def done(self, result):
+        # Close button (accept), Esc and the window's close button all end the dialog here
         self.db_session.close()
-        super().closeEvent(event)
\ No newline at end of file
+        super().done(result)
\ No newline at end of file
@@ -1,24 +1,109 @@
 # src/database.py
 
 import os
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Text, Float
+from sqlalchemy import create_engine, event, text, Column, Integer, String, ForeignKey, Text, Float, Index
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 import sys
+from src.instrumentation import CountingConnection, instrument_engine
 
 
 # Define the path to the database file
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATABASE_PATH = os.path.join(BASE_DIR, '..', 'contractor_pro.db') # One level up from src
+DATABASE_PATH = os.environ.get('CONTRACTORPRO_DB_PATH') or os.path.join(BASE_DIR, '..', 'contractor_pro.db') # One level up from src
+
+# Stored in PRAGMA user_version once create_db_and_tables() has fully set up a
+# database. Bump it whenever tables, indexes, triggers or seed data change so
+# existing databases go through the full setup once more.
+SCHEMA_VERSION = 4
+
+# SQLite connection profiles. Every new connection gets the PRAGMAs of the
+# active profile, so the settings are in effect however the connection is used.
+# foreign_keys stays OFF in the shipped profiles, as it always was: the app
+# deletes common items and cost codes that line items may still reference,
+# and older databases can hold such dangling ids, which enforcement would
+# turn into failures on later writes (imports, project copies). A profile
+# used for tests or checks can set it to ON.
+SQLITE_PROFILES = {
+    # Desktop use: WAL lets reads run alongside the many small commits the UI
+    # issues, and synchronous=NORMAL only fsyncs at WAL checkpoints.
+    'interactive': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,        # ~16 MB page cache (negative = KiB)
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,        # ms to wait on a locked database
+        'foreign_keys': 'OFF',
+    },
+    # Large imports: no fsync at all and a bigger cache. A crash mid-load can
+    # lose the load, so only use it for data that can be re-imported.
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -128000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+        'foreign_keys': 'OFF',
+    },
+    # Reports and exports: large read cache and mmap, writes refused.
+    'reporting': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'foreign_keys': 'OFF',
+        'query_only': 'ON',
+    },
+}
+
+# Pick the profile with CONTRACTORPRO_DB_PROFILE, e.g. "bulk-load" for import scripts
+DEFAULT_DB_PROFILE = 'interactive'
+DB_PROFILE = os.environ.get('CONTRACTORPRO_DB_PROFILE', DEFAULT_DB_PROFILE)
+
+def apply_sqlite_profile(dbapi_connection, profile):
+    """Runs the PRAGMAs of a profile (name or dict) on a raw sqlite3 connection."""
+    pragmas = SQLITE_PROFILES[profile] if isinstance(profile, str) else profile
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def create_sqlite_engine(database_path=DATABASE_PATH, profile=None):
+    """
+    Creates an engine for a SQLite file with a connection profile applied on every connect.
+
+    Args:
+        database_path (str): Path of the SQLite database file.
+        profile (str): Key of SQLITE_PROFILES. Defaults to DB_PROFILE.
+    """
+    profile = profile or DB_PROFILE
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown database profile '{profile}'. Choose one of: {', '.join(SQLITE_PROFILES)}")
+
+    # Counting connections let the instrumentation attribute fetched rows to UI actions
+    new_engine = create_engine(f'sqlite:///{database_path}', connect_args={'factory': CountingConnection})
+    instrument_engine(new_engine)
+
+    @event.listens_for(new_engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        apply_sqlite_profile(dbapi_connection, profile)
+
+    return new_engine
 
 # Create the engine
-engine = create_engine(f'sqlite:///{DATABASE_PATH}')
+engine = create_sqlite_engine()
 Base = declarative_base()
 
 class Project(Base):
     __tablename__ = 'projects'
     id = Column(Integer, primary_key=True)
     project_name = Column(String, nullable=False, unique=True)
-    client_name = Column(String)
+    client_name = Column(String, index=True)
     client_contact_person = Column(String)
     client_phone = Column(String)
     client_email = Column(String)
@@ -37,13 +122,13 @@ class Project(Base):
 
     # Date fields (stored as YYYY-MM-DD strings)
     estimate_date = Column(String)
-    bid_due_date = Column(String)
-    project_start_date = Column(String)
-    completion_date = Column(String) # Corrected name from 'expected_completion_date'
+    bid_due_date = Column(String, index=True)
+    project_start_date = Column(String, index=True)
+    completion_date = Column(String, index=True) # Corrected name from 'expected_completion_date'
     estimate_date = Column(String)
 
     # Status and Type
-    project_status = Column(String)
+    project_status = Column(String, index=True)
     contract_type = Column(String)
 
     # Financial Percentages
@@ -69,8 +154,8 @@ class Project(Base):
     misc_expenses = Column(Float)
     estimated_total_cost = Column(Float)
     final_total_cost = Column(Float)
-    total_direct_cost = Column(Float)
-    final_project_estimate = Column(Float)
+    total_direct_cost = Column(Float, index=True)
+    final_project_estimate = Column(Float, index=True)
 
     # Relationships
     line_items = relationship('LineItem', back_populates='project', cascade='all, delete-orphan')
@@ -97,7 +182,7 @@ class MFGroup(Base):
     name = Column(String, nullable=False)
     description = Column(Text)
     level = Column(Integer, nullable=False)
-    parent_id = Column(Integer, ForeignKey('mf_groups.id'))
+    parent_id = Column(Integer, ForeignKey('mf_groups.id'), index=True)
 
     parent = relationship(
         'MFGroup',
@@ -122,7 +207,7 @@ class CostCode(Base):
     code = Column(String, nullable=False, unique=True) # e.g., 03 30 00
     name = Column(String, nullable=False)
     description = Column(Text)
-    mf_group_id = Column(Integer, ForeignKey('mf_groups.id'), nullable=True)
+    mf_group_id = Column(Integer, ForeignKey('mf_groups.id'), nullable=True, index=True)
     mf_group = relationship('MFGroup', back_populates='cost_codes')
 
     def __repr__(self):
@@ -130,6 +215,10 @@ class CostCode(Base):
 
 class LineItem(Base):
     __tablename__ = 'line_items'
+    __table_args__ = (
+        # Covers filter_by(project_id=...) and the per-project totals without touching the table rows
+        Index('ix_line_items_project_costs', 'project_id', 'quantity', 'unit_cost', 'markup_percentage'),
+    )
     id = Column(Integer, primary_key=True)
     project_id = Column(Integer, ForeignKey('projects.id'), nullable=False)
     description = Column(Text, nullable=False)
@@ -140,8 +229,8 @@ class LineItem(Base):
     total_cost = Column(Float)
     notes = Column(Text)
     is_common_item = Column(Integer, default=0)
-    common_item_id = Column(Integer, ForeignKey('common_items.id'), nullable=True)
-    cost_code_id = Column(Integer, ForeignKey('cost_codes.id'), nullable=True)
+    common_item_id = Column(Integer, ForeignKey('common_items.id'), nullable=True, index=True)
+    cost_code_id = Column(Integer, ForeignKey('cost_codes.id'), nullable=True, index=True)
 
     # Relationships
     project = relationship('Project', back_populates='line_items')
@@ -151,126 +240,172 @@ class LineItem(Base):
     def __repr__(self):
         return f"<LineItem(id={self.id}, project_id={self.project_id}, description='{self.description}')>"
 
+class ProjectRollup(Base):
+    """Per-project line item totals, kept current by the triggers below on every line item change."""
+    __tablename__ = 'project_rollups'
+    project_id = Column(Integer, ForeignKey('projects.id'), primary_key=True)
+    total_direct_cost = Column(Float, nullable=False, default=0.0)
+    total_cost_with_markup = Column(Float, nullable=False, default=0.0)
+    line_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ProjectRollup(project_id={self.project_id}, line_count={self.line_count})>"
+
+# Each trigger applies only the old/new values of the changed row, so an edit
+# costs the same on a 10-line estimate as on a 10,000-line one, and the rollup
+# is updated inside the same transaction as the line item itself.
+_DIRECT_COST = "{row}.quantity * {row}.unit_cost"
+_MARKED_UP_COST = "{row}.quantity * {row}.unit_cost * (1 + COALESCE({row}.markup_percentage, 0) / 100.0)"
+
+def _rollup_add(row, sign):
+    return f"""
+        INSERT OR IGNORE INTO project_rollups (project_id, total_direct_cost, total_cost_with_markup, line_count)
+        VALUES ({row}.project_id, 0.0, 0.0, 0);
+        UPDATE project_rollups SET
+            total_direct_cost = total_direct_cost {sign} {_DIRECT_COST.format(row=row)},
+            total_cost_with_markup = total_cost_with_markup {sign} {_MARKED_UP_COST.format(row=row)},
+            line_count = line_count {sign} 1
+        WHERE project_id = {row}.project_id;"""
+
+PROJECT_ROLLUP_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_line_items_rollup_insert AFTER INSERT ON line_items
+    BEGIN {_rollup_add('NEW', '+')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_line_items_rollup_delete AFTER DELETE ON line_items
+    BEGIN {_rollup_add('OLD', '-')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_line_items_rollup_update
+    AFTER UPDATE OF project_id, quantity, unit_cost, markup_percentage ON line_items
+    BEGIN {_rollup_add('OLD', '-')} {_rollup_add('NEW', '+')}
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_projects_rollup_delete AFTER DELETE ON projects
+    BEGIN
+        DELETE FROM project_rollups WHERE project_id = OLD.id;
+    END""",
+]
+
+def rebuild_project_rollups(connection):
+    """Recomputes every project rollup from scratch (used to backfill existing databases)."""
+    connection.execute(text("DELETE FROM project_rollups"))
+    connection.execute(text(f"""
+        INSERT INTO project_rollups (project_id, total_direct_cost, total_cost_with_markup, line_count)
+        SELECT project_id, SUM({_DIRECT_COST.format(row='line_items')}),
+               SUM({_MARKED_UP_COST.format(row='line_items')}), COUNT(*)
+        FROM line_items GROUP BY project_id
+    """))
+
+@event.listens_for(Base.metadata, 'after_create')
+def _create_project_rollup_triggers(target, connection, tables=(), **kw):
+    # Runs once all tables exist, and only when create_all() actually created project_rollups
+    if ProjectRollup.__table__ not in tables:
+        return
+    for ddl in PROJECT_ROLLUP_TRIGGERS:
+        connection.execute(text(ddl))
+    rebuild_project_rollups(connection)
+
+# Full-text index behind the dashboard search. It is an external-content FTS5
+# table, so the text lives only in projects; the triggers keep the index in
+# step and only fire when one of the searchable columns changes.
+PROJECT_SEARCH_COLUMNS = (
+    'project_name', 'client_name', 'client_contact_person',
+    'client_address_street', 'client_address_city', 'client_address_state', 'client_address_zip',
+    'project_address', 'project_city', 'project_state', 'project_zip',
+    'scope_of_work', 'notes',
+)
+
+def _project_search_ddl():
+    cols = ', '.join(PROJECT_SEARCH_COLUMNS)
+    new_vals = ', '.join(f'NEW.{c}' for c in PROJECT_SEARCH_COLUMNS)
+    old_vals = ', '.join(f'OLD.{c}' for c in PROJECT_SEARCH_COLUMNS)
+    return [
+        f"""CREATE VIRTUAL TABLE projects_fts USING fts5(
+            {cols}, content='projects', content_rowid='id', prefix='2 3'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_projects_fts_insert AFTER INSERT ON projects BEGIN
+            INSERT INTO projects_fts (rowid, {cols}) VALUES (NEW.id, {new_vals});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_projects_fts_delete AFTER DELETE ON projects BEGIN
+            INSERT INTO projects_fts (projects_fts, rowid, {cols}) VALUES ('delete', OLD.id, {old_vals});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_projects_fts_update AFTER UPDATE OF {cols} ON projects BEGIN
+            INSERT INTO projects_fts (projects_fts, rowid, {cols}) VALUES ('delete', OLD.id, {old_vals});
+            INSERT INTO projects_fts (rowid, {cols}) VALUES (NEW.id, {new_vals});
+        END""",
+        "INSERT INTO projects_fts (projects_fts) VALUES ('rebuild')",
+    ]
+
+def ensure_project_search_index(bind=None):
+    """Creates the projects_fts index and its triggers, and indexes existing projects, if it does not exist yet."""
+    bind = bind if bind is not None else engine
+    with bind.begin() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'")
+        ).first()
+        if exists:
+            return
+        try:
+            for ddl in _project_search_ddl():
+                connection.execute(text(ddl))
+        except Exception as e:
+            # SQLite builds without FTS5 fall back to the plain search in project_search.py
+            print(f"DEBUG: Could not create full-text project index: {e}")
+
 Session = sessionmaker(bind=engine)
 
-def create_db_and_tables():
+def ensure_indexes(bind=None):
+    """Creates any index declared on the models that is missing from the database (create_all only indexes new tables)."""
+    bind = bind if bind is not None else engine
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+def get_schema_version(bind=None):
+    """Returns the PRAGMA user_version of the database (0 for a new or pre-versioning database)."""
+    bind = bind if bind is not None else engine
+    with bind.connect() as connection:
+        return connection.execute(text("PRAGMA user_version")).scalar()
+
+def set_schema_version(version, bind=None):
+    bind = bind if bind is not None else engine
+    with bind.begin() as connection:
+        connection.execute(text(f"PRAGMA user_version={int(version)}"))
+
+_initialized = False
+
+def create_db_and_tables(force=False):
+    """
+    Creates tables, indexes and seed data. Nothing runs at import time; call this once at startup.
+
+    A database already stamped with the current SCHEMA_VERSION is left alone,
+    so a warm start costs a single PRAGMA read instead of reflection plus the
+    seed checks below.
+
+    Args:
+        force (bool): Run the full setup even if the schema version matches.
+    """
+    global _initialized
+    if _initialized and not force:
+        return
+    if not force and os.path.exists(DATABASE_PATH) and get_schema_version() == SCHEMA_VERSION:
+        _initialized = True
+        return
+
+    if not os.path.exists(DATABASE_PATH):
+        print(f"Database file not found at {DATABASE_PATH}. Creating new database and tables.")
+    else:
+        print(f"Database file found at {DATABASE_PATH}. Ensuring tables exist.")
     Base.metadata.create_all(engine)
-    print(f"Database file found at {DATABASE_PATH}. Ensuring tables exist.")
+    ensure_indexes(engine)
+    ensure_project_search_index(engine)
     session = Session()
     try:
-        # Check if MFGroup table is empty and populate if so
-        if session.query(MFGroup).count() == 0:
-            print("Populating initial MasterFormat Groups...")
-            mf_groups_data = [
-                {'code': '00', 'name': 'Procurement and Contracting Requirements', 'level': 0},
-                {'code': '01', 'name': 'General Requirements', 'level': 0},
-                {'code': '02', 'name': 'Existing Conditions', 'level': 0},
-                {'code': '03', 'name': 'Concrete', 'level': 0},
-                {'code': '04', 'name': 'Masonry', 'level': 0},
-                {'code': '05', 'name': 'Metals', 'level': 0},
-                {'code': '06', 'name': 'Wood, Plastics, and Composites', 'level': 0},
-                {'code': '07', 'name': 'Thermal and Moisture Protection', 'level': 0},
-                {'code': '08', 'name': 'Openings', 'level': 0},
-                {'code': '09', 'name': 'Finishes', 'level': 0},
-                {'code': '10', 'name': 'Specialties', 'level': 0},
-                {'code': '11', 'name': 'Equipment', 'level': 0},
-                {'code': '12', 'name': 'Furnishings', 'level': 0},
-                {'code': '13', 'name': 'Special Construction', 'level': 0},
-                {'code': '14', 'name': 'Conveying Equipment', 'level': 0},
-                {'code': '21', 'name': 'Fire Suppression', 'level': 0},
-                {'code': '22', 'name': 'Plumbing', 'level': 0},
-                {'code': '23', 'name': 'Heating, Ventilating, and Air Conditioning (HVAC)', 'level': 0},
-                {'code': '25', 'name': 'Integrated Automation', 'level': 0},
-                {'code': '26', 'name': 'Electrical', 'level': 0},
-                {'code': '27', 'name': 'Communications', 'level': 0},
-                {'code': '28', 'name': 'Electronic Safety and Security', 'level': 0},
-                {'code': '31', 'name': 'Earthwork', 'level': 0},
-                {'code': '32', 'name': 'Exterior Improvements', 'level': 0},
-                {'code': '33', 'name': 'Utilities', 'level': 0},
-                {'code': '34', 'name': 'Transportation', 'level': 0},
-                {'code': '35', 'name': 'Waterway and Marine Construction', 'level': 0},
-                {'code': '40', 'name': 'Process Integration', 'level': 0},
-                {'code': '41', 'name': 'Material Processing and Handling Equipment', 'level': 0},
-                {'code': '42', 'name': 'Process Heating, Cooling, and Drying Equipment', 'level': 0},
-                {'code': '43', 'name': 'Process Gas and Liquid Handling, Purification and Storage Equipment', 'level': 0},
-                {'code': '44', 'name': 'Pollution Control Equipment', 'level': 0},
-                {'code': '45', 'name': 'Industry-Specific Manufacturing Equipment', 'level': 0},
-                {'code': '46', 'name': 'Water and Wastewater Equipment', 'level': 0},
-                {'code': '48', 'name': 'Electrical Power Generation', 'level': 0},
-            ]
-
-            mf_group_objs = {}
-            for data in mf_groups_data:
-                group = MFGroup(**data)
-                session.add(group)
-                mf_group_objs[data['code']] = group
-            session.commit()
-
-            if session.query(MFGroup).filter(MFGroup.parent_id.isnot(None)).count() == 0:
-                print("Populating initial MasterFormat Sub-Groups...")
-                mf_sub_groups_data = [
-                    {'code': '03 01 00', 'name': 'Maintenance of Concrete', 'level': 1, 'parent_code': '03'},
-                    {'code': '03 05 00', 'name': 'Common Work Results for Concrete', 'level': 1, 'parent_code': '03'},
-                    {'code': '03 10 00', 'name': 'Concrete Forming and Accessories', 'level': 1, 'parent_code': '03'},
-                    {'code': '03 15 00', 'name': 'Concrete Accessories', 'level': 1, 'parent_code': '03'},
-                    {'code': '03 20 00', 'name': 'Concrete Reinforcing', 'level': 1, 'parent_code': '03'},
-                    {'code': '03 30 00', 'name': 'Cast-in-Place Concrete', 'level': 1, 'parent_code': '03'},
-                    {'code': '06 10 00', 'name': 'Rough Carpentry', 'level': 1, 'parent_code': '06'},
-                    {'code': '09 20 00', 'name': 'Gypsum Board', 'level': 1, 'parent_code': '09'},
-                    {'code': '09 90 00', 'name': 'Painting and Coating', 'level': 1, 'parent_code': '09'},
-                ]
-                for data in mf_sub_groups_data:
-                    parent = mf_group_objs.get(data['parent_code'])
-                    if parent:
-                        group = MFGroup(
-                            code=data['code'],
-                            name=data['name'],
-                            level=data['level'],
-                            parent=parent
-                        )
-                        session.add(group)
-                        mf_group_objs[data['code']] = group
-                session.commit()
-
-        # Check if CommonItem table is empty and populate if so
-        if session.query(CommonItem).count() == 0:
-            print("Populating initial Common Items...")
-            common_items_data = [
-                {'name': '2x4 Lumber', 'description': 'Standard 2x4 framing lumber, 8ft length', 'unit': 'EA', 'type': 'Material', 'mf_code': '06 10 00'},
-                {'name': 'Drywall Sheet', 'description': '1/2 inch gypsum board, 4x8 sheet', 'unit': 'EA', 'type': 'Material', 'mf_code': '09 20 00'},
-                {'name': 'Concrete Mix', 'description': '50lb bag of ready-mix concrete', 'unit': 'BAG', 'type': 'Material', 'mf_code': '03 05 00'},
-                {'name': 'Painter Hourly Rate', 'description': 'Hourly rate for skilled painter', 'unit': 'HR', 'type': 'Labor', 'mf_code': '09 90 00'},
-                {'name': 'Electrician Hourly Rate', 'description': 'Hourly rate for licensed electrician', 'unit': 'HR', 'type': 'Labor', 'mf_code': '26 00 00'},
-                {'name': 'Plumbing Fixture Installation', 'description': 'Installation service for standard plumbing fixtures', 'unit': 'LS', 'type': 'Service', 'mf_code': '22 00 00'},
-                {'name': 'Structural Steel Beam', 'description': 'W10x33 structural steel beam, per linear foot', 'unit': 'LF', 'type': 'Material', 'mf_code': '05 12 00'},
-            ]
-            session.bulk_insert_mappings(CommonItem, common_items_data)
-            session.commit()
-
-        # Check if CostCode table is empty and populate if so
-        if session.query(CostCode).count() == 0:
-            print("Populating initial Cost Codes...")
-            mf_concrete_group = session.query(MFGroup).filter_by(code='03 30 00').first()
-            mf_rough_carpentry_group = session.query(MFGroup).filter_by(code='06 10 00').first()
-            mf_gypsum_board_group = session.query(MFGroup).filter_by(code='09 20 00').first()
-            mf_painting_group = session.query(MFGroup).filter_by(code='09 90 00').first()
-            mf_plumbing_group = session.query(MFGroup).filter_by(code='22').first()
-            mf_electrical_group = session.query(MFGroup).filter_by(code='26').first()
-
-            cost_codes_data = [
-                {'code': '03 30 00', 'name': 'Cast-in-Place Concrete', 'description': 'All concrete related work for slabs, foundations, walls.', 'mf_group': mf_concrete_group},
-                {'code': '06 10 00', 'name': 'Rough Carpentry', 'description': 'Framing, sheathing, and blocking.', 'mf_group': mf_rough_carpentry_group},
-                {'code': '09 20 00', 'name': 'Gypsum Board', 'description': 'Drywall installation and finishing.', 'mf_group': mf_gypsum_board_group},
-                {'code': '09 90 00', 'name': 'Painting', 'description': 'Interior and exterior painting.', 'mf_group': mf_painting_group},
-                {'code': '22 00 00', 'name': 'Plumbing Systems', 'description': 'All plumbing systems and fixtures.', 'mf_group': mf_plumbing_group},
-                {'code': '26 00 00', 'name': 'Electrical Systems', 'description': 'All electrical systems, wiring, and fixtures.', 'mf_group': mf_electrical_group},
-            ]
-            valid_cost_codes = [
-                CostCode(code=d['code'], name=d['name'], description=d['description'], mf_group=d['mf_group'])
-                for d in cost_codes_data if d['mf_group'] is not None
-            ]
-            session.add_all(valid_cost_codes)
-            session.commit()
+        # MasterFormat groups, cost codes and common items come from the files in data/
+        from src.catalog_loader import load_catalog
+        catalog_stats = load_catalog(only_empty=True)
+        if any(catalog_stats[table] for table in ('mf_groups', 'cost_codes', 'common_items')):
+            print(f"Populated initial catalog: {catalog_stats['mf_groups']} MasterFormat groups, "
+                  f"{catalog_stats['cost_codes']} cost codes, {catalog_stats['common_items']} common items.")
 
         # Check if Project table is empty and populate if so
         if session.query(Project).count() == 0:
@@ -387,17 +522,12 @@ def create_db_and_tables():
                 session.add_all(valid_line_items)
                 session.commit()
 
+        # Only stamp the version once everything above succeeded
+        set_schema_version(SCHEMA_VERSION)
+        _initialized = True
+
     except Exception as e:
         session.rollback()
         print(f"DEBUG: Database Error during initialization: {e}")
     finally:
         session.close()
-
-if not os.path.exists(DATABASE_PATH):
-    print(f"Database file not found at {DATABASE_PATH}. Creating new database and tables.")
-    create_db_and_tables()
-else:
-    print(f"Database file found at {DATABASE_PATH}. Ensuring tables exist.")
-    create_db_and_tables()
-
-Session = sessionmaker(bind=engine)
\ No newline at end of file
@@ -0,0 +1,102 @@
+# src/diagnostics_dialog.py
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView,
+    QAbstractItemView, QPlainTextEdit, QPushButton, QLabel
+)
+from PySide6.QtCore import Qt
+from src import instrumentation
+
+COLUMNS = ["Action", "Started", "Wall ms", "SQL ms", "Queries", "Rows", "Warnings"]
+
+
+class DiagnosticsDialog(QDialog):
+    """Shows the query count, rows and timings of recent UI actions (see instrumentation.py)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics - Recent Actions")
+        self.setGeometry(200, 200, 1000, 600)
+        self.records = []
+        self.init_ui()
+        self.refresh()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout(self)
+
+        main_layout.addWidget(QLabel(f"Metrics are also written to: {instrumentation.METRICS_LOG_PATH}"))
+
+        self.actions_table = QTableWidget(0, len(COLUMNS))
+        self.actions_table.setHorizontalHeaderLabels(COLUMNS)
+        self.actions_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.actions_table.horizontalHeader().setStretchLastSection(True)
+        self.actions_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.actions_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.actions_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.actions_table.itemSelectionChanged.connect(self.show_selected_details)
+        main_layout.addWidget(self.actions_table, 2)
+
+        # Statement breakdown of the selected action
+        self.details_text = QPlainTextEdit()
+        self.details_text.setReadOnly(True)
+        main_layout.addWidget(self.details_text, 1)
+
+        button_layout = QHBoxLayout()
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        button_layout.addWidget(refresh_button)
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(self.clear)
+        button_layout.addWidget(clear_button)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(close_button)
+        main_layout.addLayout(button_layout)
+
+    def refresh(self):
+        # Newest first
+        self.records = list(reversed(instrumentation.recent_actions()))
+        self.actions_table.setRowCount(len(self.records))
+        for row, record in enumerate(self.records):
+            warnings = []
+            if record['repeated_statements']:
+                warnings.append(f"possible N+1 ({record['repeated_statements'][0]['count']}x)")
+            if record['slow_statements']:
+                warnings.append(f"{len(record['slow_statements'])} slow")
+            if record['error']:
+                warnings.append("error")
+            values = [
+                record['action'], record['started_at'], f"{record['wall_ms']:.1f}", f"{record['sql_ms']:.1f}",
+                str(record['queries']), str(record['rows']), ", ".join(warnings),
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if 2 <= column <= 5:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.actions_table.setItem(row, column, item)
+        self.details_text.clear()
+
+    def clear(self):
+        instrumentation.clear_recent_actions()
+        self.refresh()
+
+    def show_selected_details(self):
+        row = self.actions_table.currentRow()
+        if not 0 <= row < len(self.records):
+            self.details_text.clear()
+            return
+        record = self.records[row]
+        lines = [
+            f"{record['action']}: {record['queries']} queries ({record['distinct_statements']} distinct), "
+            f"{record['rows']} rows, {record['sql_ms']:.1f} ms in SQL of {record['wall_ms']:.1f} ms total",
+        ]
+        if record['error']:
+            lines.append(f"Error: {record['error']}")
+        if record['repeated_statements']:
+            lines.append("\nRepeated statements (likely N+1):")
+            lines.extend(f"  {entry['count']}x  {entry['sql']}" for entry in record['repeated_statements'])
+        if record['slow_statements']:
+            lines.append("\nSlow statements:")
+            lines.extend(f"  {entry['ms']:.1f} ms  {entry['sql']}" for entry in record['slow_statements'])
+        lines.append("\nTop statements by time:")
+        lines.extend(f"  {entry['count']}x  {entry['ms']:.1f} ms  {entry['sql']}" for entry in record['top_statements'])
+        self.details_text.setPlainText("\n".join(lines))
@@ -0,0 +1,224 @@
+# src/estimate_engine.py
+"""
+Headless estimating engine.
+
+All estimate math lives here so the Qt windows, the PDF export and any batch
+job compute totals the same way. Line items are passed in as columns
+(parallel sequences of quantity, unit_cost and markup_percentage) and every
+total is produced in a single pass over those columns.
+
+Percentages follow the conventions used throughout the app: line item markup,
+project overhead and project profit are all stored as whole percentages
+(e.g. 15.0 means 15%).
+"""
+
+from sqlalchemy import select, func, update
+from src.database import Project, LineItem, ProjectRollup
+
+# Fixed project costs that are added on top of the marked-up line items.
+FIXED_COST_FIELDS = ('permit_cost', 'bonding_cost', 'insurance_cost', 'misc_expenses')
+
+
+def line_total(quantity, unit_cost, markup_percentage):
+    """Returns the marked-up total for a single line item."""
+    return (quantity or 0.0) * (unit_cost or 0.0) * (1 + (markup_percentage or 0.0) / 100)
+
+
+def line_totals(quantities, unit_costs, markup_percentages):
+    """
+    Computes the marked-up total of every line item in one pass.
+
+    Args:
+        quantities (sequence): Quantity column.
+        unit_costs (sequence): Unit cost column.
+        markup_percentages (sequence): Markup % column (None is treated as 0).
+
+    Returns:
+        list: One marked-up total per line item, in input order.
+    """
+    return [
+        (q or 0.0) * (c or 0.0) * (1 + (m or 0.0) / 100)
+        for q, c, m in zip(quantities, unit_costs, markup_percentages)
+    ]
+
+
+def project_rates(project):
+    """Extracts the percentages and fixed costs used for rollups from a Project (or any object with the same attributes)."""
+    rates = {
+        'overhead_percentage': getattr(project, 'overhead_percentage', None) or 0.0,
+        'profit_percentage': getattr(project, 'profit_percentage', None) or 0.0,
+    }
+    for field in FIXED_COST_FIELDS:
+        rates[field] = getattr(project, field, None) or 0.0
+    return rates
+
+
+def rollup_totals(total_direct_cost, total_cost_with_markup, rates):
+    """
+    Applies project overhead, profit and fixed costs to line item sums.
+
+    Args:
+        total_direct_cost (float): Sum of quantity * unit_cost.
+        total_cost_with_markup (float): Sum of the marked-up line totals.
+        rates (dict): Output of project_rates().
+
+    Returns:
+        dict: The financial summary for the project.
+    """
+    overhead_amount = total_cost_with_markup * (rates['overhead_percentage'] / 100)
+    profit_amount = total_cost_with_markup * (rates['profit_percentage'] / 100)
+    fixed_costs = sum(rates[field] for field in FIXED_COST_FIELDS)
+
+    return {
+        'total_direct_cost': total_direct_cost,
+        'total_cost_with_markup': total_cost_with_markup,
+        'overhead_amount': overhead_amount,
+        'profit_amount': profit_amount,
+        'fixed_costs': fixed_costs,
+        'final_project_estimate': total_cost_with_markup + overhead_amount + profit_amount + fixed_costs,
+    }
+
+
+def compute_estimate(quantities, unit_costs, markup_percentages, rates):
+    """
+    Computes per-line totals and the project rollup for one estimate.
+
+    Returns:
+        dict: The rollup from rollup_totals() plus a 'line_totals' list.
+    """
+    totals = line_totals(quantities, unit_costs, markup_percentages)
+    total_direct_cost = sum((q or 0.0) * (c or 0.0) for q, c in zip(quantities, unit_costs))
+    result = rollup_totals(total_direct_cost, sum(totals), rates)
+    result['line_totals'] = totals
+    return result
+
+
+def compute_portfolio(project_ids, quantities, unit_costs, markup_percentages, rates_by_project):
+    """
+    Computes rollups for many projects from one set of line item columns.
+
+    Args:
+        project_ids (sequence): Project id column, parallel to the other columns.
+        quantities, unit_costs, markup_percentages (sequence): Line item columns.
+        rates_by_project (dict): project_id -> project_rates() for every project to report.
+
+    Returns:
+        dict: project_id -> rollup_totals() result. Projects without line items get zero sums.
+    """
+    direct = dict.fromkeys(rates_by_project, 0.0)
+    marked_up = dict.fromkeys(rates_by_project, 0.0)
+    for pid, q, c, m in zip(project_ids, quantities, unit_costs, markup_percentages):
+        if pid not in direct:
+            continue
+        cost = (q or 0.0) * (c or 0.0)
+        direct[pid] += cost
+        marked_up[pid] += cost * (1 + (m or 0.0) / 100)
+
+    return {
+        pid: rollup_totals(direct[pid], marked_up[pid], rates)
+        for pid, rates in rates_by_project.items()
+    }
+
+
+def load_line_item_columns(session, project_id):
+    """Fetches only the numeric line item columns for a project and returns them as (ids, quantities, unit_costs, markups)."""
+    rows = session.execute(
+        select(LineItem.id, LineItem.quantity, LineItem.unit_cost, LineItem.markup_percentage)
+        .where(LineItem.project_id == project_id)
+        .order_by(LineItem.id)
+    ).all()
+    if not rows:
+        return [], [], [], []
+    ids, quantities, unit_costs, markups = (list(col) for col in zip(*rows))
+    return ids, quantities, unit_costs, markups
+
+
+def calculate_project_totals(session, project):
+    """Computes the financial summary of a single project from its line items."""
+    _, quantities, unit_costs, markups = load_line_item_columns(session, project.id)
+    return compute_estimate(quantities, unit_costs, markups, project_rates(project))
+
+
+def rollup_project_totals(session, project):
+    """
+    Computes the financial summary of a project from its maintained rollup row.
+
+    This is a single primary-key lookup, so it costs the same regardless of how
+    many line items the project has. Pending changes are flushed first so the
+    rollup triggers have already seen them.
+    """
+    session.flush()
+    row = session.execute(
+        select(ProjectRollup.total_direct_cost, ProjectRollup.total_cost_with_markup)
+        .where(ProjectRollup.project_id == project.id)
+    ).first()
+    total_direct_cost, total_cost_with_markup = row if row else (0.0, 0.0)
+    return rollup_totals(total_direct_cost, total_cost_with_markup, project_rates(project))
+
+
+def calculate_portfolio_totals(session, project_ids=None):
+    """
+    Computes rollups for many (or all) projects with one aggregate query.
+
+    The per-project sums are done by SQLite in a single GROUP BY instead of
+    one round-trip per project.
+
+    Returns:
+        dict: project_id -> rollup_totals() result.
+    """
+    project_query = select(
+        Project.id, Project.overhead_percentage, Project.profit_percentage,
+        *(getattr(Project, field) for field in FIXED_COST_FIELDS)
+    )
+    sums_query = (
+        select(
+            LineItem.project_id,
+            func.sum(LineItem.quantity * LineItem.unit_cost),
+            func.sum(LineItem.quantity * LineItem.unit_cost * (1 + func.coalesce(LineItem.markup_percentage, 0.0) / 100)),
+        )
+        .group_by(LineItem.project_id)
+    )
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        project_query = project_query.where(Project.id.in_(project_ids))
+        sums_query = sums_query.where(LineItem.project_id.in_(project_ids))
+
+    rates_by_project = {p.id: project_rates(p) for p in session.execute(project_query)}
+    sums = {pid: (direct or 0.0, marked_up or 0.0) for pid, direct, marked_up in session.execute(sums_query)}
+
+    return {
+        pid: rollup_totals(*sums.get(pid, (0.0, 0.0)), rates)
+        for pid, rates in rates_by_project.items()
+    }
+
+
+def apply_totals_to_project(project, totals):
+    """Stores the computed totals on the Project row (the caller commits)."""
+    project.total_direct_cost = totals['total_direct_cost']
+    project.final_project_estimate = totals['final_project_estimate']
+
+
+def store_rollup_totals(connection, project_id):
+    """
+    Computes a project's totals from its rollup row and stores them on the project, with Core statements only.
+
+    For set-based writers (imports, clones) that work on a connection rather
+    than through ORM objects. Runs in the caller's transaction.
+
+    Returns:
+        dict: The rollup_totals() result.
+    """
+    rates_row = connection.execute(
+        select(Project.overhead_percentage, Project.profit_percentage, *(getattr(Project, f) for f in FIXED_COST_FIELDS))
+        .where(Project.id == project_id)
+    ).first()
+    sums = connection.execute(
+        select(ProjectRollup.total_direct_cost, ProjectRollup.total_cost_with_markup)
+        .where(ProjectRollup.project_id == project_id)
+    ).first()
+    totals = rollup_totals(*(sums or (0.0, 0.0)), project_rates(rates_row))
+    connection.execute(
+        update(Project).where(Project.id == project_id)
+        .values(total_direct_cost=totals['total_direct_cost'], final_project_estimate=totals['final_project_estimate'])
+    )
+    return totals
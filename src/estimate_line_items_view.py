@@ -2,44 +2,60 @@
 
 import sys
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QVBoxLayout, QWidget, QTableWidget,
-    QTableWidgetItem, QHeaderView, QPushButton, QHBoxLayout, QLabel,
-    QLineEdit, QTextEdit, QDoubleSpinBox, QComboBox, QFormLayout, QMessageBox, QDialog
+    QApplication, QMainWindow, QVBoxLayout, QWidget, QTableView,
+    QAbstractItemView, QHeaderView, QPushButton, QHBoxLayout, QLabel,
+    QLineEdit, QTextEdit, QDoubleSpinBox, QComboBox, QFormLayout, QMessageBox, QDialog, QProgressDialog,
+    QFileDialog, QCheckBox
 )
-from PySide6.QtCore import Qt, Signal, QSize
-from sqlalchemy import func
+from PySide6.QtCore import Qt, Signal, QSize, QThreadPool
+from sqlalchemy import select
 from src.database import Session, Project, LineItem, CommonItem, CostCode, create_db_and_tables
-from src.pdf_generator import generate_pdf_estimate
+from src.estimate_engine import rollup_project_totals, apply_totals_to_project, project_rates
+from src.estimate_loader import LINE_ITEM_FIELDS, load_estimate, pdf_payload
+from src.line_items_model import LineItemTableModel
+from src.line_item_buffer import LineItemEditBuffer, VALUE_FIELDS
+from src.session_manager import open_window_session, keep
+from src.instrumentation import instrumented_action
 
 class EstimateLineItemsWindow(QMainWindow):
     # Signal to update total costs in the main dashboard or general info
     project_costs_updated_signal = Signal()
 
-    def __init__(self, project_id, db_session, parent=None):
+    def __init__(self, project_id, db_session=None, parent=None):
         super().__init__(parent)
-        self.db_session = db_session
+        # Our own unit of work unless the caller lends us a session (which it then closes itself)
+        self.owns_db_session = db_session is None
+        self.db_session = open_window_session() if self.owns_db_session else db_session
         self.current_project_id = project_id
-        self.project = self.db_session.query(Project).get(project_id) # Load the project here
-
-
-        # CORRECTED: Filter by 'id' not 'project_id' for the Project model
-        self.current_project = self.db_session.query(Project).filter_by(id=self.current_project_id).first()
+        # Project, line items and totals come from one fixed-size load
+        estimate = load_estimate(self.db_session, self.current_project_id)
+        self.project = self.current_project = estimate['project']
+        keep(self.db_session, self.current_project) # Edited on every totals update
 
         if not self.current_project:
             QMessageBox.critical(self, "Error", "Project not found!")
             self.close()
             return
 
-        self.setWindowTitle(f"Line Items for Project: {self.current_project.project_name}")
+        self.setWindowTitle(f"Line Items for Project: {self.current_project.project_name}[*]")
         self.setGeometry(150, 150, 1000, 700)
         self.setMinimumSize(QSize(900, 600))
 
+        # PDF exports render on a worker thread (see pdf_worker.py)
+        self.pdf_thread_pool = QThreadPool(self)
+        self.pdf_thread_pool.setMaxThreadCount(1)
+        self.pdf_export_task = None
+        self.pdf_progress_dialog = None
+
+        # Edits staged until Save when "Stage edits" is checked
+        self.edit_buffer = LineItemEditBuffer(self.current_project_id)
+
         self.common_items_data = self.get_common_items()
         self.cost_codes_data = self.get_cost_codes()
 
         self.init_ui()
-        self.load_line_items()
-        self.calculate_and_display_totals()
+        self.line_items_model.load_rows(estimate['line_items'])
+        self.calculate_and_display_totals(estimate['totals'])
 
     def init_ui(self):
         central_widget = QWidget()
@@ -50,16 +66,15 @@ class EstimateLineItemsWindow(QMainWindow):
         self.totals_label = QLabel("Total Direct Cost: $0.00 | Final Estimate: $0.00", alignment=Qt.AlignRight)
         main_layout.addWidget(self.totals_label)
 
-        # Line Items Table
-        self.line_items_table = QTableWidget()
-        self.line_items_table.setColumnCount(8)
-        self.line_items_table.setHorizontalHeaderLabels([
-            "ID", "Description", "Quantity", "Unit", "Unit Cost", "Markup %", "Total Cost", "Notes"
-        ])
+        # Line Items Table (rows live in a compact model, cells are formatted on paint)
+        self.line_items_model = LineItemTableModel(self)
+        self.line_items_table = QTableView()
+        self.line_items_table.setModel(self.line_items_model)
         self.line_items_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.line_items_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.line_items_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.line_items_table.itemSelectionChanged.connect(self.on_line_item_selection_changed)
+        self.line_items_table.verticalHeader().setDefaultSectionSize(24) # Uniform rows keep scrolling cheap
+        self.line_items_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.line_items_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.line_items_table.selectionModel().selectionChanged.connect(self.on_line_item_selection_changed)
         main_layout.addWidget(self.line_items_table)
 
         # Line Item Input Form
@@ -98,6 +113,7 @@ class EstimateLineItemsWindow(QMainWindow):
         self.common_item_combo.setPlaceholderText("Select Common Item")
         # Populate with common items
         self.common_item_map = {item.name: item for item in self.common_items_data}
+        self.common_item_names_by_id = {item.id: item.name for item in self.common_items_data}
         self.common_item_combo.addItem("-- Select Common Item --")
         self.common_item_combo.addItems(sorted(self.common_item_map.keys()))
         self.common_item_combo.currentIndexChanged.connect(self.load_common_item_data)
@@ -108,6 +124,7 @@ class EstimateLineItemsWindow(QMainWindow):
         self.cost_code_combo.setPlaceholderText("Select Cost Code")
         # Populate with cost codes
         self.cost_code_map = {f"{code.code} - {code.name}": code for code in self.cost_codes_data}
+        self.cost_code_labels_by_id = {code.id: f"{code.code} - {code.name}" for code in self.cost_codes_data}
         self.cost_code_combo.addItem("-- Select Cost Code --")
         self.cost_code_combo.addItems(sorted(self.cost_code_map.keys()))
         input_layout.addRow("Cost Code:", self.cost_code_combo)
@@ -140,110 +157,159 @@ class EstimateLineItemsWindow(QMainWindow):
         button_layout.addWidget(self.clear_form_button)
 
         # Add this after your existing buttons (Add, Update, Delete, Clear)
-        pdf_export_button = QPushButton("Export to PDF")
-        pdf_export_button.clicked.connect(self.export_estimate_to_pdf)
-        button_layout.addWidget(pdf_export_button)
+        self.pdf_export_button = QPushButton("Export to PDF")
+        self.pdf_export_button.clicked.connect(self.export_estimate_to_pdf)
+        button_layout.addWidget(self.pdf_export_button)
+
+        self.import_takeoff_button = QPushButton("Import Takeoff...")
+        self.import_takeoff_button.clicked.connect(self.import_takeoff_file)
+        button_layout.addWidget(self.import_takeoff_button)
 
         main_layout.addLayout(button_layout)
 
+        # Staged editing: adds, updates and deletes stay in memory until Save, then go in one transaction
+        staging_layout = QHBoxLayout()
+        self.stage_edits_checkbox = QCheckBox("Stage edits until Save")
+        self.stage_edits_checkbox.setToolTip("Keep added, changed and deleted line items in memory and save them all at once")
+        self.stage_edits_checkbox.toggled.connect(self.toggle_staged_editing)
+        staging_layout.addWidget(self.stage_edits_checkbox)
+        staging_layout.addStretch()
+
+        self.save_changes_button = QPushButton("Save Changes")
+        self.save_changes_button.clicked.connect(self.save_staged_changes)
+        staging_layout.addWidget(self.save_changes_button)
+
+        self.revert_changes_button = QPushButton("Revert")
+        self.revert_changes_button.clicked.connect(self.revert_staged_changes)
+        staging_layout.addWidget(self.revert_changes_button)
+
+        main_layout.addLayout(staging_layout)
+        self.update_staging_controls()
+
+    @instrumented_action()
     def export_estimate_to_pdf(self):
         if not self.project:
             QMessageBox.warning(self, "Export Error", "No project loaded to export.")
             return
+        if self.pdf_export_task is not None:
+            QMessageBox.information(self, "PDF Export", "An export is already running.")
+            return
+        if not self.resolve_staged_changes("exporting"):
+            return # The PDF is rendered from the saved estimate
 
         try:
-            # 1. Prepare project_data dictionary
-
-            # Reconstruct full client address from its components
-            client_address_parts = [
-                self.project.client_address_street,
-                self.project.client_address_city,
-                self.project.client_address_state,
-                self.project.client_address_zip
-            ]
-            # Filter out None/empty parts and join them with ", "
-            # If all parts are None or empty, default to "N/A"
-            full_client_address = ", ".join(filter(None, client_address_parts)) or "N/A"
-
-            # Reconstruct full project address from its components
-            project_address_parts = [
-                self.project.project_address, # This is the street part in your model
-                self.project.project_city,
-                self.project.project_state,
-                self.project.project_zip
-            ]
-            full_project_address = ", ".join(filter(None, project_address_parts)) or "N/A"
-
-            project_data_for_pdf = {
-                'project_id': self.project.id,
-                'project_name': self.project.project_name or "N/A",
-                'project_address': full_project_address, # USE THE RECONSTRUCTED FULL ADDRESS
-                'estimate_date': str(self.project.estimate_date) if self.project.estimate_date else "N/A",
-                'bid_due_date': str(self.project.bid_due_date) if self.project.bid_due_date else "N/A",
-                'project_start_date': str(self.project.project_start_date) if self.project.project_start_date else "N/A",
-                'completion_date': str(self.project.completion_date) if self.project.completion_date else "N/A",
-
-                'client_name': self.project.client_name or "N/A",
-                'client_contact': self.project.client_contact_person or "N/A", # Map to client_contact_person
-                'client_phone': self.project.client_phone or "N/A",
-                'client_email': self.project.client_email or "N/A",
-                'client_address': full_client_address, # USE THE RECONSTRUCTED FULL ADDRESS
-
-                'scope_of_work': self.project.scope_of_work or "",
-                'project_notes': self.project.notes or "" # USE 'notes' from your Project model
-            }
-
-            # 2. Prepare line_items_data list of dictionaries (no changes needed here from last correct version)
-            line_items_raw = self.db_session.query(LineItem).filter_by(project_id=self.project.id).order_by(LineItem.id).all()
-            line_items_data_for_pdf = []
-
-            for li in line_items_raw:
-                category = "Custom"
-                uom = li.unit or "N/A"
-
-                if li.common_item:
-                    category = li.common_item.type or li.common_item.name
-                    uom = li.common_item.unit or uom
-                elif li.cost_code:
-                    category = li.cost_code.name or category
-
-                line_item_total = li.total_cost if li.total_cost is not None else \
-                                  (li.quantity * li.unit_cost * (1 + (li.markup_percentage or 0)/100))
-
-                line_items_data_for_pdf.append({
-                    "description": li.description or "N/A",
-                    "category": category,
-                    "uom": uom,
-                    "quantity": li.quantity if li.quantity is not None else 0.0,
-                    "unit_cost": li.unit_cost if li.unit_cost is not None else 0.0,
-                    "total": line_item_total
-                })
+            # Project, line items (with common item / cost code resolved) and totals in three queries
+            estimate = load_estimate(self.db_session, self.current_project_id)
+            if estimate['project'] is None:
+                QMessageBox.warning(self, "Export Error", "No project loaded to export.")
+                return
+            # Plain dicts only: the render runs on a worker thread and must not touch the session
+            project_data_for_pdf, line_items_data_for_pdf, financial_summary_data_for_pdf = pdf_payload(estimate)
             if not line_items_data_for_pdf:
                 QMessageBox.information(self, "Export Info", "No line items to export for this project.")
                 return
+        except Exception as e:
+            QMessageBox.critical(self, "PDF Export Error", f"An error occurred during PDF generation: {e}\n\nPlease ensure the project data is complete and try again.")
+            print(f"DEBUG: PDF export error: {e}")
+            return
 
-            # 3. Prepare financial_summary_data dictionary (no changes needed here from last correct version)
-            total_direct_cost = self.project.total_direct_cost if self.project.total_direct_cost is not None else 0.0
-            markup_percent = self.project.markup_percentage if self.project.markup_percentage is not None else 0.0
+        file_path = self.ask_pdf_save_path(project_data_for_pdf)
+        if not file_path:
+            return # User cancelled the save operation
+
+        # Imported on first export: pdf_worker brings in ReportLab, which most sessions never need
+        from src.pdf_worker import PdfExportTask
+        task = PdfExportTask(file_path, project_data_for_pdf, line_items_data_for_pdf, financial_summary_data_for_pdf)
+        task.signals.progress.connect(self.on_pdf_export_progress)
+        task.signals.finished.connect(self.on_pdf_export_finished)
+        task.signals.failed.connect(self.on_pdf_export_failed)
+        task.signals.cancelled.connect(self.on_pdf_export_cancelled)
+        self.pdf_export_task = task
+
+        self.pdf_progress_dialog = QProgressDialog("Preparing PDF...", "Cancel", 0, 0, self)
+        self.pdf_progress_dialog.setWindowTitle("Exporting PDF")
+        self.pdf_progress_dialog.setWindowModality(Qt.WindowModal)
+        self.pdf_progress_dialog.setMinimumDuration(300) # Quick exports finish before it shows
+        self.pdf_progress_dialog.canceled.connect(task.cancel)
+        self.pdf_export_button.setEnabled(False)
+
+        self.pdf_thread_pool.start(task)
+
+    @instrumented_action()
+    def import_takeoff_file(self):
+        if not self.resolve_staged_changes("importing"):
+            return
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Takeoff", "", "Takeoff Files (*.csv *.xlsx *.xlsm *.json *.jsonl);;All Files (*)"
+        )
+        if not file_path:
+            return
+        from src.takeoff_importer import import_takeoff, default_rejects_path
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            # Streams the file and inserts every valid row in one transaction (see takeoff_importer.py)
+            stats = import_takeoff(self.current_project_id, file_path, rejects_path=default_rejects_path(file_path))
+        except Exception as e:
+            stats = None
+            error = e
+        finally:
+            QApplication.restoreOverrideCursor()
+        if stats is None:
+            QMessageBox.critical(self, "Import Error", f"Failed to import the takeoff: {error}\n\nNo line items were added.")
+            print(f"DEBUG: Takeoff import error: {error}")
+            return
 
-            financial_summary_data_for_pdf = {
-                'total_direct_cost': total_direct_cost,
-                'markup_percentage': markup_percent,
-            }
+        # One reload for the whole import; the totals come from the rollup the import kept current
+        self.load_line_items()
+        self.calculate_and_display_totals()
+        message = f"Imported {stats['imported']} line items."
+        if stats['rejected']:
+            message += f"\n\n{stats['rejected']} rows were rejected. The reasons are in:\n{stats['rejects_path']}"
+        QMessageBox.information(self, "Import Takeoff", message)
+
+    def ask_pdf_save_path(self, project_data):
+        from src.pdf_generator import default_pdf_filename
+        # Start in the current working directory with the default estimate file name
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Project Estimate PDF", default_pdf_filename(project_data), "PDF Files (*.pdf);;All Files (*)"
+        )
+        return file_path
 
-            # Call the PDF generation function
-            generate_pdf_estimate(project_data_for_pdf, line_items_data_for_pdf, financial_summary_data_for_pdf)
-            QMessageBox.information(self, "PDF Export", "Estimate exported to PDF successfully!")
+    def on_pdf_export_progress(self, page_number):
+        if self.pdf_progress_dialog is not None:
+            self.pdf_progress_dialog.setLabelText(f"Rendering page {page_number}...")
 
-        except Exception as e:
-            QMessageBox.critical(self, "PDF Export Error", f"An error occurred during PDF generation: {e}\n\nPlease ensure the project data is complete and try again.")
-            print(f"DEBUG: PDF export error: {e}")
+    def on_pdf_export_finished(self, file_path, stats):
+        self.end_pdf_export()
+        QMessageBox.information(self, "PDF Export", f"Estimate exported to PDF successfully! ({stats['pages']} pages)")
+
+    def on_pdf_export_failed(self, message):
+        self.end_pdf_export()
+        QMessageBox.critical(self, "PDF Export Error", f"An error occurred during PDF generation: {message}\n\nPlease ensure the project data is complete and try again.")
+
+    def on_pdf_export_cancelled(self):
+        self.end_pdf_export()
+
+    def end_pdf_export(self):
+        self.pdf_export_task = None
+        if self.pdf_progress_dialog is not None:
+            self.pdf_progress_dialog.canceled.disconnect()
+            self.pdf_progress_dialog.close()
+            self.pdf_progress_dialog.deleteLater()
+            self.pdf_progress_dialog = None
+        self.pdf_export_button.setEnabled(True)
 
     def get_common_items(self):
-        return self.db_session.query(CommonItem).order_by(CommonItem.name).all()
+        # Plain rows rather than ORM objects: they never expire on commit, so picking an item costs no query
+        return self.db_session.execute(
+            select(CommonItem.id, CommonItem.name, CommonItem.description, CommonItem.unit, CommonItem.mf_code)
+            .order_by(CommonItem.name)
+        ).all()
 
     def get_cost_codes(self):
-        return self.db_session.query(CostCode).order_by(CostCode.code).all()
+        return self.db_session.execute(
+            select(CostCode.id, CostCode.code, CostCode.name).order_by(CostCode.code)
+        ).all()
 
     def toggle_common_item_fields(self, index):
         # 0 is Custom Item, 1 is Common Item
@@ -285,83 +351,68 @@ class EstimateLineItemsWindow(QMainWindow):
             self.unit_input.clear()
             self.unit_cost_input.setValue(0.0)
 
+    @instrumented_action()
     def load_line_items(self):
-        self.line_items_table.setRowCount(0)
-        line_items = self.db_session.query(LineItem).filter_by(project_id=self.current_project_id).all()
-        self.line_items_table.setRowCount(len(line_items))
-
-        for row_idx, item in enumerate(line_items):
-            total_cost = item.quantity * item.unit_cost * (1 + item.markup_percentage / 100)
-            self.line_items_table.setItem(row_idx, 0, QTableWidgetItem(str(item.id)))
-            self.line_items_table.setItem(row_idx, 1, QTableWidgetItem(item.description or ""))
-            self.line_items_table.setItem(row_idx, 2, QTableWidgetItem(f"{item.quantity:.2f}"))
-            self.line_items_table.setItem(row_idx, 3, QTableWidgetItem(item.unit or ""))
-            self.line_items_table.setItem(row_idx, 4, QTableWidgetItem(f"${item.unit_cost:.2f}"))
-            self.line_items_table.setItem(row_idx, 5, QTableWidgetItem(f"{item.markup_percentage:.2f}%"))
-            self.line_items_table.setItem(row_idx, 6, QTableWidgetItem(f"${total_cost:.2f}"))
-            self.line_items_table.setItem(row_idx, 7, QTableWidgetItem(item.notes or ""))
-            # Store full LineItem object for easier access on selection
-            self.line_items_table.item(row_idx, 0).setData(Qt.UserRole, item)
-
-    def calculate_and_display_totals(self):
-        # Recalculate total_direct_cost and final_project_estimate for the project
-        total_direct_cost = self.db_session.query(func.sum(LineItem.quantity * LineItem.unit_cost)).filter_by(project_id=self.current_project_id).scalar() or 0.0
-
-        # Calculate total cost with markup for all line items
-        total_cost_with_markup = self.db_session.query(
-            func.sum(LineItem.quantity * LineItem.unit_cost * (1 + LineItem.markup_percentage / 100))
-        ).filter_by(project_id=self.current_project_id).scalar() or 0.0
-
-        # Ensure current_project is fresh for percentage calculations
-        self.db_session.refresh(self.current_project)
-
-        overhead_percentage = self.current_project.overhead_percentage if self.current_project.overhead_percentage is not None else 0.0
-        profit_percentage = self.current_project.profit_percentage if self.current_project.profit_percentage is not None else 0.0
-
-        overhead_amount = total_cost_with_markup * (overhead_percentage / 100)
-        profit_amount = total_cost_with_markup * (profit_percentage / 100)
-
-        # Include fixed costs from Project model
-        permit_cost = self.current_project.permit_cost if self.current_project.permit_cost is not None else 0.0
-        bonding_cost = self.current_project.bonding_cost if self.current_project.bonding_cost is not None else 0.0
-        insurance_cost = self.current_project.insurance_cost if self.current_project.insurance_cost is not None else 0.0
-        misc_expenses = self.current_project.misc_expenses if self.current_project.misc_expenses is not None else 0.0
-
-        final_project_estimate = (
-            total_cost_with_markup +
-            overhead_amount +
-            profit_amount +
-            permit_cost +
-            bonding_cost +
-            insurance_cost +
-            misc_expenses
-        )
-
-        # Update project object in DB
-        self.current_project.total_direct_cost = total_direct_cost
-        self.current_project.final_project_estimate = final_project_estimate
+        # Plain column tuples, no ORM objects: a 20k-line takeoff stays light in memory
+        estimate = load_estimate(self.db_session, self.current_project_id)
+        self.line_items_model.load_rows(estimate['line_items'])
+        return estimate
+
+    def line_item_row(self, item):
+        # Grid row tuple for a just-saved line item, so only that row is touched after an edit
+        return tuple(getattr(item, field) for field in LINE_ITEM_FIELDS)
+
+    @instrumented_action()
+    def calculate_and_display_totals(self, totals=None):
+        if totals is None:
+            totals = self.update_project_totals()
+        else:
+            apply_totals_to_project(self.current_project, totals)
         self.db_session.commit()
+        self.display_totals(totals)
 
-        self.totals_label.setText(f"Total Direct Cost: ${total_direct_cost:.2f} | Final Estimate: ${final_project_estimate:.2f}")
+    def update_project_totals(self):
+        # Reads the trigger-maintained rollup (O(1)) and stores the totals on the project.
+        # The caller commits, so the totals land in the same transaction as the line item change.
+        # Refreshed first: rates or fixed costs may have been saved by another window since this one loaded.
+        self.db_session.refresh(self.current_project)
+        totals = rollup_project_totals(self.db_session, self.current_project)
+        apply_totals_to_project(self.current_project, totals)
+        return totals
+
+    def display_totals(self, totals):
+        # totals are the saved ones; staged edits are shown on top of them
+        self.edit_buffer.set_saved_totals(totals)
+        self.show_totals()
         self.project_costs_updated_signal.emit() # Notify dashboard to refresh totals
 
+    def show_totals(self):
+        # Saved totals with any staged edits applied; no query either way
+        totals = self.edit_buffer.totals(project_rates(self.current_project))
+        text = f"Total Direct Cost: ${totals['total_direct_cost']:.2f} | Final Estimate: ${totals['final_project_estimate']:.2f}"
+        pending = self.edit_buffer.pending_count()
+        if pending:
+            text += f" | {pending} unsaved change{'s' if pending != 1 else ''}"
+        self.totals_label.setText(text)
+
+    @instrumented_action()
     def on_line_item_selection_changed(self):
         selected_rows = self.line_items_table.selectionModel().selectedRows()
         if selected_rows:
             row = selected_rows[0].row()
-            selected_line_item = self.line_items_table.item(row, 0).data(Qt.UserRole)
+            selected_line_item = self.line_items_model.row_values(row)
             if selected_line_item:
-                self.description_input.setText(selected_line_item.description or "")
-                self.quantity_input.setValue(selected_line_item.quantity)
-                self.unit_input.setText(selected_line_item.unit or "")
-                self.unit_cost_input.setValue(selected_line_item.unit_cost)
-                self.markup_percentage_input.setValue(selected_line_item.markup_percentage)
-                self.notes_input.setText(selected_line_item.notes or "")
+                self.description_input.setText(selected_line_item['description'])
+                self.quantity_input.setValue(selected_line_item['quantity'])
+                self.unit_input.setText(selected_line_item['unit'])
+                self.unit_cost_input.setValue(selected_line_item['unit_cost'])
+                self.markup_percentage_input.setValue(selected_line_item['markup_percentage'])
+                self.notes_input.setText(selected_line_item['notes'])
 
                 # Set common item checkbox and combo
-                if selected_line_item.is_common_item == 1 and selected_line_item.common_item:
+                common_item_name = self.common_item_names_by_id.get(selected_line_item['common_item_id'])
+                if selected_line_item['is_common_item'] == 1 and common_item_name:
                     self.is_common_item_checkbox.setCurrentIndex(1) # Common Item
-                    common_item_name = selected_line_item.common_item.name
                     index = self.common_item_combo.findText(common_item_name)
                     if index != -1:
                         self.common_item_combo.setCurrentIndex(index)
@@ -376,8 +427,8 @@ class EstimateLineItemsWindow(QMainWindow):
                     self.unit_cost_input.setReadOnly(False)
                 
                 # Set cost code combo
-                if selected_line_item.cost_code:
-                    cost_code_text = f"{selected_line_item.cost_code.code} - {selected_line_item.cost_code.name}"
+                cost_code_text = self.cost_code_labels_by_id.get(selected_line_item['cost_code_id'])
+                if cost_code_text:
                     index = self.cost_code_combo.findText(cost_code_text)
                     if index != -1:
                         self.cost_code_combo.setCurrentIndex(index)
@@ -396,6 +447,7 @@ class EstimateLineItemsWindow(QMainWindow):
             self.update_line_item_button.setEnabled(True)
             self.delete_line_item_button.setEnabled(True)
 
+    @instrumented_action()
     def add_or_update_line_item(self):
         description = self.description_input.text().strip()
         quantity = self.quantity_input.value()
@@ -431,46 +483,47 @@ class EstimateLineItemsWindow(QMainWindow):
             QMessageBox.warning(self, "Input Error", "Description, Quantity, and Unit Cost are required and must be positive.")
             return
 
+        values = {
+            'description': description,
+            'quantity': quantity,
+            'unit': unit,
+            'unit_cost': unit_cost,
+            'markup_percentage': markup_percentage,
+            'notes': notes,
+            'is_common_item': 1 if is_common else 0,
+            'common_item_id': selected_common_item.id if selected_common_item else None,
+            'cost_code_id': selected_cost_code.id if selected_cost_code else None,
+        }
+        selected_rows = self.line_items_table.selectionModel().selectedRows()
+        row = selected_rows[0].row() if selected_rows and self.update_line_item_button.isEnabled() else None # Update mode
+        if self.stage_edits_checkbox.isChecked():
+            self.stage_line_item(row, values)
+            return
+
         try:
             line_item_id = None
-            selected_rows = self.line_items_table.selectionModel().selectedRows()
-            if selected_rows and self.update_line_item_button.isEnabled(): # Check if update mode
-                row = selected_rows[0].row()
-                line_item_id = int(self.line_items_table.item(row, 0).text())
-                item_to_update = self.db_session.query(LineItem).filter_by(id=line_item_id).first()
+            if row is not None:
+                line_item_id = self.line_items_model.line_item_id_at(row)
+                item_to_update = self.db_session.get(LineItem, line_item_id)
                 if item_to_update:
-                    item_to_update.description = description
-                    item_to_update.quantity = quantity
-                    item_to_update.unit = unit
-                    item_to_update.unit_cost = unit_cost
-                    item_to_update.markup_percentage = markup_percentage
-                    item_to_update.notes = notes
-                    item_to_update.is_common_item = 1 if is_common else 0
-                    item_to_update.common_item_id = selected_common_item.id if selected_common_item else None
-                    item_to_update.cost_code_id = selected_cost_code.id if selected_cost_code else None
+                    for field, value in values.items():
+                        setattr(item_to_update, field, value)
+                    totals = self.update_project_totals()
                     self.db_session.commit()
+                    self.line_items_model.update_row(self.line_item_row(item_to_update))
                     QMessageBox.information(self, "Success", "Line item updated.")
                 else:
                     QMessageBox.critical(self, "Error", "Line item not found for update.")
+                    return
             else: # Add new
-                new_line_item = LineItem(
-                    project_id=self.current_project_id,
-                    description=description,
-                    quantity=quantity,
-                    unit=unit,
-                    unit_cost=unit_cost,
-                    markup_percentage=markup_percentage,
-                    notes=notes,
-                    is_common_item=1 if is_common else 0,
-                    common_item_id=selected_common_item.id if selected_common_item else None,
-                    cost_code_id=selected_cost_code.id if selected_cost_code else None
-                )
+                new_line_item = LineItem(project_id=self.current_project_id, **values)
                 self.db_session.add(new_line_item)
+                totals = self.update_project_totals()
                 self.db_session.commit()
+                self.line_items_model.append_row(self.line_item_row(new_line_item))
                 QMessageBox.information(self, "Success", "Line item added.")
 
-            self.load_line_items()
-            self.calculate_and_display_totals()
+            self.display_totals(totals)
             self.clear_form() # Clear form after add/update
 
         except Exception as e:
@@ -478,6 +531,7 @@ class EstimateLineItemsWindow(QMainWindow):
             QMessageBox.critical(self, "Database Error", f"Failed to save line item: {e}")
             print(f"DEBUG: Error saving line item: {e}")
 
+    @instrumented_action()
     def delete_line_item(self):
         selected_rows = self.line_items_table.selectionModel().selectedRows()
         if not selected_rows:
@@ -485,20 +539,27 @@ class EstimateLineItemsWindow(QMainWindow):
             return
 
         row = selected_rows[0].row()
-        line_item_id = int(self.line_items_table.item(row, 0).text())
+        line_item_id = self.line_items_model.line_item_id_at(row)
+        if self.stage_edits_checkbox.isChecked():
+            # Nothing is written until Save, and Revert brings the row back, so no confirmation
+            self.edit_buffer.stage_delete(line_item_id, self.line_items_model.row_values(row))
+            self.line_items_model.remove_id(line_item_id)
+            self.after_staged_edit()
+            return
 
         reply = QMessageBox.question(self, 'Confirm Delete',
                                      f"Are you sure you want to delete line item ID {line_item_id}?",
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
             try:
-                item_to_delete = self.db_session.query(LineItem).filter_by(id=line_item_id).first()
+                item_to_delete = self.db_session.get(LineItem, line_item_id)
                 if item_to_delete:
                     self.db_session.delete(item_to_delete)
+                    totals = self.update_project_totals()
                     self.db_session.commit()
+                    self.line_items_model.remove_id(line_item_id)
                     QMessageBox.information(self, "Success", f"Line item ID {line_item_id} deleted.")
-                    self.load_line_items()
-                    self.calculate_and_display_totals()
+                    self.display_totals(totals)
                     self.clear_form()
                 else:
                     QMessageBox.warning(self, "Error", "Selected line item not found.")
@@ -507,6 +568,81 @@ class EstimateLineItemsWindow(QMainWindow):
                 QMessageBox.critical(self, "Database Error", f"Failed to delete line item: {e}")
                 print(f"DEBUG: Error deleting line item: {e}")
 
+    def stage_line_item(self, row, values):
+        # Staged add (row is None) or update: only the buffer and the one grid row change
+        if row is None:
+            line_item_id = self.edit_buffer.stage_add(values)
+            self.line_items_model.append_row((line_item_id,) + tuple(values[field] for field in VALUE_FIELDS))
+        else:
+            line_item_id = self.line_items_model.line_item_id_at(row)
+            self.edit_buffer.stage_update(line_item_id, self.line_items_model.row_values(row), values)
+            self.line_items_model.update_row((line_item_id,) + tuple(values[field] for field in VALUE_FIELDS))
+        self.line_items_model.set_pending(line_item_id)
+        self.after_staged_edit()
+
+    def after_staged_edit(self):
+        self.show_totals()
+        self.update_staging_controls()
+        self.clear_form()
+
+    def update_staging_controls(self):
+        dirty = self.edit_buffer.is_dirty()
+        self.save_changes_button.setEnabled(dirty)
+        self.revert_changes_button.setEnabled(dirty)
+        self.setWindowModified(dirty)
+
+    def toggle_staged_editing(self, checked):
+        if not checked and not self.resolve_staged_changes("switching to immediate saving"):
+            self.stage_edits_checkbox.blockSignals(True)
+            self.stage_edits_checkbox.setChecked(True)
+            self.stage_edits_checkbox.blockSignals(False)
+
+    @instrumented_action()
+    def save_staged_changes(self):
+        """Writes every staged edit and the new project totals in one transaction. Returns False if it failed."""
+        if not self.edit_buffer.is_dirty():
+            return True
+        try:
+            new_ids = self.edit_buffer.flush(self.db_session)
+            totals = self.update_project_totals()
+            self.db_session.commit()
+        except Exception as e:
+            self.db_session.rollback()
+            QMessageBox.critical(self, "Database Error", f"Failed to save line items: {e}")
+            print(f"DEBUG: Error saving staged line items: {e}")
+            return False
+        self.edit_buffer.clear()
+        self.line_items_model.commit_pending(new_ids)
+        self.display_totals(totals)
+        self.update_staging_controls()
+        return True
+
+    @instrumented_action()
+    def revert_staged_changes(self):
+        # One reload brings back the rows that were changed or deleted
+        self.edit_buffer.clear()
+        estimate = self.load_line_items()
+        self.edit_buffer.set_saved_totals(estimate['totals'])
+        self.show_totals()
+        self.update_staging_controls()
+        self.clear_form()
+
+    def resolve_staged_changes(self, action):
+        """Asks what to do with staged edits before an action that needs them saved or gone. Returns False to cancel."""
+        if not self.edit_buffer.is_dirty():
+            return True
+        pending = self.edit_buffer.pending_count()
+        reply = QMessageBox.question(self, "Unsaved Changes",
+                                     f"There {'are' if pending != 1 else 'is'} {pending} unsaved line item "
+                                     f"change{'s' if pending != 1 else ''}. Save them before {action}?",
+                                     QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel, QMessageBox.Save)
+        if reply == QMessageBox.Save:
+            return self.save_staged_changes()
+        if reply == QMessageBox.Discard:
+            self.revert_staged_changes()
+            return True
+        return False
+
     def clear_form(self):
         self.description_input.clear()
         self.quantity_input.setValue(0.0)
@@ -527,7 +663,14 @@ class EstimateLineItemsWindow(QMainWindow):
         self.delete_line_item_button.setEnabled(True)
 
     def closeEvent(self, event):
-        if self.db_session:
+        if hasattr(self, 'edit_buffer') and not self.resolve_staged_changes("closing"):
+            event.ignore()
+            return
+        if getattr(self, 'pdf_export_task', None) is not None:
+            # Stop at the next page and let the worker clean up its temporary file
+            self.pdf_export_task.cancel()
+            self.pdf_thread_pool.waitForDone(5000)
+        if self.owns_db_session:
             self.db_session.close()
         super().closeEvent(event)
 
@@ -0,0 +1,143 @@
+# src/estimate_loader.py
+"""
+Loads everything an estimate screen or export needs in a fixed number of queries.
+
+load_estimate() runs three statements whatever the size of the estimate:
+the project row, one Core select of its line items outer-joined to their
+common item and cost code, and the rollup lookup for the totals. Nothing
+downstream touches the lazy LineItem.common_item / LineItem.cost_code
+relationships, so a 5,000-line estimate no longer turns into thousands of
+per-row SELECTs. The line item grid, the totals label and the PDF export
+all read from the same result.
+"""
+
+from sqlalchemy import select
+from src.database import Project, LineItem, CommonItem, CostCode
+from src.estimate_engine import line_total, rollup_project_totals
+
+# Line item columns used by the grid and the edit form, in row-tuple order
+LINE_ITEM_FIELDS = (
+    'id', 'description', 'quantity', 'unit', 'unit_cost', 'markup_percentage',
+    'notes', 'is_common_item', 'common_item_id', 'cost_code_id',
+)
+
+# Extra columns resolved through the joins, appended after LINE_ITEM_FIELDS
+REFERENCE_FIELDS = ('total_cost', 'common_item_name', 'common_item_type', 'common_item_unit', 'cost_code_name')
+
+
+def line_item_rows_query(project_id):
+    """Core select of a project's line items with their common item and cost code resolved by outer joins."""
+    return (
+        select(
+            *(getattr(LineItem, field) for field in LINE_ITEM_FIELDS),
+            LineItem.total_cost,
+            CommonItem.name.label('common_item_name'),
+            CommonItem.type.label('common_item_type'),
+            CommonItem.unit.label('common_item_unit'),
+            CostCode.name.label('cost_code_name'),
+        )
+        .outerjoin(CommonItem, CommonItem.id == LineItem.common_item_id)
+        .outerjoin(CostCode, CostCode.id == LineItem.cost_code_id)
+        .where(LineItem.project_id == project_id)
+        .order_by(LineItem.id)
+    )
+
+
+def load_estimate(session, project_id):
+    """
+    Fetches a project, its line items and its totals.
+
+    Args:
+        session: Database session.
+        project_id (int): Project to load.
+
+    Returns:
+        dict: 'project' (Project or None), 'line_items' (list of rows ordered as
+        LINE_ITEM_FIELDS + REFERENCE_FIELDS) and 'totals' (see rollup_project_totals).
+        When the project does not exist, 'line_items' is empty and 'totals' is None.
+    """
+    # populate_existing: window sessions never expire on commit, so pick up edits saved by other windows
+    project = session.execute(
+        select(Project).where(Project.id == project_id).execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    if project is None:
+        return {'project': None, 'line_items': [], 'totals': None}
+    line_items = session.execute(line_item_rows_query(project_id)).all()
+    return {
+        'project': project,
+        'line_items': line_items,
+        'totals': rollup_project_totals(session, project),
+    }
+
+
+def _join_address(*parts):
+    # Filter out None/empty parts; "N/A" when nothing is left
+    return ", ".join(filter(None, parts)) or "N/A"
+
+
+def _date_text(value):
+    return str(value) if value else "N/A"
+
+
+def pdf_line_item(row):
+    """Turns one loaded line item row into the dict generate_pdf_estimate expects."""
+    category = "Custom"
+    uom = row.unit or "N/A"
+    if row.common_item_name is not None:
+        category = row.common_item_type or row.common_item_name
+        uom = row.common_item_unit or uom
+    elif row.cost_code_name:
+        category = row.cost_code_name
+
+    total = row.total_cost if row.total_cost is not None else \
+        line_total(row.quantity, row.unit_cost, row.markup_percentage)
+
+    return {
+        "description": row.description or "N/A",
+        "category": category,
+        "uom": uom,
+        "quantity": row.quantity if row.quantity is not None else 0.0,
+        "unit_cost": row.unit_cost if row.unit_cost is not None else 0.0,
+        "total": total,
+    }
+
+
+def pdf_payload(estimate):
+    """
+    Builds the arguments of generate_pdf_estimate from a loaded estimate.
+
+    Args:
+        estimate (dict): Result of load_estimate().
+
+    Returns:
+        tuple: (project_data, line_items_data, financial_summary_data).
+    """
+    project = estimate['project']
+    project_data = {
+        'project_id': project.id,
+        'project_name': project.project_name or "N/A",
+        'project_address': _join_address(project.project_address, project.project_city,
+                                         project.project_state, project.project_zip),
+        'estimate_date': _date_text(project.estimate_date),
+        'bid_due_date': _date_text(project.bid_due_date),
+        'project_start_date': _date_text(project.project_start_date),
+        'completion_date': _date_text(project.completion_date),
+
+        'client_name': project.client_name or "N/A",
+        'client_contact': project.client_contact_person or "N/A",
+        'client_phone': project.client_phone or "N/A",
+        'client_email': project.client_email or "N/A",
+        'client_address': _join_address(project.client_address_street, project.client_address_city,
+                                        project.client_address_state, project.client_address_zip),
+
+        'scope_of_work': project.scope_of_work or "",
+        'project_notes': project.notes or "",
+    }
+
+    line_items_data = [pdf_line_item(row) for row in estimate['line_items']]
+
+    financial_summary_data = {
+        'total_direct_cost': estimate['totals']['total_direct_cost'],
+        'markup_percentage': project.markup_percentage if project.markup_percentage is not None else 0.0,
+    }
+    return project_data, line_items_data, financial_summary_data
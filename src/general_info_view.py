@@ -8,13 +8,17 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Signal, QDate, Qt
 from src.database import Session, Project, create_db_and_tables
+from src.instrumentation import instrumented_action
+from src.session_manager import open_window_session, keep
 
 class GeneralInfoWindow(QDialog):
     project_updated_signal = Signal() # Signal to notify the dashboard to refresh
 
-    def __init__(self, project_id, db_session, parent_dashboard=None):
+    def __init__(self, project_id, db_session=None, parent_dashboard=None):
         super().__init__(parent_dashboard)
-        self.db_session = db_session
+        # Our own unit of work unless the caller lends us a session (which it then closes itself)
+        self.owns_db_session = db_session is None
+        self.db_session = open_window_session() if self.owns_db_session else db_session
         self.project_id = project_id
         self.parent_dashboard = parent_dashboard # Reference to the main dashboard
 
@@ -22,6 +26,7 @@ class GeneralInfoWindow(QDialog):
         if self.project_id:
             # Corrected: Filter by 'id' for the Project model
             self.current_project = self.db_session.query(Project).filter_by(id=self.project_id).first()
+            keep(self.db_session, self.current_project) # Edited in place when the form is saved
 
         self.setWindowTitle("Project General Information")
         self.setGeometry(200, 200, 800, 700) # Adjusted size for more fields
@@ -98,7 +103,7 @@ class GeneralInfoWindow(QDialog):
 
         # Status and Type
         self.project_status_combo = QComboBox()
-        self.project_status_combo.addItems(["Planned", "Active", "On Hold", "Completed", "Cancelled"])
+        self.project_status_combo.addItems(["Planned", "Active", "On Hold", "Completed", "Cancelled", "Template"])
         form_layout.addRow("Project Status:", self.project_status_combo)
 
         self.contract_type_combo = QComboBox()
@@ -145,6 +150,7 @@ class GeneralInfoWindow(QDialog):
 
         main_layout.addLayout(button_layout)
 
+    @instrumented_action()
     def load_project_data(self):
         # This method uses self.current_project, which is already set in __init__
         if self.current_project:
@@ -192,6 +198,7 @@ class GeneralInfoWindow(QDialog):
             self.project_start_date_input.setDate(today)
             self.completion_date_input.setDate(today.addMonths(6)) # Default 6 months from now
 
+    @instrumented_action()
     def save_project_data(self):
         project_name = self.project_name_input.text().strip()
         if not project_name:
@@ -336,11 +343,11 @@ class GeneralInfoWindow(QDialog):
         self.current_project = None
         self.project_id_label.setText("ID: N/A (New Project)")
 
-    def reject(self):
-        # Override reject to ensure session is closed if dialog is closed without saving
-        if self.db_session:
+    def done(self, result):
+        # Saved or cancelled, the dialog's unit of work ends here
+        if self.owns_db_session:
             self.db_session.close()
-        super().reject()
+        super().done(result)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,244 @@
+# src/instrumentation.py
+"""
+Per-action SQL instrumentation.
+
+Wrap a UI handler with @instrumented_action (or a block with track_action())
+and every statement it runs is attributed to it: query count, rows fetched,
+time spent in SQLite and total wall time. Statements are grouped by their SQL
+text, so an N+1 pattern shows up as one statement repeated hundreds of times
+and slow statements are listed on their own.
+
+Finished actions are kept in memory for the diagnostics dialog and appended
+to a rotating JSON-lines log (logs/actions.jsonl by default, or the path in
+CONTRACTORPRO_METRICS_LOG). Set CONTRACTORPRO_INSTRUMENTATION=0 to turn the
+attribution off.
+
+Timing comes from the engine's before/after_cursor_execute events; rows are
+counted by the cursor class handed to sqlite3.connect(factory=...) in
+database.create_sqlite_engine(), since SQLite only reports row counts for
+writes.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+METRICS_LOG_PATH = os.environ.get('CONTRACTORPRO_METRICS_LOG') or os.path.join(BASE_DIR, '..', 'logs', 'actions.jsonl')
+ENABLED = os.environ.get('CONTRACTORPRO_INSTRUMENTATION', '1') != '0'
+
+SLOW_STATEMENT_MS = 50.0   # Statements slower than this are listed individually
+REPEATED_STATEMENT_MIN = 20 # The same SQL this many times in one action is flagged as a likely N+1
+RECENT_ACTIONS = 200       # Finished actions kept in memory for the diagnostics dialog
+LOG_MAX_BYTES = 2 * 1024 * 1024
+LOG_BACKUPS = 3
+
+_current_action = contextvars.ContextVar('contractorpro_action', default=None)
+_recent = deque(maxlen=RECENT_ACTIONS)
+_recent_lock = threading.Lock()
+_logger = None
+
+
+class ActionStats:
+    """Query counters for one run of a UI action."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = time.time()
+        self.queries = 0
+        self.rows = 0
+        self.sql_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.error = None
+        self.statements = {} # SQL text -> [count, seconds]
+        self.slow_statements = [] # (milliseconds, SQL text)
+
+    def record_statement(self, statement, seconds):
+        self.queries += 1
+        self.sql_seconds += seconds
+        entry = self.statements.get(statement)
+        if entry is None:
+            self.statements[statement] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+        if seconds * 1000 >= SLOW_STATEMENT_MS:
+            self.slow_statements.append((seconds * 1000, statement))
+
+    def repeated_statements(self):
+        """Statements run at least REPEATED_STATEMENT_MIN times, most frequent first."""
+        repeated = [(count, statement) for statement, (count, _) in self.statements.items()
+                    if count >= REPEATED_STATEMENT_MIN]
+        return sorted(repeated, reverse=True)
+
+    def to_record(self):
+        top = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)[:10]
+        return {
+            'action': self.name,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'wall_ms': round(self.wall_seconds * 1000, 3),
+            'sql_ms': round(self.sql_seconds * 1000, 3),
+            'queries': self.queries,
+            'distinct_statements': len(self.statements),
+            'rows': self.rows,
+            'error': self.error,
+            'repeated_statements': [{'count': count, 'sql': sql} for count, sql in self.repeated_statements()],
+            'slow_statements': [{'ms': round(ms, 3), 'sql': sql} for ms, sql in self.slow_statements],
+            'top_statements': [{'count': count, 'ms': round(seconds * 1000, 3), 'sql': sql}
+                               for sql, (count, seconds) in top],
+        }
+
+
+# --- Row counting at the DB-API level ---
+
+class CountingCursor(sqlite3.Cursor):
+    """sqlite3 cursor that adds every fetched row to the current action."""
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            _add_rows(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        _add_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        _add_rows(len(rows))
+        return rows
+
+
+class CountingConnection(sqlite3.Connection):
+    """sqlite3 connection whose cursors are CountingCursors (pass as connect_args={'factory': ...})."""
+
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+
+def _add_rows(count):
+    stats = _current_action.get()
+    if stats is not None:
+        stats.rows += count
+
+
+# --- Engine events ---
+
+def instrument_engine(engine):
+    """Attributes the statements run on this engine to the current action."""
+
+    # The start time lives on the execution context, which is discarded with the statement,
+    # so a statement that raises (and never reaches after_cursor_execute) leaves nothing behind
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_action.get() is not None:
+            context._action_query_start = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_action.get()
+        start = getattr(context, '_action_query_start', None)
+        if stats is None or start is None:
+            return
+        stats.record_statement(' '.join(statement.split()), time.perf_counter() - start)
+
+    return engine
+
+
+# --- Actions ---
+
+@contextmanager
+def track_action(name):
+    """
+    Attributes the statements run inside the block to the action `name`.
+
+    Nested actions are folded into the outermost one, so a handler that calls
+    another instrumented handler is reported once.
+    """
+    if not ENABLED or _current_action.get() is not None:
+        yield _current_action.get()
+        return
+    stats = ActionStats(name)
+    token = _current_action.set(stats)
+    start = time.perf_counter()
+    try:
+        yield stats
+    except Exception as e:
+        stats.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        stats.wall_seconds = time.perf_counter() - start
+        _current_action.reset(token)
+        _finish(stats)
+
+
+def instrumented_action(name=None):
+    """
+    Decorator form of track_action(); the action name defaults to the function name.
+
+    Qt passes extra arguments to slots (e.g. clicked(bool)) based on what the
+    slot accepts. The wrapper drops any positional arguments the wrapped
+    function does not declare, so decorated methods stay safe to connect.
+    """
+    def decorator(func):
+        action_name = name or func.__name__
+        code = func.__code__
+        takes_varargs = bool(code.co_flags & 0x04) # CO_VARARGS
+        max_args = code.co_argcount
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not takes_varargs:
+                args = args[:max_args]
+            with track_action(action_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _finish(stats):
+    record = stats.to_record()
+    with _recent_lock:
+        _recent.append(record)
+    try:
+        _get_logger().info(json.dumps(record))
+    except OSError as e:
+        print(f"DEBUG: Could not write action metrics: {e}")
+
+
+def _get_logger():
+    global _logger
+    if _logger is None:
+        logger = logging.getLogger('contractorpro.actions')
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        log_dir = os.path.dirname(os.path.abspath(METRICS_LOG_PATH))
+        os.makedirs(log_dir, exist_ok=True)
+        handler = RotatingFileHandler(METRICS_LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        _logger = logger
+    return _logger
+
+
+def recent_actions():
+    """Finished action records, oldest first."""
+    with _recent_lock:
+        return list(_recent)
+
+
+def clear_recent_actions():
+    with _recent_lock:
+        _recent.clear()
@@ -0,0 +1,193 @@
+# src/line_items_model.py
+"""
+Table model for the line items grid.
+
+Instead of one QTableWidgetItem per cell and a live LineItem in every row,
+the model keeps the estimate column-wise: ids and numbers in compact
+array.array buffers and the text columns in plain lists. Cells are formatted
+only when the view paints them, totals are computed on the fly, and edits
+touch a single row (dataChanged / beginInsertRows / beginRemoveRows)
+instead of rebuilding the grid.
+
+Rows with unsaved, staged edits (see line_item_buffer.py) are drawn in
+italics; rows staged for insertion have negative ids and show "New".
+"""
+
+from array import array
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QFont
+from src.estimate_engine import line_total
+from src.estimate_loader import LINE_ITEM_FIELDS
+
+HEADERS = ["ID", "Description", "Quantity", "Unit", "Unit Cost", "Markup %", "Total Cost", "Notes"]
+
+
+class LineItemTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._clear()
+
+    def _clear(self):
+        self._ids = array('q')
+        self._quantities = array('d')
+        self._unit_costs = array('d')
+        self._markups = array('d')
+        self._is_common = array('b')
+        self._common_item_ids = array('q') # 0 means no common item
+        self._cost_code_ids = array('q')   # 0 means no cost code
+        self._descriptions = []
+        self._units = []
+        self._notes = []
+        self._row_by_id = {}
+        self._pending_ids = set()
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(self._ids[row]) if self._ids[row] > 0 else "New"
+            if column == 1:
+                return self._descriptions[row]
+            if column == 2:
+                return f"{self._quantities[row]:.2f}"
+            if column == 3:
+                return self._units[row]
+            if column == 4:
+                return f"${self._unit_costs[row]:.2f}"
+            if column == 5:
+                return f"{self._markups[row]:.2f}%"
+            if column == 6:
+                return f"${self.total_at(row):.2f}"
+            if column == 7:
+                return self._notes[row]
+        elif role == Qt.FontRole:
+            if self._ids[row] in self._pending_ids:
+                font = QFont()
+                font.setItalic(True)
+                return font
+        elif role == Qt.UserRole:
+            return self._ids[row]
+        return None
+
+    # --- Loading and single-row edits ---
+
+    def load_rows(self, rows):
+        """Replaces the contents with rows that start with the LINE_ITEM_FIELDS columns (extra columns are ignored)."""
+        self.beginResetModel()
+        self._clear()
+        for row in rows:
+            self._append(row)
+        self.endResetModel()
+
+    def _append(self, row):
+        (line_item_id, description, quantity, unit, unit_cost, markup,
+         notes, is_common, common_item_id, cost_code_id) = row[:len(LINE_ITEM_FIELDS)]
+        self._row_by_id[line_item_id] = len(self._ids)
+        self._ids.append(line_item_id)
+        self._quantities.append(quantity or 0.0)
+        self._unit_costs.append(unit_cost or 0.0)
+        self._markups.append(markup or 0.0)
+        self._is_common.append(1 if is_common else 0)
+        self._common_item_ids.append(common_item_id or 0)
+        self._cost_code_ids.append(cost_code_id or 0)
+        self._descriptions.append(description or "")
+        self._units.append(unit or "")
+        self._notes.append(notes or "")
+
+    def append_row(self, row):
+        position = len(self._ids)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._append(row)
+        self.endInsertRows()
+
+    def update_row(self, row):
+        """Overwrites the row with the same id and repaints only that row."""
+        position = self._row_by_id.get(row[0])
+        if position is None:
+            self.append_row(row)
+            return
+        (_, description, quantity, unit, unit_cost, markup,
+         notes, is_common, common_item_id, cost_code_id) = row[:len(LINE_ITEM_FIELDS)]
+        self._quantities[position] = quantity or 0.0
+        self._unit_costs[position] = unit_cost or 0.0
+        self._markups[position] = markup or 0.0
+        self._is_common[position] = 1 if is_common else 0
+        self._common_item_ids[position] = common_item_id or 0
+        self._cost_code_ids[position] = cost_code_id or 0
+        self._descriptions[position] = description or ""
+        self._units[position] = unit or ""
+        self._notes[position] = notes or ""
+        self.dataChanged.emit(self.index(position, 0), self.index(position, len(HEADERS) - 1))
+
+    def remove_id(self, line_item_id):
+        position = self._row_by_id.get(line_item_id)
+        if position is None:
+            return
+        self.beginRemoveRows(QModelIndex(), position, position)
+        for column in (self._ids, self._quantities, self._unit_costs, self._markups, self._is_common,
+                       self._common_item_ids, self._cost_code_ids, self._descriptions, self._units, self._notes):
+            del column[position]
+        self._row_by_id = {line_id: i for i, line_id in enumerate(self._ids)}
+        self._pending_ids.discard(line_item_id)
+        self.endRemoveRows()
+
+    def set_pending(self, line_item_id, pending=True):
+        """Marks a row as having unsaved edits (or not) and repaints it."""
+        if pending:
+            self._pending_ids.add(line_item_id)
+        else:
+            self._pending_ids.discard(line_item_id)
+        position = self._row_by_id.get(line_item_id)
+        if position is not None:
+            self.dataChanged.emit(self.index(position, 0), self.index(position, len(HEADERS) - 1))
+
+    def commit_pending(self, new_ids):
+        """After a save: gives staged rows their real ids (temporary id -> id) and clears every pending mark."""
+        for temp_id, line_item_id in new_ids.items():
+            position = self._row_by_id.pop(temp_id, None)
+            if position is not None:
+                self._ids[position] = line_item_id
+                self._row_by_id[line_item_id] = position
+        self._pending_ids.clear()
+        if self._ids:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._ids) - 1, len(HEADERS) - 1))
+
+    # --- Accessors ---
+
+    def line_item_id_at(self, row):
+        if 0 <= row < len(self._ids):
+            return self._ids[row]
+        return None
+
+    def total_at(self, row):
+        return line_total(self._quantities[row], self._unit_costs[row], self._markups[row])
+
+    def row_values(self, row):
+        """Returns the stored values of a row as a dict keyed by LINE_ITEM_FIELDS (None for unset ids)."""
+        return {
+            'id': self._ids[row],
+            'description': self._descriptions[row],
+            'quantity': self._quantities[row],
+            'unit': self._units[row],
+            'unit_cost': self._unit_costs[row],
+            'markup_percentage': self._markups[row],
+            'notes': self._notes[row],
+            'is_common_item': self._is_common[row],
+            'common_item_id': self._common_item_ids[row] or None,
+            'cost_code_id': self._cost_code_ids[row] or None,
+        }
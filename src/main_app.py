@@ -4,15 +4,18 @@ import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QLabel, QVBoxLayout, QWidget,
-    QPushButton, QHBoxLayout, QLineEdit, QTableWidget, QTableWidgetItem,
-    QHeaderView, QMessageBox
+    QPushButton, QHBoxLayout, QLineEdit, QTableView, QAbstractItemView,
+    QHeaderView, QMessageBox, QDialog
 )
 from PySide6.QtCore import Qt, QSize, Signal
 # Import the updated database functions and models
-from src.database import Session, Project, create_db_and_tables
-from src.general_info_view import GeneralInfoWindow
-from src.estimate_line_items_view import EstimateLineItemsWindow
-from src.manage_common_data_view import ManageCommonDataWindow
+from src.database import Project, create_db_and_tables
+from src.session_manager import open_window_session
+from src.search_worker import DebouncedProjectSearch
+from src.project_list_model import ProjectListModel
+from src.instrumentation import instrumented_action
+# The other windows are imported when first opened, so they (and ReportLab, behind the
+# line items window's PDF export) stay off the path to the first paint of the dashboard.
 
 # After:
 # Import the updated database functions and models
@@ -26,14 +29,18 @@ from src.manage_common_data_view import ManageCommonDataWindow
 class ContractorProEstimator(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.db_session = Session()
+        self.db_session = open_window_session() # The dashboard's own; every other window opens its own too
         self.setWindowTitle("ContractorPro Estimator Dashboard")
         self.setGeometry(100, 100, 1200, 700)
         self.setMinimumSize(QSize(1100, 600))
         self.current_project_id = None
 
-        self.init_ui()
-        self.load_projects()
+        # Searches run off the GUI thread; only the latest result is shown
+        self.project_search = DebouncedProjectSearch(parent=self)
+        self.project_search.results_ready.connect(self.display_projects)
+        self.project_search.search_failed.connect(self.on_project_search_failed)
+
+        self.init_ui() # Sorting the table view loads the first page of projects
 
     def init_ui(self):
         central_widget = QWidget()
@@ -49,22 +56,24 @@ class ContractorProEstimator(QMainWindow):
         search_label = QLabel("Search Projects:")
         search_layout.addWidget(search_label)
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Enter Project Name or Client Name...")
-        self.search_input.textChanged.connect(self.load_projects)
+        self.search_input.setPlaceholderText("Search by project, client, contact, address, scope or notes...")
+        self.search_input.textChanged.connect(self.on_search_text_changed)
         search_layout.addWidget(self.search_input)
         main_layout.addLayout(search_layout)
 
         # Projects Table
-        self.projects_table = QTableWidget()
-        self.projects_table.setColumnCount(9)
-        self.projects_table.setHorizontalHeaderLabels([
-            "ID", "Project Name", "Client Name", "Status", "Bid Due Date",
-            "Project Start Date", "Completion Date", "Total Direct Cost", "Final Estimate"
-        ])
+        # Rows are paged in from the database as the user scrolls (see ProjectListModel)
+        self.projects_model = ProjectListModel(self.db_session, parent=self)
+        self.projects_table = QTableView()
+        self.projects_table.setModel(self.projects_model)
         self.projects_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.projects_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.projects_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.projects_table.itemSelectionChanged.connect(self.on_project_selection_changed)
+        self.projects_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.projects_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.projects_table.setSortingEnabled(True)
+        self.projects_table.sortByColumn(0, Qt.AscendingOrder) # Also triggers the first page load
+        self.projects_table.selectionModel().selectionChanged.connect(self.on_project_selection_changed)
+        # A reset (new search, reload, re-sort) drops the selection without emitting selectionChanged
+        self.projects_model.modelReset.connect(self.on_project_selection_changed)
         main_layout.addWidget(self.projects_table)
 
         # Buttons
@@ -83,6 +92,12 @@ class ContractorProEstimator(QMainWindow):
         self.open_line_items_button.setEnabled(False)
         buttons_layout.addWidget(self.open_line_items_button)
 
+        self.clone_project_button = QPushButton("Copy / Template...")
+        self.clone_project_button.setToolTip("Copy the selected project with its line items, or save it as a template")
+        self.clone_project_button.clicked.connect(self.clone_selected_project)
+        self.clone_project_button.setEnabled(False)
+        buttons_layout.addWidget(self.clone_project_button)
+
         self.manage_common_data_button = QPushButton("Manage Common Items / Cost Codes")
         self.manage_common_data_button.clicked.connect(self.open_manage_common_data)
         buttons_layout.addWidget(self.manage_common_data_button)
@@ -92,83 +107,105 @@ class ContractorProEstimator(QMainWindow):
         self.delete_selected_project_button.setEnabled(False)
         buttons_layout.addWidget(self.delete_selected_project_button)
 
+        self.diagnostics_button = QPushButton("Diagnostics")
+        self.diagnostics_button.setToolTip("Query counts and timings of recent actions")
+        self.diagnostics_button.clicked.connect(self.open_diagnostics)
+        buttons_layout.addWidget(self.diagnostics_button)
+
         main_layout.addLayout(buttons_layout)
 
+    @instrumented_action()
     def load_projects(self):
-        self.projects_table.setRowCount(0)
+        # Refreshes the table for the current search text without waiting for the debounce delay
         search_text = self.search_input.text().strip()
-        try:
-            projects = self.db_session.query(Project).all()
-            if search_text:
-                projects = [p for p in projects if search_text.lower() in (p.project_name or "").lower() or search_text.lower() in (p.client_name or "").lower()]
-
-            self.projects_table.setRowCount(len(projects))
-            for row_idx, project in enumerate(projects):
-                total_direct_cost = project.total_direct_cost if project.total_direct_cost is not None else 0.0
-                final_estimate = project.final_project_estimate if project.final_project_estimate is not None else 0.0
-
-                self.projects_table.setItem(row_idx, 0, QTableWidgetItem(str(project.id)))
-                self.projects_table.setItem(row_idx, 1, QTableWidgetItem(project.project_name or ""))
-                self.projects_table.setItem(row_idx, 2, QTableWidgetItem(project.client_name or ""))
-                self.projects_table.setItem(row_idx, 3, QTableWidgetItem(project.project_status or ""))
-                
-                self.projects_table.setItem(row_idx, 4, QTableWidgetItem(project.bid_due_date or ""))
-                self.projects_table.setItem(row_idx, 5, QTableWidgetItem(project.project_start_date or ""))
-                self.projects_table.setItem(row_idx, 6, QTableWidgetItem(project.completion_date or ""))
-                
-                self.projects_table.setItem(row_idx, 7, QTableWidgetItem(f"${total_direct_cost:.2f}"))
-                self.projects_table.setItem(row_idx, 8, QTableWidgetItem(f"${final_estimate:.2f}"))
-
-        except Exception as e:
-            QMessageBox.critical(self, "Database Error", f"Failed to load projects: {e}")
+        if search_text:
+            self.project_search.search_now(search_text)
+        else:
+            self.project_search.cancel()
+            self.projects_model.reset_paging()
+
+    @instrumented_action()
+    def on_search_text_changed(self, text):
+        if text.strip():
+            self.project_search.request(text)
+        else:
+            # Browsing is a single indexed page query, no need for the worker
+            self.project_search.cancel()
+            self.projects_model.reset_paging()
+
+    def display_projects(self, projects):
+        self.projects_model.set_rows(projects)
+
+    def on_project_search_failed(self, message):
+        QMessageBox.critical(self, "Database Error", f"Failed to load projects: {message}")
 
 
     def on_project_selection_changed(self):
         selected_rows = self.projects_table.selectionModel().selectedRows()
         if selected_rows:
             row = selected_rows[0].row()
-            self.current_project_id = int(self.projects_table.item(row, 0).text())
+            self.current_project_id = self.projects_model.project_id_at(row)
             self.open_general_info_button.setEnabled(True)
             self.open_line_items_button.setEnabled(True)
+            self.clone_project_button.setEnabled(True)
             self.delete_selected_project_button.setEnabled(True)
         else:
             self.current_project_id = None
             self.open_general_info_button.setEnabled(False)
             self.open_line_items_button.setEnabled(False)
+            self.clone_project_button.setEnabled(False)
             self.delete_selected_project_button.setEnabled(False)
 
+    @instrumented_action()
     def add_new_project(self):
+        from src.general_info_view import GeneralInfoWindow
         # Pass None for project_id to indicate a new project
-        self.general_info_window = GeneralInfoWindow(project_id=None, db_session=self.db_session, parent_dashboard=self)
+        self.general_info_window = GeneralInfoWindow(project_id=None, parent_dashboard=self)
         self.general_info_window.project_updated_signal.connect(self.load_projects)
         self.general_info_window.show()
 
+    @instrumented_action()
     def open_general_info(self):
         if self.current_project_id is not None:
-            self.general_info_window = GeneralInfoWindow(project_id=self.current_project_id, db_session=self.db_session, parent_dashboard=self)
+            from src.general_info_view import GeneralInfoWindow
+            self.general_info_window = GeneralInfoWindow(project_id=self.current_project_id, parent_dashboard=self)
             self.general_info_window.project_updated_signal.connect(self.load_projects)
             self.general_info_window.show()
         else:
             QMessageBox.warning(self, "No Project Selected", "Please select a project from the table first.")
 
+    @instrumented_action()
     def open_line_items(self):
-        selected_row = self.projects_table.currentRow()
+        selected_row = self.projects_table.currentIndex().row()
         if selected_row < 0:
             QMessageBox.warning(self, "Selection Error", "Please select a project to view line items.")
             return
 
-        project_id = int(self.projects_table.item(selected_row, 0).text())
+        project_id = self.projects_model.project_id_at(selected_row)
 
+        from src.estimate_line_items_view import EstimateLineItemsWindow
         # Corrected: filter by 'id' in EstimateLineItemsWindow constructor
-        self.line_items_window = EstimateLineItemsWindow(project_id=project_id, db_session=self.db_session, parent=self)
+        self.line_items_window = EstimateLineItemsWindow(project_id=project_id, parent=self)
         self.line_items_window.show()
 
+    @instrumented_action()
+    def clone_selected_project(self):
+        if self.current_project_id is None:
+            QMessageBox.warning(self, "No Project Selected", "Please select a project to copy.")
+            return
+        from src.clone_project_dialog import CloneProjectDialog
+        dialog = CloneProjectDialog(self.db_session, self.current_project_id, parent=self)
+        if dialog.exec() == QDialog.Accepted:
+            self.load_projects()
+
+    @instrumented_action()
     def open_manage_common_data(self):
-        # Corrected: pass only db_session as a positional argument if __init__ doesn't expect keyword
-        self.manage_common_data_window = ManageCommonDataWindow(self.db_session, parent=self)
+        from src.manage_common_data_view import ManageCommonDataWindow
+        self.manage_common_data_window = ManageCommonDataWindow(parent=self)
         self.manage_common_data_window.data_updated_signal.connect(self.load_projects)
         self.manage_common_data_window.show()
 
+    @instrumented_action()
     def delete_selected_project(self):
         if self.current_project_id is not None:
             reply = QMessageBox.question(self, 'Confirm Delete',
@@ -191,7 +228,13 @@ class ContractorProEstimator(QMainWindow):
         else:
             QMessageBox.warning(self, "No Project Selected", "Please select a project to delete.")
 
+    def open_diagnostics(self):
+        from src.diagnostics_dialog import DiagnosticsDialog
+        self.diagnostics_dialog = DiagnosticsDialog(parent=self)
+        self.diagnostics_dialog.show()
+
     def closeEvent(self, event):
+        self.project_search.shutdown()
         if self.db_session:
             self.db_session.close()
         super().closeEvent(event)
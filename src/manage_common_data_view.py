@@ -8,13 +8,17 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal
 from src.database import Session, CommonItem, CostCode, MFGroup, create_db_and_tables
+from src.instrumentation import instrumented_action
+from src.session_manager import open_window_session
 
 class ManageCommonDataWindow(QDialog):
     data_updated_signal = Signal() # Signal to notify the dashboard or other windows to refresh
 
-    def __init__(self, db_session, parent=None): # Corrected: db_session is a positional argument
+    def __init__(self, db_session=None, parent=None):
         super().__init__(parent)
-        self.db_session = db_session
+        # Our own unit of work unless the caller lends us a session (which it then closes itself)
+        self.owns_db_session = db_session is None
+        self.db_session = open_window_session() if self.owns_db_session else db_session
         self.setWindowTitle("Manage Common Items & Cost Codes")
         self.setGeometry(250, 250, 900, 600)
 
@@ -145,6 +149,7 @@ class ManageCommonDataWindow(QDialog):
 
 
     # --- Common Items Methods ---
+    @instrumented_action()
     def load_common_items(self):
         self.common_items_table.setRowCount(0)
         items = self.db_session.query(CommonItem).order_by(CommonItem.name).all()
@@ -178,6 +183,7 @@ class ManageCommonDataWindow(QDialog):
             self.update_common_item_btn.setEnabled(False)
             self.delete_common_item_btn.setEnabled(False)
 
+    @instrumented_action()
     def add_common_item(self):
         name = self.common_item_name_input.text().strip()
         if not name:
@@ -208,6 +214,7 @@ class ManageCommonDataWindow(QDialog):
             QMessageBox.critical(self, "Database Error", f"Failed to add common item: {e}")
             print(f"DEBUG: Error adding common item: {e}")
 
+    @instrumented_action()
     def update_common_item(self):
         selected_rows = self.common_items_table.selectionModel().selectedRows()
         if not selected_rows:
@@ -248,6 +255,7 @@ class ManageCommonDataWindow(QDialog):
             QMessageBox.critical(self, "Database Error", f"Failed to update common item: {e}")
             print(f"DEBUG: Error updating common item: {e}")
 
+    @instrumented_action()
     def delete_common_item(self):
         selected_rows = self.common_items_table.selectionModel().selectedRows()
         if not selected_rows:
@@ -290,6 +298,7 @@ class ManageCommonDataWindow(QDialog):
         self.delete_common_item_btn.setEnabled(False)
 
     # --- Cost Codes Methods ---
+    @instrumented_action()
     def load_cost_codes(self):
         self.cost_codes_table.setRowCount(0)
         codes = self.db_session.query(CostCode).order_by(CostCode.code).all()
@@ -331,6 +340,7 @@ class ManageCommonDataWindow(QDialog):
             self.update_cost_code_btn.setEnabled(False)
             self.delete_cost_code_btn.setEnabled(False)
 
+    @instrumented_action()
     def add_cost_code(self):
         code = self.cost_code_code_input.text().strip()
         name = self.cost_code_name_input.text().strip()
@@ -356,7 +366,7 @@ class ManageCommonDataWindow(QDialog):
                 code=code,
                 name=name,
                 description=self.cost_code_description_input.toPlainText().strip() or None,
-                mf_group=selected_mf_group
+                mf_group=self.session_mf_group(selected_mf_group)
             )
             self.db_session.add(new_code)
             self.db_session.commit()
@@ -369,6 +379,7 @@ class ManageCommonDataWindow(QDialog):
             QMessageBox.critical(self, "Database Error", f"Failed to add cost code: {e}")
             print(f"DEBUG: Error adding cost code: {e}")
 
+    @instrumented_action()
     def update_cost_code(self):
         selected_rows = self.cost_codes_table.selectionModel().selectedRows()
         if not selected_rows:
@@ -404,7 +415,7 @@ class ManageCommonDataWindow(QDialog):
                 code_to_update.code = code_str
                 code_to_update.name = name
                 code_to_update.description = self.cost_code_description_input.toPlainText().strip() or None
-                code_to_update.mf_group = selected_mf_group
+                code_to_update.mf_group = self.session_mf_group(selected_mf_group)
                 self.db_session.commit()
                 QMessageBox.information(self, "Success", f"Cost code '{code_str}' updated.")
                 self.load_cost_codes()
@@ -417,6 +428,7 @@ class ManageCommonDataWindow(QDialog):
             QMessageBox.critical(self, "Database Error", f"Failed to update cost code: {e}")
             print(f"DEBUG: Error updating cost code: {e}")
 
+    @instrumented_action()
     def delete_cost_code(self):
         selected_rows = self.cost_codes_table.selectionModel().selectedRows()
         if not selected_rows:
@@ -457,8 +469,12 @@ class ManageCommonDataWindow(QDialog):
         self.update_cost_code_btn.setEnabled(False)
         self.delete_cost_code_btn.setEnabled(False)
 
+    def session_mf_group(self, mf_group):
+        # The combo's groups may predate a trim of the session's identity map; use the session's own instance
+        return self.db_session.get(MFGroup, mf_group.id) if mf_group is not None else None
+
     def closeEvent(self, event):
-        if self.db_session:
+        if self.owns_db_session:
             self.db_session.close()
         super().closeEvent(event)
 
@@ -0,0 +1,199 @@
+# src/pdf_cache.py
+"""
+On-disk cache of rendered estimate PDFs.
+
+An estimate is keyed by a SHA-256 of exactly what the renderer receives:
+project_data, the line items and the financial summary (see
+estimate_loader.pdf_payload), plus pdf_generator.TEMPLATE_VERSION and the
+ReportLab version. Editing the project or any line item changes the payload
+and therefore the key, so stale entries are never served; they simply stop
+being used and age out.
+
+Entries live in cache/pdf/ (or CONTRACTORPRO_PDF_CACHE) as <key>.pdf with a
+small <key>.json holding the render stats. Each hit refreshes the entry's
+modification time, and after every store the least recently used entries
+are deleted until the PDFs fit in CONTRACTORPRO_PDF_CACHE_MB megabytes
+(200 by default, 0 turns the cache off). Files are written to a temporary
+name and renamed into place, so the PDF worker thread and batch export
+processes can share the directory.
+
+A hit is a byte-for-byte copy of the earlier render, including its creation
+date.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import reportlab
+from src.pdf_generator import TEMPLATE_VERSION, generate_pdf_estimate
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get('CONTRACTORPRO_PDF_CACHE') or os.path.join(BASE_DIR, '..', 'cache', 'pdf')
+CACHE_MAX_BYTES = int(float(os.environ.get('CONTRACTORPRO_PDF_CACHE_MB', '200')) * 1024 * 1024)
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def cache_key(project_data: dict, line_items_data: list, financial_summary_data: dict):
+    """SHA-256 hex digest identifying one rendered estimate."""
+    digest = hashlib.sha256()
+    digest.update(_canonical({'template': TEMPLATE_VERSION, 'reportlab': reportlab.Version}))
+    digest.update(_canonical(project_data))
+    digest.update(_canonical(financial_summary_data))
+    for item in line_items_data: # One item at a time: no giant string for large estimates
+        digest.update(b'\n')
+        digest.update(_canonical(item))
+    return digest.hexdigest()
+
+
+class PdfCache:
+    """A directory of rendered PDFs, evicted least recently used first once it exceeds max_bytes."""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.pdf', base + '.json'
+
+    def get(self, key, file_path):
+        """
+        Copies the cached PDF for key to file_path.
+
+        Returns:
+            dict: The stats of the original render with 'cached' True and 'seconds' the copy time,
+            or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        start = time.perf_counter()
+        pdf_path, stats_path = self._paths(key)
+        try:
+            with open(stats_path, encoding='utf-8') as f:
+                stats = json.load(f)
+            shutil.copyfile(pdf_path, file_path)
+            os.utime(pdf_path) # Most recently used
+        except (OSError, ValueError):
+            return None # Missing, evicted meanwhile or half-written by a crashed process
+        stats['cached'] = True
+        stats['seconds'] = time.perf_counter() - start
+        return stats
+
+    def put(self, key, file_path, stats):
+        """Stores a copy of the freshly rendered file_path under key, then evicts down to max_bytes."""
+        if not self.enabled:
+            return
+        pdf_path, stats_path = self._paths(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            def copy_pdf(f):
+                with open(file_path, 'rb') as source:
+                    shutil.copyfileobj(source, f)
+            self._write_atomic(pdf_path, copy_pdf)
+            self._write_atomic(stats_path, lambda f: f.write(_canonical({'pages': stats['pages'], 'bytes': stats['bytes']})))
+        except OSError as e:
+            print(f"DEBUG: Could not store PDF in cache: {e}")
+            return
+        self.evict()
+
+    def _write_atomic(self, path, write):
+        fd, temp_path = tempfile.mkstemp(suffix='.part', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def entries(self):
+        """Returns (mtime, size, key) of every cached PDF, least recently used first."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith('.pdf'):
+                continue
+            try:
+                info = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((info.st_mtime, info.st_size, name[:-len('.pdf')]))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """Deletes least recently used entries until the cached PDFs fit in max_bytes."""
+        with self._evict_lock:
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, key in entries:
+                if total <= self.max_bytes:
+                    break
+                for path in self._paths(key):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                total -= size
+
+    def clear(self):
+        for _, _, key in self.entries():
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache():
+    """The cache in CACHE_DIR, shared by everything in this process."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = PdfCache()
+    return _default_cache
+
+
+def render_pdf_cached(project_data: dict, line_items_data: list, financial_summary_data: dict, file_path, on_page=None, cache=None):
+    """
+    Writes the estimate PDF to file_path, copying it from the cache when the same payload was rendered before.
+
+    Arguments are those of pdf_generator.generate_pdf_estimate (file_path must be a path).
+    Returns its stats, with 'cached' telling whether the render was skipped.
+    """
+    cache = cache if cache is not None else get_default_cache()
+    if not cache.enabled:
+        stats = generate_pdf_estimate(project_data, line_items_data, financial_summary_data, file_path, on_page=on_page)
+        stats['cached'] = False
+        return stats
+    key = cache_key(project_data, line_items_data, financial_summary_data)
+    stats = cache.get(key, file_path)
+    if stats is not None:
+        return stats
+    stats = generate_pdf_estimate(project_data, line_items_data, financial_summary_data, file_path, on_page=on_page)
+    cache.put(key, file_path, stats)
+    stats['cached'] = False
+    return stats
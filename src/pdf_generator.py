@@ -1,16 +1,28 @@
 # src/pdf_generator.py
 import os
+import re
+import threading
+import time
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Flowable
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
+from reportlab.lib.utils import simpleSplit
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-from PySide6.QtWidgets import QFileDialog # For saving file dialog
+
+# Part of every PDF cache key (see pdf_cache.py): bump it whenever a change here alters the rendered output
+TEMPLATE_VERSION = 2
+
+_fonts_registered = False
 
 def register_fonts():
-    """Registers standard fonts if not already registered."""
+    """Registers standard fonts if not already registered. Runs once per process, on the first render."""
+    global _fonts_registered
+    if _fonts_registered:
+        return
+    _fonts_registered = True
     try:
         # Register a commonly available font that supports a wider range of characters
         # Times-Roman, Helvetica, Courier are built-in.
@@ -22,174 +34,485 @@ def register_fonts():
         # Fallback if fonts are not found or already registered
         pass
 
-# Ensure fonts are registered when the module is imported
-register_fonts()
 
+class PdfExportCancelled(Exception):
+    """Raised from the page callback to stop a render that was cancelled."""
+
+
+def default_pdf_filename(project_data: dict):
+    """File name an estimate is saved under unless the user picks another one."""
+    project_name = re.sub(r'[\\/:*?"<>|]', '_', project_data['project_name']).replace(' ', '_')
+    return f"Project_Estimate_{project_name}_{project_data['project_id']}.pdf"
+
+
+class _ByteCountingWriter:
+    """Forwards writes to a binary file-like object and counts the bytes written."""
+
+    def __init__(self, target):
+        self.target = target
+        self.name = getattr(target, 'name', None)
+        self.bytes_written = 0
+
+    def write(self, data):
+        self.bytes_written += len(data)
+        return self.target.write(data)
+
+
+LINE_ITEM_HEADER = ["Description", "Category", "UOM", "Quantity", "Unit Cost", "Total"]
 
-def generate_pdf_estimate(project_data: dict, line_items_data: list, financial_summary_data: dict):
+
+def _line_item_cells(item):
+    return [
+        item["description"],
+        item["category"],
+        item["uom"],
+        f"{item['quantity']:.2f}",
+        f"${item['unit_cost']:.2f}",
+        f"${item['total']:.2f}"
+    ]
+
+
+def _fit_text(text, width, font_name, font_size):
+    """Shortens text with an ellipsis so it fits in width points."""
+    text = str(text or '')
+    if pdfmetrics.stringWidth(text, font_name, font_size) <= width:
+        return text
+    ellipsis = '...'
+    width -= pdfmetrics.stringWidth(ellipsis, font_name, font_size)
+    # Start from a proportional guess, then trim the few characters still overhanging
+    cut = int(len(text) * width / pdfmetrics.stringWidth(text, font_name, font_size))
+    while cut > 0 and pdfmetrics.stringWidth(text[:cut], font_name, font_size) > width:
+        cut -= 1
+    return text[:cut].rstrip() + ellipsis
+
+
+def _wrap_text(text, width, font_name, font_size, max_lines):
     """
-    Generates a PDF estimate document for a given project.
+    Splits text into lines that fit in width points, like a Paragraph would wrap it.
 
-    Args:
-        project_data (dict): Dictionary containing general project information.
-        line_items_data (list): List of dictionaries, each representing a line item.
-        financial_summary_data (dict): Dictionary containing calculated financial totals.
+    Words longer than a line are broken. Text that needs more than max_lines
+    lines is cut at the last one with an ellipsis.
     """
-    # Use QFileDialog to get a save file path from the user
-    # Start in the user's documents directory or current working directory
-    default_filename = f"Project_Estimate_{project_data['project_name'].replace(' ', '_')}_{project_data['project_id']}.pdf"
-    file_path, _ = QFileDialog.getSaveFileName(
-        None, "Save Project Estimate PDF", default_filename, "PDF Files (*.pdf);;All Files (*)"
-    )
-
-    if not file_path:
-        return # User cancelled the save operation
-
-    doc = SimpleDocTemplate(file_path, pagesize=letter)
-    styles = getSampleStyleSheet()
-
-    # Custom styles
-    h1_style = ParagraphStyle(
-        name='h1_custom',
-        parent=styles['h1'],
-        fontSize=18,
-        spaceAfter=14,
-        alignment=1, # Center
-        fontName='Helvetica-Bold'
-    )
-    h2_style = ParagraphStyle(
-        name='h2_custom',
-        parent=styles['h2'],
-        fontSize=14,
-        spaceAfter=10,
-        fontName='Helvetica-Bold'
-    )
-    normal_style = ParagraphStyle(
-        name='normal_custom',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=6,
-        fontName='Helvetica'
-    )
-    bold_style = ParagraphStyle(
-        name='bold_custom',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=6,
-        fontName='Helvetica-Bold'
-    )
-    total_style = ParagraphStyle(
-        name='total_custom',
-        parent=styles['Normal'],
-        fontSize=12,
-        spaceBefore=10,
-        spaceAfter=10,
-        alignment=2, # Right alignment
-        fontName='Helvetica-Bold'
-    )
-
-    Story = []
-
-    # Title
-    Story.append(Paragraph("Project Estimate", h1_style))
-    Story.append(Spacer(1, 0.2 * inch))
-
-    # Project and Client Information
-    Story.append(Paragraph("Project Information", h2_style))
-    Story.append(Paragraph(f"<b>Project Name:</b> {project_data['project_name']}", bold_style))
-    Story.append(Paragraph(f"<b>Project ID:</b> {project_data['project_id']}", bold_style))
-    Story.append(Paragraph(f"<b>Project Address:</b> {project_data['project_address']}", normal_style))
-    Story.append(Paragraph(f"<b>Estimate Date:</b> {project_data['estimate_date']}", normal_style))
-    Story.append(Paragraph(f"<b>Bid Due Date:</b> {project_data['bid_due_date']}", normal_style))
-    Story.append(Spacer(1, 0.1 * inch))
-
-    Story.append(Paragraph("Client Information", h2_style))
-    Story.append(Paragraph(f"<b>Client Name:</b> {project_data['client_name']}", bold_style))
-    Story.append(Paragraph(f"<b>Contact Person:</b> {project_data['client_contact']}", normal_style))
-    Story.append(Paragraph(f"<b>Phone:</b> {project_data['client_phone']}", normal_style))
-    Story.append(Paragraph(f"<b>Email:</b> {project_data['client_email']}", normal_style))
-    Story.append(Paragraph(f"<b>Client Address:</b> {project_data['client_address']}", normal_style))
-    Story.append(Spacer(1, 0.2 * inch))
-
-    # Scope of Work
-    if project_data['scope_of_work']:
-        Story.append(Paragraph("Scope of Work", h2_style))
-        Story.append(Paragraph(project_data['scope_of_work'], normal_style))
+    text = str(text or '')
+    if '\n' not in text and pdfmetrics.stringWidth(text, font_name, font_size) <= width:
+        return [text] # Most cells fit on one line
+    lines = []
+    for line in simpleSplit(text, font_name, font_size, width):
+        while pdfmetrics.stringWidth(line, font_name, font_size) > width:
+            # One word wider than the column: break it where it overhangs
+            cut = int(len(line) * width / pdfmetrics.stringWidth(line, font_name, font_size))
+            while cut > 1 and pdfmetrics.stringWidth(line[:cut], font_name, font_size) > width:
+                cut -= 1
+            cut = max(cut, 1)
+            lines.append(line[:cut])
+            line = line[cut:]
+        lines.append(line)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines - 1] + [_fit_text(f"{lines[max_lines - 1]} {lines[max_lines]}", width, font_name, font_size)]
+    return lines or ['']
+
+
+class _StreamingLineItemsTable(Flowable):
+    """
+    The line-item table of a large estimate, laid out one page at a time.
+
+    Whenever the frame asks, the flowable pulls just enough line items from
+    its iterator to fill the space left on the page and splits off a Table of
+    those rows: header, rows, page subtotal and running total. Descriptions
+    and categories are wrapped with font metrics as each item is read, and the
+    Table gets fixed column widths and the row heights that wrapping gives, so
+    ReportLab never measures a cell. The remainder is a new flowable over the
+    same iterator, so only one page of rows is held at a time and the render
+    time grows linearly with the number of line items.
+    """
+
+    def __init__(self, template, items, running_total=0.0, pending=None):
+        super().__init__()
+        self.template = template
+        self.items = items
+        self.running_total = running_total
+        self.pending = pending if pending is not None else [] # (cells, row height, total) of items read ahead
+        self._table = None
+
+    def _row_space(self, availHeight):
+        # Header, page subtotal and running total rows take one row height each
+        return availHeight - 3 * self.template.large_table_row_height + 1e-6
+
+    def _measure(self, item):
+        template = self.template
+        font_name, font_size = 'Helvetica', template.large_table_font_size
+        max_lines = template.large_table_max_row_lines
+        cells = _line_item_cells(item)
+        line_count = 1
+        for column in (0, 1): # Description and category
+            width = template.line_item_col_widths[column] - 2 * template.large_table_padding
+            lines = _wrap_text(cells[column], width, font_name, font_size, max_lines)
+            cells[column] = '\n'.join(lines)
+            line_count = max(line_count, len(lines))
+        height = template.large_table_row_height + (line_count - 1) * (font_size + 1) # Extra lines at the style's leading
+        return cells, height, item['total']
+
+    def _fill(self, space):
+        # Reads items until the pending rows are taller than space or the items run out
+        height = sum(row[1] for row in self.pending)
+        while height <= space:
+            item = next(self.items, None)
+            if item is None:
+                return
+            row = self._measure(item)
+            self.pending.append(row)
+            height += row[1]
+
+    def _rows_that_fit(self, space):
+        fits, height = 0, 0.0
+        for _, row_height, _ in self.pending:
+            height += row_height
+            if height > space:
+                break
+            fits += 1
+        return fits
+
+    def _chunk_table(self, rows):
+        """Returns (table, page total) for one page of measured rows."""
+        template = self.template
+        data = [LINE_ITEM_HEADER]
+        heights = [template.large_table_row_height]
+        page_total = 0.0
+        for cells, height, total in rows:
+            data.append(cells)
+            heights.append(height)
+            page_total += total
+        data.append(["Page subtotal", "", "", "", "", f"${page_total:.2f}"])
+        data.append(["Running total", "", "", "", "", f"${self.running_total + page_total:.2f}"])
+        heights += [template.large_table_row_height] * 2
+        table = Table(data, colWidths=template.line_item_col_widths, rowHeights=heights)
+        table.setStyle(template.large_table_style)
+        return table, page_total
+
+    # wrap() may be called more than once for the same space, so it only reads ahead; nothing else changes
+    def wrap(self, availWidth, availHeight):
+        space = self._row_space(availHeight)
+        self._fill(space)
+        if space >= 0 and self._rows_that_fit(space) == len(self.pending):
+            # Everything left fits on this page: this is the last chunk
+            self._table = self._chunk_table(self.pending)[0]
+            return self._table.wrap(availWidth, availHeight)
+        return availWidth, availHeight + self.template.large_table_row_height # Too tall: ask to be split
+
+    def split(self, availWidth, availHeight):
+        space = self._row_space(availHeight)
+        self._fill(space)
+        fits = self._rows_that_fit(space)
+        if fits < 1:
+            return [] # Not even one row left on this page; start the next one
+        table, page_total = self._chunk_table(self.pending[:fits])
+        rest = _StreamingLineItemsTable(self.template, self.items, self.running_total + page_total, self.pending[fits:])
+        return [table, rest]
+
+    def draw(self):
+        self._table.drawOn(self.canv, 0, 0)
+
+
+class EstimatePdfTemplate:
+    """
+    Page setup, paragraph styles, table styles and column widths of the estimate PDF.
+
+    Everything is built on first use and then reused by every render, so a
+    small estimate no longer pays for a fresh sample stylesheet, five
+    ParagraphStyles and two TableStyles each time. The objects are only read
+    while rendering, so one template can be shared by the GUI thread, the PDF
+    worker and each batch export process (see get_default_template()).
+
+    Estimates with more than large_table_threshold line items are laid out in
+    large-table mode: page-sized chunks with fixed column widths and row
+    heights, a header on every page and page subtotals (see
+    _StreamingLineItemsTable). Long descriptions wrap onto as many lines as
+    they need, up to large_table_max_row_lines, which keeps every row shorter
+    than a page.
+    """
+
+    large_table_threshold = 500
+    large_table_row_height = 14
+    large_table_font_size = 8
+    large_table_padding = 3
+    large_table_max_row_lines = 40
+
+    def __init__(self, pagesize=letter):
+        self.pagesize = pagesize
+        self.summary_col_widths = [3.5 * inch, 2.0 * inch]
+        # Fills the 6.5" between the default 1" margins of a letter page
+        self.line_item_col_widths = [2.6 * inch, 0.9 * inch, 0.5 * inch, 0.8 * inch, 0.85 * inch, 0.85 * inch]
+        self._styles = None
+        self._line_items_table_style = None
+        self._large_table_style = None
+        self._summary_table_style = None
+        self._lock = threading.Lock()
+
+    @property
+    def styles(self):
+        self._ensure_built()
+        return self._styles
+
+    @property
+    def line_items_table_style(self):
+        self._ensure_built()
+        return self._line_items_table_style
+
+    @property
+    def large_table_style(self):
+        self._ensure_built()
+        return self._large_table_style
+
+    @property
+    def summary_table_style(self):
+        self._ensure_built()
+        return self._summary_table_style
+
+    def _ensure_built(self):
+        if self._styles is not None:
+            return
+        with self._lock:
+            if self._styles is None:
+                register_fonts()
+                self._line_items_table_style = TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ADD8E6')), # Light Blue header
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige), # Light background for rows
+                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                    ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                    ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                    ('TOPPADDING', (0, 0), (-1, -1), 6),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                ])
+                padding = self.large_table_padding
+                self._large_table_style = TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ADD8E6')), # Light Blue header
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('BACKGROUND', (0, 1), (-1, -3), colors.beige),
+                    ('FONTNAME', (0, 1), (-1, -3), 'Helvetica'),
+                    ('BACKGROUND', (0, -2), (-1, -1), colors.HexColor('#E8E8E8')), # Subtotal rows
+                    ('FONTNAME', (0, -2), (-1, -1), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, 0), (-1, -1), self.large_table_font_size),
+                    ('LEADING', (0, 0), (-1, -1), self.large_table_font_size + 1),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('ALIGN', (3, 1), (-1, -1), 'RIGHT'), # Numbers
+                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+                    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+                    ('LEFTPADDING', (0, 0), (-1, -1), padding),
+                    ('RIGHTPADDING', (0, 0), (-1, -1), padding),
+                    ('TOPPADDING', (0, 0), (-1, -1), padding),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
+                ])
+                self._summary_table_style = TableStyle([
+                    ('ALIGN', (0, 0), (-1, -1), 'RIGHT'), # Align values to right
+                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'), # Left column bold
+                    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'), # Right column normal
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
+                    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+                    ('BACKGROUND', (0, -1), (-1, -1), colors.lightgreen), # Highlight final estimate
+                    ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
+                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, -1), (-1, -1), 12),
+                ])
+                self._styles = self._build_styles() # Assigned last: a non-None _styles means everything is built
+
+    @staticmethod
+    def _build_styles():
+        sample = getSampleStyleSheet()
+        return {
+            'h1': ParagraphStyle(
+                name='h1_custom',
+                parent=sample['h1'],
+                fontSize=18,
+                spaceAfter=14,
+                alignment=1, # Center
+                fontName='Helvetica-Bold'
+            ),
+            'h2': ParagraphStyle(
+                name='h2_custom',
+                parent=sample['h2'],
+                fontSize=14,
+                spaceAfter=10,
+                fontName='Helvetica-Bold'
+            ),
+            'normal': ParagraphStyle(
+                name='normal_custom',
+                parent=sample['Normal'],
+                fontSize=10,
+                spaceAfter=6,
+                fontName='Helvetica'
+            ),
+            'bold': ParagraphStyle(
+                name='bold_custom',
+                parent=sample['Normal'],
+                fontSize=10,
+                spaceAfter=6,
+                fontName='Helvetica-Bold'
+            ),
+            'total': ParagraphStyle(
+                name='total_custom',
+                parent=sample['Normal'],
+                fontSize=12,
+                spaceBefore=10,
+                spaceAfter=10,
+                alignment=2, # Right alignment
+                fontName='Helvetica-Bold'
+            ),
+        }
+
+    def use_large_table(self, line_items_data):
+        """Whether line_items_data is big enough for large-table mode (always, for an unsized iterable)."""
+        try:
+            return len(line_items_data) > self.large_table_threshold
+        except TypeError:
+            return True
+
+    def build_story(self, project_data: dict, line_items_data: list, financial_summary_data: dict, large_table=None):
+        """Returns the flowables of the estimate."""
+        styles = self.styles
+        Story = []
+
+        # Title
+        Story.append(Paragraph("Project Estimate", styles['h1']))
         Story.append(Spacer(1, 0.2 * inch))
 
-    # Line Items Table
-    Story.append(Paragraph("Estimate Line Items", h2_style))
-    data = [["Description", "Category", "UOM", "Quantity", "Unit Cost", "Total"]]
-    for item in line_items_data:
-        data.append([
-            item["description"],
-            item["category"],
-            item["uom"],
-            f"{item['quantity']:.2f}",
-            f"${item['unit_cost']:.2f}",
-            f"${item['total']:.2f}"
-        ])
-
-    table = Table(data)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ADD8E6')), # Light Blue header
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige), # Light background for rows
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BOX', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    Story.append(table)
-    Story.append(Spacer(1, 0.2 * inch))
-
-    # Financial Summary (Client View - NO INTERNAL PROFIT)
-    Story.append(Paragraph("Summary", h2_style))
-    summary_data = []
-
-    # Total Direct Cost
-    summary_data.append(["Total Direct Cost:", f"${financial_summary_data['total_direct_cost']:.2f}"])
-
-    # Markup Percentage (Visible to client)
-    markup_percent = financial_summary_data['markup_percentage']
-    summary_data.append(["Markup Percentage:", f"{markup_percent:.2f}%"])
-
-    # Calculate subtotal after markup
-    # This assumes markup is directly applied to the total direct cost to get the final client price
-    # Based on your image: Final Project Estimate = Total Direct Cost * (1 + Markup %)
-    # We explicitly exclude Overhead and Profit here as per your request
-    final_estimate_for_client = financial_summary_data['total_direct_cost'] * (1 + markup_percent / 100.0)
-
-    # Final Project Estimate
-    summary_data.append(["Final Project Estimate:", f"${final_estimate_for_client:.2f}"])
-
-    summary_table = Table(summary_data, colWidths=[3.5 * inch, 2.0 * inch]) # Adjust column widths
-    summary_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'RIGHT'), # Align values to right
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'), # Left column bold
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'), # Right column normal
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
-        ('BOX', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgreen), # Highlight final estimate
-        ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, -1), (-1, -1), 12),
-    ]))
-    Story.append(summary_table)
-    Story.append(Spacer(1, 0.2 * inch))
-
-    # Project Notes
-    if project_data['project_notes']:
-        Story.append(Paragraph("Project Notes", h2_style))
-        Story.append(Paragraph(project_data['project_notes'], normal_style))
+        # Project and Client Information
+        Story.append(Paragraph("Project Information", styles['h2']))
+        Story.append(Paragraph(f"<b>Project Name:</b> {project_data['project_name']}", styles['bold']))
+        Story.append(Paragraph(f"<b>Project ID:</b> {project_data['project_id']}", styles['bold']))
+        Story.append(Paragraph(f"<b>Project Address:</b> {project_data['project_address']}", styles['normal']))
+        Story.append(Paragraph(f"<b>Estimate Date:</b> {project_data['estimate_date']}", styles['normal']))
+        Story.append(Paragraph(f"<b>Bid Due Date:</b> {project_data['bid_due_date']}", styles['normal']))
+        Story.append(Spacer(1, 0.1 * inch))
+
+        Story.append(Paragraph("Client Information", styles['h2']))
+        Story.append(Paragraph(f"<b>Client Name:</b> {project_data['client_name']}", styles['bold']))
+        Story.append(Paragraph(f"<b>Contact Person:</b> {project_data['client_contact']}", styles['normal']))
+        Story.append(Paragraph(f"<b>Phone:</b> {project_data['client_phone']}", styles['normal']))
+        Story.append(Paragraph(f"<b>Email:</b> {project_data['client_email']}", styles['normal']))
+        Story.append(Paragraph(f"<b>Client Address:</b> {project_data['client_address']}", styles['normal']))
+        Story.append(Spacer(1, 0.2 * inch))
+
+        # Scope of Work
+        if project_data['scope_of_work']:
+            Story.append(Paragraph("Scope of Work", styles['h2']))
+            Story.append(Paragraph(project_data['scope_of_work'], styles['normal']))
+            Story.append(Spacer(1, 0.2 * inch))
+
+        # Line Items Table
+        Story.append(Paragraph("Estimate Line Items", styles['h2']))
+        if large_table is None:
+            large_table = self.use_large_table(line_items_data)
+        if large_table:
+            Story.append(_StreamingLineItemsTable(self, iter(line_items_data)))
+        else:
+            data = [LINE_ITEM_HEADER]
+            for item in line_items_data:
+                data.append(_line_item_cells(item))
+
+            table = Table(data)
+            table.setStyle(self.line_items_table_style)
+            Story.append(table)
+        Story.append(Spacer(1, 0.2 * inch))
+
+        # Financial Summary (Client View - NO INTERNAL PROFIT)
+        Story.append(Paragraph("Summary", styles['h2']))
+        summary_data = []
+
+        # Total Direct Cost
+        summary_data.append(["Total Direct Cost:", f"${financial_summary_data['total_direct_cost']:.2f}"])
+
+        # Markup Percentage (Visible to client)
+        markup_percent = financial_summary_data['markup_percentage']
+        summary_data.append(["Markup Percentage:", f"{markup_percent:.2f}%"])
+
+        # Calculate subtotal after markup
+        # This assumes markup is directly applied to the total direct cost to get the final client price
+        # Based on your image: Final Project Estimate = Total Direct Cost * (1 + Markup %)
+        # We explicitly exclude Overhead and Profit here as per your request
+        final_estimate_for_client = financial_summary_data['total_direct_cost'] * (1 + markup_percent / 100.0)
+
+        # Final Project Estimate
+        summary_data.append(["Final Project Estimate:", f"${final_estimate_for_client:.2f}"])
+
+        summary_table = Table(summary_data, colWidths=self.summary_col_widths)
+        summary_table.setStyle(self.summary_table_style)
+        Story.append(summary_table)
         Story.append(Spacer(1, 0.2 * inch))
 
-    # Build the PDF
-    doc.build(Story)
\ No newline at end of file
+        # Project Notes
+        if project_data['project_notes']:
+            Story.append(Paragraph("Project Notes", styles['h2']))
+            Story.append(Paragraph(project_data['project_notes'], styles['normal']))
+            Story.append(Spacer(1, 0.2 * inch))
+        return Story
+
+    def render(self, project_data: dict, line_items_data: list, financial_summary_data: dict, output, on_page=None,
+               large_table=None):
+        """Renders the estimate; see generate_pdf_estimate()."""
+        start = time.perf_counter()
+        if isinstance(output, (str, os.PathLike)):
+            target = os.fspath(output)
+        else:
+            target = _ByteCountingWriter(output)
+        doc = SimpleDocTemplate(target, pagesize=self.pagesize)
+        Story = self.build_story(project_data, line_items_data, financial_summary_data, large_table=large_table)
+
+        # Build the PDF
+        pages = [0]
+        def page_done(canvas, doc):
+            pages[0] = canvas.getPageNumber()
+            if on_page is not None:
+                on_page(pages[0])
+        doc.build(Story, onFirstPage=page_done, onLaterPages=page_done)
+
+        size = target.bytes_written if isinstance(target, _ByteCountingWriter) else os.path.getsize(target)
+        return {'pages': pages[0], 'bytes': size, 'seconds': time.perf_counter() - start}
+
+
+_default_template = None
+_default_template_lock = threading.Lock()
+
+def get_default_template():
+    """The template shared by the interactive export, the PDF worker and batch export in this process."""
+    global _default_template
+    if _default_template is None:
+        with _default_template_lock:
+            if _default_template is None:
+                _default_template = EstimatePdfTemplate()
+    return _default_template
+
+
+def generate_pdf_estimate(project_data: dict, line_items_data: list, financial_summary_data: dict, output, on_page=None, template=None,
+                          large_table=None):
+    """
+    Renders a PDF estimate document for a given project.
+
+    Pure rendering: no dialogs or database access, so it can run in worker
+    threads, batch processes and tests. Ask for the file name in the UI layer.
+
+    Args:
+        project_data (dict): Dictionary containing general project information.
+        line_items_data (list): List of dictionaries, each representing a line item. In large-table
+            mode any iterable works; it is read a page at a time.
+        financial_summary_data (dict): Dictionary containing calculated financial totals.
+        output: File path, or a binary file-like object (e.g. io.BytesIO) to write the PDF to.
+        on_page (callable): Called with the page number as each page is started. It may raise
+            PdfExportCancelled to stop the render.
+        template (EstimatePdfTemplate): Layout to use. Defaults to the shared template.
+        large_table (bool): Force large-table mode on or off. By default it is used for more than
+            template.large_table_threshold line items.
+
+    Returns:
+        dict: Render stats: 'pages', 'bytes' and 'seconds'.
+    """
+    template = template if template is not None else get_default_template()
+    return template.render(project_data, line_items_data, financial_summary_data, output, on_page=on_page,
+                           large_table=large_table)
@@ -0,0 +1,85 @@
+# src/pdf_worker.py
+"""
+Background PDF export.
+
+The estimate is snapshotted into plain dicts on the GUI thread (see
+estimate_loader.pdf_payload) and rendered by a QRunnable on a thread pool, so
+the window stays responsive while ReportLab lays out long estimates. The
+task reports each page as it is started, can be cancelled at the next page
+boundary, and writes to a temporary file that only replaces the target once
+the render has finished, so a cancelled or failed export never leaves a
+truncated PDF behind. An estimate exported before without changes is copied
+from the PDF cache (see pdf_cache.py) instead of being rendered again.
+"""
+
+import os
+import tempfile
+import threading
+from PySide6.QtCore import QObject, QRunnable, Signal
+from src.pdf_generator import PdfExportCancelled
+from src.pdf_cache import render_pdf_cached
+
+
+class _PdfSignals(QObject):
+    progress = Signal(int)       # page number being rendered
+    finished = Signal(str, object)  # file path, render stats (see generate_pdf_estimate)
+    failed = Signal(str)         # error message
+    cancelled = Signal()
+
+
+class PdfExportTask(QRunnable):
+    """Renders one estimate PDF on a pool thread."""
+
+    def __init__(self, file_path, project_data, line_items_data, financial_summary_data):
+        super().__init__()
+        self.setAutoDelete(False) # The window keeps a reference so it can cancel us
+        self.file_path = file_path
+        self.project_data = project_data
+        self.line_items_data = line_items_data
+        self.financial_summary_data = financial_summary_data
+        self.signals = _PdfSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stops the render at the next page boundary."""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def _on_page(self, page_number):
+        if self._cancel_event.is_set():
+            raise PdfExportCancelled()
+        self.signals.progress.emit(page_number)
+
+    def run(self):
+        if self._cancel_event.is_set():
+            self.signals.cancelled.emit()
+            return
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(suffix='.pdf.part', dir=os.path.dirname(os.path.abspath(self.file_path)))
+            os.close(fd)
+            stats = render_pdf_cached(self.project_data, self.line_items_data, self.financial_summary_data,
+                                      temp_path, on_page=self._on_page)
+            if self._cancel_event.is_set():
+                raise PdfExportCancelled()
+            os.replace(temp_path, self.file_path)
+        except PdfExportCancelled:
+            self._remove(temp_path)
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self._remove(temp_path)
+            print(f"DEBUG: PDF export error: {e}")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(self.file_path, stats)
+
+    @staticmethod
+    def _remove(path):
+        if path is None:
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,223 @@
+# src/project_cloner.py
+"""
+Set-based project cloning and estimate templates.
+
+A clone is built inside the database, never through ORM objects: one
+INSERT ... SELECT copies the project row and one more copies all of its line
+items, however many there are, applying the requested transforms in SQL on
+the way:
+
+    quantity_factor     multiplies every quantity (e.g. 1.1 for a job 10% larger)
+    markup_percentage   replaces every line item's markup (None keeps them)
+    cost_code_map       {old cost code id: new cost code id}, a CASE over cost_code_id
+
+The copy gets a new name, today's estimate date and the status "Planned"; the
+bid, schedule and contract fields of the source are left blank, since they
+belong to the old job. Line items keep their order. The project_rollups
+triggers fire on the copied rows, and the new project's totals are stored in
+the same transaction, so a failed clone leaves nothing behind.
+
+A template is simply a project with the status TEMPLATE_STATUS: save a past
+project as a template, then start new bids from it with create_from_template.
+
+Usage:
+    python -m src.project_cloner SOURCE_ID [--name NAME] [--scale 1.1] [--markup 10]
+                                 [--map-cost-code "OLD=NEW" ...] [--template]
+
+Cost codes on the command line are codes (e.g. "03 30 00"), not ids.
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+
+from sqlalchemy import select, insert, literal, null, case
+from src.database import engine, Project, LineItem, CostCode
+from src.estimate_engine import store_rollup_totals
+
+TEMPLATE_STATUS = "Template"
+NEW_PROJECT_STATUS = "Planned"
+
+# Project fields that describe the source job rather than the estimate; a clone starts with them blank
+RESET_FIELDS = (
+    'bid_due_date', 'project_start_date', 'completion_date', 'contract_date',
+    'contract_amount', 'change_orders_total', 'current_contract_amount', 'final_total_cost',
+)
+
+# Copied line item columns, in insert order (project_id is the new project's)
+LINE_ITEM_COLUMNS = (
+    'project_id', 'description', 'quantity', 'unit', 'unit_cost', 'markup_percentage',
+    'total_cost', 'notes', 'is_common_item', 'common_item_id', 'cost_code_id',
+)
+
+
+def unique_project_name(connection, base_name):
+    """'<base_name>', or '<base_name> 2', '<base_name> 3'... whichever is not taken yet."""
+    taken = set(connection.execute(
+        select(Project.project_name).where(Project.project_name.startswith(base_name, autoescape=True))
+    ).scalars())
+    name, n = base_name, 1
+    while name in taken:
+        n += 1
+        name = f"{base_name} {n}"
+    return name
+
+
+def _insert_project_copy(connection, source_id, name, status):
+    overrides = {
+        'project_name': literal(name),
+        'project_status': literal(status),
+        'estimate_date': literal(date.today().isoformat()),
+        **{field: null() for field in RESET_FIELDS},
+    }
+    columns = [column.name for column in Project.__table__.columns if column.name != 'id']
+    copy = select(*(overrides.get(c, Project.__table__.c[c]) for c in columns)).where(Project.id == source_id)
+    return connection.execute(insert(Project.__table__).from_select(columns, copy)).lastrowid
+
+
+def _insert_line_item_copies(connection, source_id, new_id, quantity_factor, markup_percentage, cost_code_map):
+    line_items = LineItem.__table__.c
+    quantity = line_items.quantity if quantity_factor == 1 else line_items.quantity * float(quantity_factor)
+    markup = line_items.markup_percentage if markup_percentage is None else literal(float(markup_percentage))
+    cost_code = line_items.cost_code_id
+    if cost_code_map:
+        cost_code = case(cost_code_map, value=line_items.cost_code_id, else_=line_items.cost_code_id)
+    # The stored total_cost would no longer match once quantities or markups change
+    total_cost = line_items.total_cost if quantity_factor == 1 and markup_percentage is None else null()
+    copy = (
+        select(literal(new_id), line_items.description, quantity, line_items.unit, line_items.unit_cost, markup,
+               total_cost, line_items.notes, line_items.is_common_item, line_items.common_item_id, cost_code)
+        .where(line_items.project_id == source_id)
+        .order_by(line_items.id)
+    )
+    return connection.execute(insert(LineItem.__table__).from_select(LINE_ITEM_COLUMNS, copy)).rowcount
+
+
+def clone_project(source_id, new_name=None, quantity_factor=1.0, markup_percentage=None, cost_code_map=None,
+                  status=NEW_PROJECT_STATUS, bind=None):
+    """
+    Copies a project and all of its line items in one transaction, with two INSERT ... SELECT statements.
+
+    Args:
+        source_id (int): Project (or template) to copy.
+        new_name (str): Name of the copy. Defaults to '<source name> (copy)', numbered if taken.
+        quantity_factor (float): Multiplies every line item quantity; must be positive.
+        markup_percentage (float): New markup for every line item, as a whole percentage. None keeps them.
+        cost_code_map (dict): {old cost code id: new cost code id}. Line items with other codes keep theirs.
+        status (str): Status of the copy; TEMPLATE_STATUS makes it a template.
+        bind: Engine to write to. Defaults to the application engine.
+
+    Returns:
+        dict: 'project_id', 'project_name', 'line_items' (rows copied), 'totals' and 'seconds'.
+
+    Raises:
+        ValueError: Unknown project or cost code, name already taken, or a bad factor or markup. Nothing is written.
+    """
+    if quantity_factor <= 0:
+        raise ValueError("The quantity factor must be greater than zero.")
+    if markup_percentage is not None and markup_percentage < 0:
+        raise ValueError("The markup percentage cannot be negative.")
+    cost_code_map = {old: new for old, new in (cost_code_map or {}).items() if old != new}
+    bind = bind if bind is not None else engine
+    start = time.perf_counter()
+    with bind.begin() as connection:
+        source_name = connection.execute(select(Project.project_name).where(Project.id == source_id)).scalar()
+        if source_name is None:
+            raise ValueError(f"Project {source_id} not found.")
+        if cost_code_map:
+            targets = set(cost_code_map.values())
+            known = set(connection.execute(select(CostCode.id).where(CostCode.id.in_(targets))).scalars())
+            if targets - known:
+                raise ValueError(f"Unknown cost code id(s): {', '.join(map(str, sorted(targets - known)))}.")
+        if new_name:
+            new_name = new_name.strip()
+            if connection.execute(select(Project.id).where(Project.project_name == new_name)).first() is not None:
+                raise ValueError(f"A project named '{new_name}' already exists.")
+        else:
+            new_name = unique_project_name(connection, f"{source_name} (copy)")
+        new_id = _insert_project_copy(connection, source_id, new_name, status)
+        copied = _insert_line_item_copies(connection, source_id, new_id, quantity_factor, markup_percentage,
+                                          cost_code_map)
+        totals = store_rollup_totals(connection, new_id)
+    seconds = time.perf_counter() - start
+    return {'project_id': new_id, 'project_name': new_name, 'line_items': copied, 'totals': totals,
+            'seconds': seconds}
+
+
+def save_as_template(project_id, name=None, bind=None, **transforms):
+    """Copies a project as a template (see clone_project for the transforms)."""
+    return clone_project(project_id, name, status=TEMPLATE_STATUS, bind=bind, **transforms)
+
+
+def create_from_template(template_id, name=None, bind=None, **transforms):
+    """Starts a new project from a template (see clone_project for the transforms)."""
+    return clone_project(template_id, name, status=NEW_PROJECT_STATUS, bind=bind, **transforms)
+
+
+def list_templates(session):
+    """Returns (id, project_name) of every template, by name."""
+    return session.execute(
+        select(Project.id, Project.project_name)
+        .where(Project.project_status == TEMPLATE_STATUS)
+        .order_by(Project.project_name)
+    ).all()
+
+
+def used_cost_codes(session, project_id):
+    """Returns (id, code, name) of every cost code a project's line items use, by code."""
+    return session.execute(
+        select(CostCode.id, CostCode.code, CostCode.name)
+        .where(CostCode.id.in_(select(LineItem.cost_code_id).where(LineItem.project_id == project_id)))
+        .order_by(CostCode.code)
+    ).all()
+
+
+def _parse_cost_code_map(pairs):
+    # "OLD=NEW" cost codes -> {old id: new id}
+    if not pairs:
+        return None
+    codes = {}
+    for pair in pairs:
+        old, sep, new = pair.partition('=')
+        if not sep:
+            raise ValueError(f"Expected OLD=NEW, got '{pair}'.")
+        codes[old.strip()] = new.strip()
+    with engine.connect() as connection:
+        ids = dict(connection.execute(
+            select(CostCode.code, CostCode.id).where(CostCode.code.in_(set(codes) | set(codes.values())))
+        ).all())
+    unknown = sorted((set(codes) | set(codes.values())) - set(ids))
+    if unknown:
+        raise ValueError(f"Unknown cost code(s): {', '.join(unknown)}.")
+    return {ids[old]: ids[new] for old, new in codes.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Copy a project and its line items, or save it as a template.")
+    parser.add_argument('source_id', type=int)
+    parser.add_argument('--name', help="Name of the copy (default: '<source name> (copy)')")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiply every quantity by this factor")
+    parser.add_argument('--markup', type=float, help="Set every line item's markup to this percentage")
+    parser.add_argument('--map-cost-code', action='append', metavar='OLD=NEW',
+                        help="Replace a cost code (repeat for several)")
+    parser.add_argument('--template', action='store_true', help="Save the copy as a template")
+    args = parser.parse_args(argv)
+
+    from src.database import create_db_and_tables
+    create_db_and_tables()
+    try:
+        result = clone_project(args.source_id, args.name, quantity_factor=args.scale, markup_percentage=args.markup,
+                               cost_code_map=_parse_cost_code_map(args.map_cost_code),
+                               status=TEMPLATE_STATUS if args.template else NEW_PROJECT_STATUS)
+    except ValueError as e:
+        print(f"Clone failed: {e}")
+        return 1
+    print(f"Created {'template' if args.template else 'project'} {result['project_id']} '{result['project_name']}' "
+          f"with {result['line_items']} line items in {result['seconds']:.3f} s; "
+          f"final estimate ${result['totals']['final_project_estimate']:,.2f}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,7 +10,8 @@ from PySide6.QtCore import Qt, QDate, Signal, QSize
 from datetime import date
 
 # Import your database models
-from src.database import Session, Project, EstimateLineItem
+from src.database import Project, EstimateLineItem
+from src.session_manager import open_window_session
 
 # --- PDF GENERATION LIBRARY (Install if you haven't) ---
 # You'll need ReportLab for PDF generation.
@@ -33,7 +34,7 @@ class ProjectDetailsWindow(QMainWindow):
         self.setGeometry(200, 200, 1000, 800) # Adjust size for new window
         self.setMinimumSize(QSize(600, 500))
 
-        self.db_session = Session()
+        self.db_session = open_window_session() # Closed in closeEvent
         self.current_project_id = project_id
         self.current_line_item_id = None
         self.current_project_direct_cost = 0.0 # To store the sum of direct costs
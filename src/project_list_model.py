@@ -0,0 +1,149 @@
+# src/project_list_model.py
+"""
+Table model for the dashboard's project list.
+
+Rows are kept as plain tuples of the nine displayed columns and are only
+formatted when the view asks for them in data(). In browse mode the model
+pages through the projects table with keyset pagination (canFetchMore /
+fetchMore), so opening the dashboard costs one indexed LIMIT query no
+matter how many projects exist. Sorting is done by SQLite on indexed
+columns. In search mode the model simply shows the ranked rows handed to
+set_rows().
+"""
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from sqlalchemy import select, tuple_, or_, and_
+from src.database import Project
+from src.project_search import DASHBOARD_COLUMNS
+from src.instrumentation import instrumented_action
+
+HEADERS = [
+    "ID", "Project Name", "Client Name", "Status", "Bid Due Date",
+    "Project Start Date", "Completion Date", "Total Direct Cost", "Final Estimate"
+]
+MONEY_COLUMNS = (7, 8)
+PAGE_SIZE = 200
+
+
+class ProjectListModel(QAbstractTableModel):
+    def __init__(self, db_session, parent=None):
+        super().__init__(parent)
+        self.db_session = db_session
+        self._rows = []
+        self._sort_column = 0
+        self._sort_order = Qt.AscendingOrder
+        self._search_mode = False
+        self._exhausted = False
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            value = row[column]
+            if column in MONEY_COLUMNS:
+                return f"${value if value is not None else 0.0:.2f}"
+            return str(value) if value is not None else ""
+        if role == Qt.UserRole:
+            return row[0]
+        if role == Qt.TextAlignmentRole and column in MONEY_COLUMNS:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._search_mode and not self._exhausted
+
+    @instrumented_action('fetch_projects_page')
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        page = self._fetch_page(self._rows[-1] if self._rows else None)
+        if len(page) < PAGE_SIZE:
+            self._exhausted = True
+        if page:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._rows.extend(page)
+            self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        if self._search_mode:
+            # Search results are small and already in memory
+            self.layoutAboutToBeChanged.emit()
+            self._rows.sort(key=lambda r: (r[column] is not None, r[column] if r[column] is not None else 0),
+                            reverse=(order == Qt.DescendingOrder))
+            self.layoutChanged.emit()
+        else:
+            self.reset_paging()
+
+    # --- Loading ---
+
+    def reset_paging(self):
+        """Switches to browse mode and loads the first page in the current sort order."""
+        self.beginResetModel()
+        self._search_mode = False
+        self._exhausted = False
+        self._rows = []
+        self.endResetModel()
+        self.fetchMore()
+
+    def set_rows(self, rows):
+        """Switches to search mode and shows the given (already ranked) rows."""
+        self.beginResetModel()
+        self._search_mode = True
+        self._rows = list(rows)
+        self.endResetModel()
+
+    def project_id_at(self, row):
+        if 0 <= row < len(self._rows):
+            return self._rows[row][0]
+        return None
+
+    def _fetch_page(self, last_row):
+        # Keyset pagination: continue after the last loaded (sort value, id)
+        # instead of using OFFSET, so every page is an index range scan.
+        sort_col = DASHBOARD_COLUMNS[self._sort_column]
+        descending = self._sort_order == Qt.DescendingOrder
+        query = select(*DASHBOARD_COLUMNS)
+
+        if last_row is not None:
+            last_value, last_id = last_row[self._sort_column], last_row[0]
+            if sort_col is Project.id:
+                query = query.where(Project.id < last_id if descending else Project.id > last_id)
+            elif descending:
+                # Non-NULL values first (high to low), then NULLs
+                if last_value is None:
+                    query = query.where(and_(sort_col.is_(None), Project.id < last_id))
+                else:
+                    query = query.where(or_(tuple_(sort_col, Project.id) < tuple_(last_value, last_id), sort_col.is_(None)))
+            else:
+                # SQLite sorts NULLs first in ascending order
+                if last_value is None:
+                    query = query.where(or_(and_(sort_col.is_(None), Project.id > last_id), sort_col.isnot(None)))
+                else:
+                    query = query.where(tuple_(sort_col, Project.id) > tuple_(last_value, last_id))
+
+        if sort_col is Project.id:
+            order_by = [Project.id.desc() if descending else Project.id]
+        elif descending:
+            order_by = [sort_col.desc(), Project.id.desc()]
+        else:
+            order_by = [sort_col, Project.id]
+
+        return [tuple(row) for row in self.db_session.execute(query.order_by(*order_by).limit(PAGE_SIZE))]
@@ -6,10 +6,9 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal
 from datetime import date # Only needed for the __main__ block for standalone testing
 
-# Import your existing view windows. This new dialog will launch them.
-from general_info_view import GeneralInfoWindow
-from estimate_line_items_view import EstimateLineItemsView
-from src.database import Session, Project # Needed to fetch project details for display
+# The windows themselves are opened by the main app in response to this dialog's signals
+from src.database import Project # Needed to fetch project details for display
+from src.session_manager import open_window_session
 
 class ProjectOptionsDialog(QDialog):
     # Signals to communicate back to the main application
@@ -28,7 +27,7 @@ class ProjectOptionsDialog(QDialog):
         super().__init__(parent)
         self.project_id = project_id
         self.parent_app = parent # Store a reference to the main app (ContractorProApp instance)
-        self.db_session = Session() # Create a new database session for this dialog's operations
+        self.db_session = open_window_session() # This dialog's own unit of work, closed in done()
 
         self.setWindowTitle(f"Project Options - ID: {self.project_id}")
         self.setGeometry(200, 200, 400, 200) # Sets initial position (200,200) and size (400x200)
@@ -82,7 +81,7 @@ class ProjectOptionsDialog(QDialog):
         """Fetches the project's name from the database using its ID and updates the dialog's label and title."""
         try:
             # Query the database for the Project object matching the given project_id
-            project = self.db_session.query(Project).filter_by(project_id=self.project_id).first()
+            project = self.db_session.query(Project).filter_by(id=self.project_id).first()
             if project:
                 # If project found, update label with project name and ID, and update dialog window title
                 self.project_label.setText(f"<h2>Project: {project.project_name}<br>(ID: {self.project_id})</h2>")
@@ -111,11 +110,11 @@ class ProjectOptionsDialog(QDialog):
         # after the Estimate Line Items button is clicked.
         # self.accept() # Close the dialog
 
-    def closeEvent(self, event):
+    def done(self, result):
         """
-        Overrides the close event to ensure the database session is properly closed
-        when the ProjectOptionsDialog window is closed.
+        Closes the dialog's database session however the dialog ends (accepted,
+        rejected, Esc or the window's close button all end up here).
         """
         self.db_session.close() # Close the database session
-        super().closeEvent(event) # Call the base class's closeEvent to ensure proper Qt cleanup
+        super().done(result)
 
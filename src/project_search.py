@@ -0,0 +1,94 @@
+# src/project_search.py
+"""
+Project queries for the dashboard.
+
+Only the columns the dashboard displays are selected, and text search goes
+through the projects_fts full-text index (see database.py) with prefix
+matching and bm25 relevance ranking.
+"""
+
+import re
+import weakref
+from sqlalchemy import select, text, or_
+from src.database import Project
+
+# Columns shown in the dashboard table, in display order
+DASHBOARD_COLUMNS = (
+    Project.id, Project.project_name, Project.client_name, Project.project_status,
+    Project.bid_due_date, Project.project_start_date, Project.completion_date,
+    Project.total_direct_cost, Project.final_project_estimate,
+)
+
+DEFAULT_SEARCH_LIMIT = 500
+
+# bm25 weight per projects_fts column (same order as PROJECT_SEARCH_COLUMNS):
+# name and client matches rank above address, scope and notes matches.
+SEARCH_WEIGHTS = (10.0, 5.0, 3.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+
+# Engines known to have the projects_fts index; it is never dropped once created
+_engines_with_fts = weakref.WeakSet()
+
+
+def build_match_query(search_text):
+    """Turns free text into an FTS5 query where every word must match as a prefix."""
+    tokens = re.findall(r'\w+', search_text.lower())
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def has_fts_index(session):
+    """Whether the projects_fts index exists (it is missing when SQLite was built without FTS5)."""
+    bind = session.get_bind()
+    if bind in _engines_with_fts:
+        return True
+    found = session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'")
+    ).first() is not None
+    if found:
+        _engines_with_fts.add(bind)
+    return found
+
+
+def list_projects(session):
+    """Returns the dashboard rows for every project."""
+    return session.execute(select(*DASHBOARD_COLUMNS).order_by(Project.id)).all()
+
+
+def search_projects(session, search_text, limit=DEFAULT_SEARCH_LIMIT):
+    """
+    Full-text search over project and client names, contacts, addresses, scope of work and notes.
+
+    Args:
+        session: Database session.
+        search_text (str): What the user typed. Each word is matched as a prefix.
+        limit (int): Maximum number of rows to return.
+
+    Returns:
+        list: Dashboard rows, best match first.
+    """
+    match = build_match_query(search_text)
+    if not match:
+        return list_projects(session)
+
+    if not has_fts_index(session):
+        # No FTS5 in this SQLite build: fall back to a name/client scan. Any other error, including
+        # the interrupt of a superseded search, goes to the caller.
+        pattern = f"%{search_text.strip()}%"
+        return session.execute(
+            select(*DASHBOARD_COLUMNS)
+            .where(or_(Project.project_name.ilike(pattern), Project.client_name.ilike(pattern)))
+            .order_by(Project.id)
+            .limit(limit)
+        ).all()
+
+    column_list = ', '.join(f'p.{col.key}' for col in DASHBOARD_COLUMNS)
+    weights = ', '.join(str(w) for w in SEARCH_WEIGHTS)
+    return session.execute(
+        text(f"""
+            SELECT {column_list}
+            FROM projects_fts JOIN projects p ON p.id = projects_fts.rowid
+            WHERE projects_fts MATCH :match
+            ORDER BY bm25(projects_fts, {weights})
+            LIMIT :limit
+        """),
+        {'match': match, 'limit': limit},
+    ).all()
@@ -0,0 +1,146 @@
+# src/search_worker.py
+"""
+Background project search for the dashboard.
+
+Keystrokes are debounced, each search runs on a worker thread with its own
+database session, and only the results of the most recent search are
+delivered. A search that has been overtaken is interrupted inside SQLite (or
+taken off the queue if it has not started yet), so typing never waits on
+the database.
+"""
+
+import sqlite3
+import threading
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from sqlalchemy.exc import OperationalError
+from src.session_manager import worker_session
+from src.project_search import list_projects, search_projects
+from src.instrumentation import track_action
+
+
+class _SearchSignals(QObject):
+    finished = Signal(int, object)   # generation, list of row tuples (None if cancelled)
+    failed = Signal(int, str)        # generation, error message
+
+
+class ProjectSearchTask(QRunnable):
+    """Runs one dashboard query on a pool thread."""
+
+    def __init__(self, generation, search_text, signals):
+        super().__init__()
+        self.setAutoDelete(False) # The controller keeps a reference so it can cancel us
+        self.generation = generation
+        self.search_text = search_text
+        self.signals = signals
+        self.cancelled = False
+        self._dbapi_connection = None
+        self._lock = threading.Lock() # Guards _dbapi_connection so we never interrupt a pooled connection someone else is using
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            if self._dbapi_connection is not None:
+                try:
+                    self._dbapi_connection.interrupt() # Safe to call from another thread
+                except sqlite3.ProgrammingError:
+                    pass
+
+    def run(self):
+        if self.cancelled:
+            self.signals.finished.emit(self.generation, None)
+            return
+        rows = None
+        with worker_session() as session: # This pool thread's own session, closed when the search ends
+            try:
+                with self._lock:
+                    self._dbapi_connection = session.connection().connection.dbapi_connection
+                with track_action('search_projects'):
+                    if self.search_text:
+                        rows = search_projects(session, self.search_text)
+                    else:
+                        rows = list_projects(session)
+                rows = [tuple(row) for row in rows] # Plain tuples only cross the thread boundary
+            except OperationalError as e:
+                if not self.cancelled: # An interrupted query is expected when cancelled
+                    self.signals.failed.emit(self.generation, str(e))
+                    return
+            except Exception as e:
+                self.signals.failed.emit(self.generation, str(e))
+                return
+            finally:
+                with self._lock:
+                    self._dbapi_connection = None
+        self.signals.finished.emit(self.generation, None if self.cancelled else rows)
+
+
+class DebouncedProjectSearch(QObject):
+    """
+    Debounces search text and runs the query in the background.
+
+    Connect a QLineEdit's textChanged to request(); results_ready is emitted
+    on the GUI thread with the rows of the latest search only.
+    """
+    results_ready = Signal(object)
+    search_failed = Signal(str)
+
+    def __init__(self, delay_ms=250, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start_search)
+        self._signals = _SearchSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._generation = 0
+        self._pending_text = ""
+        self._active_tasks = {}
+
+    def request(self, search_text):
+        """Schedules a search once typing pauses for the debounce delay."""
+        self._pending_text = (search_text or "").strip()
+        self._generation += 1
+        self._timer.start()
+
+    def search_now(self, search_text):
+        """Runs a search immediately, e.g. to refresh the list after an edit."""
+        self._pending_text = (search_text or "").strip()
+        self._generation += 1
+        self._timer.stop()
+        self._start_search()
+
+    def cancel(self):
+        """Drops any scheduled or running search; its results will not be delivered."""
+        self._generation += 1
+        self._timer.stop()
+        self._cancel_active()
+
+    def _start_search(self):
+        self._cancel_active()
+        task = ProjectSearchTask(self._generation, self._pending_text, self._signals)
+        self._active_tasks[task.generation] = task
+        self._pool.start(task)
+
+    def _cancel_active(self):
+        for task in list(self._active_tasks.values()):
+            task.cancel()
+            if self._pool.tryTake(task): # Never started; drop it
+                self._active_tasks.pop(task.generation, None)
+
+    def _on_finished(self, generation, rows):
+        self._active_tasks.pop(generation, None)
+        if rows is not None and generation == self._generation: # Anything older is stale
+            self.results_ready.emit(rows)
+
+    def _on_failed(self, generation, message):
+        self._active_tasks.pop(generation, None)
+        if generation == self._generation:
+            self.search_failed.emit(message)
+
+    def shutdown(self, timeout_ms=2000):
+        """Stops pending work; call from the owning window's closeEvent."""
+        self._timer.stop()
+        self._cancel_active()
+        self._pool.waitForDone(timeout_ms)
@@ -0,0 +1,104 @@
+# src/session_manager.py
+"""
+Session lifetimes: one unit of work per window, one session per worker thread.
+
+Windows call open_window_session() when they open and close that session in
+their closeEvent (dialogs in done()). A window that is handed a session by
+its caller uses it but leaves closing it to the caller, so closing a child
+window never closes the dashboard's session.
+
+Window sessions are created with expire_on_commit=False: after a commit the
+objects a window holds keep their values instead of being reloaded one
+SELECT at a time on next access. The flip side is that those objects do not
+see what other windows save. No trigger or server default writes to a mapped
+row (the rollup triggers write project_rollups, which is always read with a
+fresh column SELECT), but anything computed or exported from an object
+another window can edit must reload it first: estimate_loader.load_estimate
+selects the project with populate_existing, and
+EstimateLineItemsWindow.update_project_totals refreshes it before every
+totals computation.
+
+The identity map only holds objects weakly, so rows nobody references are
+freed on their own. To bound the rest in long-running sessions, after every
+commit a session holding more than IDENTITY_MAP_LIMIT objects expunges all of
+them except those pinned with keep() (the objects a window edits across
+commits, such as its current project). Expunged objects stay readable; they
+just no longer belong to the session.
+
+Background threads use worker_session(), which hands each thread its own
+session from a thread-local registry and removes it when the work is done.
+Sessions must never be shared between threads.
+"""
+
+import threading
+import weakref
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker, scoped_session
+from src.database import engine
+
+IDENTITY_MAP_LIMIT = 5000 # Objects a window session may hold before it is trimmed after a commit
+
+_PINNED = 'pinned_objects'
+
+WindowSession = sessionmaker(bind=engine, expire_on_commit=False)
+WorkerSession = sessionmaker(bind=engine, expire_on_commit=False)
+_worker_sessions = scoped_session(WorkerSession, scopefunc=threading.get_ident)
+
+
+def open_window_session():
+    """Returns a new session for a window. The window closes it when it closes."""
+    return WindowSession()
+
+
+def keep(session, *objects):
+    """Pins objects in the session so trim_identity_map() never expunges them."""
+    pinned = session.info.setdefault(_PINNED, weakref.WeakSet())
+    for obj in objects:
+        if obj is not None:
+            pinned.add(obj)
+
+
+def trim_identity_map(session, limit=None):
+    """
+    Expunges every unpinned object once the session holds more than limit (default IDENTITY_MAP_LIMIT) of them.
+
+    Sessions with pending changes are left alone.
+
+    Returns:
+        int: Number of objects expunged.
+    """
+    limit = IDENTITY_MAP_LIMIT if limit is None else limit
+    if len(session.identity_map) <= limit or session.new or session.dirty or session.deleted:
+        return 0
+    pinned = session.info.get(_PINNED, ())
+    expunged = 0
+    for obj in list(session.identity_map.values()):
+        if obj not in pinned:
+            session.expunge(obj)
+            expunged += 1
+    return expunged
+
+
+@event.listens_for(WindowSession, 'after_commit')
+def _trim_after_commit(session):
+    trim_identity_map(session)
+
+
+@contextmanager
+def worker_session():
+    """
+    Yields the calling thread's session and closes it when the block ends.
+
+    Nested blocks on the same thread share the outer block's session; only the
+    outermost one closes it.
+    """
+    if _worker_sessions.registry.has():
+        yield _worker_sessions()
+        return
+    session = _worker_sessions()
+    try:
+        yield session
+    finally:
+        _worker_sessions.remove()
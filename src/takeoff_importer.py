@@ -0,0 +1,351 @@
+# src/takeoff_importer.py
+"""
+Streaming import of takeoff exports into a project's line items.
+
+Reads a CSV, Excel (.xlsx / .xlsm, needs openpyxl), JSON or JSON-lines file
+and maps its columns onto LineItem:
+
+    description   Description, Desc, Item, Item Description
+    quantity      Quantity, Qty
+    unit          Unit, UOM, Units
+    unit_cost     Unit Cost, Unit Price, Cost, Price
+    markup        Markup, Markup %, Markup Percentage
+    cost_code     Cost Code, Code
+    common_item   Common Item, Common Item Name
+    notes         Notes, Note, Comments
+
+Headers are matched case-insensitively, ignoring spaces, underscores and
+dashes; column_map overrides the match for any field. Quantity and unit cost
+are required and must be positive, like in the line items form; "$", "," and
+"%" are stripped from numbers. A row needs a description unless it names a
+common item, in which case the item's description and unit fill in whatever
+the row leaves blank. Cost codes (by code, or "code - name") and common items
+(by name) are resolved through dicts loaded once up front.
+
+Rows are read one at a time, validated, and written with executemany in
+chunks of CHUNK_SIZE, all in one transaction together with the project's new
+totals, so memory stays flat however long the file is and a failed import
+leaves the project untouched. Rows that fail validation do not stop the
+import: they are written, with the reason, to a rejected-rows CSV report.
+
+Usage:
+    python -m src.takeoff_importer PROJECT_ID FILE [--map field=Header ...] [--rejects report.csv]
+
+Set CONTRACTORPRO_DB_PROFILE=bulk-load for very large files that can be re-imported.
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+from itertools import chain
+
+from sqlalchemy import select, insert
+from src.database import engine, Project, LineItem, CostCode, CommonItem
+from src.catalog_loader import iter_rows
+from src.estimate_engine import store_rollup_totals
+
+CHUNK_SIZE = 5000
+REJECT_SAMPLE = 100 # Rejected rows kept in the returned stats; the report file has all of them
+
+COLUMN_ALIASES = {
+    'description': ('description', 'desc', 'item', 'item description'),
+    'quantity': ('quantity', 'qty'),
+    'unit': ('unit', 'uom', 'units'),
+    'unit_cost': ('unit cost', 'unit price', 'cost', 'price'),
+    'markup': ('markup', 'markup %', 'markup percentage'),
+    'cost_code': ('cost code', 'code'),
+    'common_item': ('common item', 'common item name'),
+    'notes': ('notes', 'note', 'comments'),
+}
+IMPORT_FIELDS = tuple(COLUMN_ALIASES)
+SPREADSHEET_EXTENSIONS = ('.xlsx', '.xlsm')
+SUPPORTED_EXTENSIONS = ('.csv', '.json', '.jsonl') + SPREADSHEET_EXTENSIONS
+
+
+def _header_key(header):
+    return ' '.join(re.split(r'[\s_\-]+', str(header).strip().lower())).strip()
+
+
+def iter_spreadsheet_rows(path):
+    """Yields one dict per row of the first sheet of an Excel workbook, keyed by the header row."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Importing Excel files needs the openpyxl package (pip install openpyxl), "
+                         "or save the sheet as CSV.") from None
+    workbook = load_workbook(path, read_only=True, data_only=True) # read_only streams rows from disk
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = [str(h) if h is not None else '' for h in next(rows, ())]
+        for values in rows:
+            if any(v is not None and str(v).strip() for v in values):
+                yield dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+def iter_takeoff_rows(path):
+    """Yields (row number, raw dict) for every row of a takeoff file; CSV and Excel rows are numbered as in a spreadsheet."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported takeoff file type '{ext}'. Use one of: {', '.join(SUPPORTED_EXTENSIONS)}")
+    rows = iter_spreadsheet_rows(path) if ext in SPREADSHEET_EXTENSIONS else iter_rows(path)
+    first = 1 if ext in ('.json', '.jsonl') else 2 # Row 1 is the header
+    for number, raw in enumerate(rows, start=first):
+        yield number, raw
+
+
+def resolve_columns(headers, column_map=None):
+    """
+    Matches file headers to import fields.
+
+    Args:
+        headers (iterable): Column names of the file.
+        column_map (dict): field -> header, taking precedence over the aliases.
+
+    Returns:
+        dict: field -> header for every field found in the file.
+    """
+    by_key = {}
+    for header in headers:
+        by_key.setdefault(_header_key(header), header)
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in (field,) + aliases:
+            if _header_key(alias) in by_key:
+                columns[field] = by_key[_header_key(alias)]
+                break
+    for field, header in (column_map or {}).items():
+        if field not in COLUMN_ALIASES:
+            raise ValueError(f"Unknown import field '{field}'. Choose one of: {', '.join(IMPORT_FIELDS)}")
+        if _header_key(header) not in by_key:
+            raise ValueError(f"Column '{header}' (mapped to {field}) is not in the file.")
+        columns[field] = by_key[_header_key(header)]
+    missing = [field for field in ('quantity', 'unit_cost') if field not in columns]
+    if 'description' not in columns and 'common_item' not in columns:
+        missing.insert(0, 'description')
+    if missing:
+        raise ValueError(f"No column found for: {', '.join(missing)}. Found columns: {', '.join(map(str, headers))}")
+    return columns
+
+
+def _cost_code_key(value):
+    return ' '.join(str(value).split()).lower()
+
+
+def load_lookups(connection):
+    """Cost codes (by normalized code) and common items (by lower-cased name), read once per import."""
+    cost_codes = {_cost_code_key(code): code_id for code_id, code in connection.execute(select(CostCode.id, CostCode.code))}
+    common_items = {
+        name.strip().lower(): (item_id, description, unit)
+        for item_id, name, description, unit in connection.execute(
+            select(CommonItem.id, CommonItem.name, CommonItem.description, CommonItem.unit))
+    }
+    return {'cost_codes': cost_codes, 'common_items': common_items}
+
+
+def _text(raw, columns, field):
+    header = columns.get(field)
+    value = raw.get(header) if header is not None else None
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _number(raw, columns, field):
+    header = columns.get(field)
+    value = raw.get(header) if header is not None else None
+    if value is None or isinstance(value, (int, float)):
+        return None if value is None else float(value)
+    cleaned = str(value).strip().replace('$', '').replace(',', '').replace('%', '')
+    try:
+        return float(cleaned) if cleaned else None
+    except ValueError:
+        raise ValueError(f"{header} '{value}' is not a number.") from None
+
+
+def line_item_from_row(raw, columns, lookups, project_id):
+    """
+    Validates one raw row and converts it to line_items column values.
+
+    Returns:
+        tuple: (values, None) for a valid row, (None, reason) for a rejected one.
+    """
+    try:
+        quantity = _number(raw, columns, 'quantity')
+        unit_cost = _number(raw, columns, 'unit_cost')
+        markup = _number(raw, columns, 'markup')
+    except ValueError as e:
+        return None, str(e)
+    if quantity is None or quantity <= 0:
+        return None, "Quantity is required and must be positive."
+    if unit_cost is None or unit_cost <= 0:
+        return None, "Unit cost is required and must be positive."
+    markup = markup or 0.0
+    if not 0 <= markup <= 100:
+        return None, f"Markup {markup:g}% is outside 0-100%."
+
+    description = _text(raw, columns, 'description')
+    unit = _text(raw, columns, 'unit')
+    common_item_id = None
+    common_item_name = _text(raw, columns, 'common_item')
+    if common_item_name:
+        common_item = lookups['common_items'].get(common_item_name.lower())
+        if common_item is None:
+            return None, f"Unknown common item '{common_item_name}'."
+        common_item_id, item_description, item_unit = common_item
+        description = description or item_description or common_item_name
+        unit = unit or item_unit
+    if not description:
+        return None, "Description is required."
+
+    cost_code_id = None
+    cost_code = _text(raw, columns, 'cost_code')
+    if cost_code:
+        cost_code_id = lookups['cost_codes'].get(_cost_code_key(cost_code))
+        if cost_code_id is None and ' - ' in cost_code: # "03 30 00 - Cast-in-Place Concrete", as the form shows them
+            cost_code_id = lookups['cost_codes'].get(_cost_code_key(cost_code.split(' - ', 1)[0]))
+        if cost_code_id is None:
+            return None, f"Unknown cost code '{cost_code}'."
+
+    return {
+        'project_id': project_id,
+        'description': description,
+        'quantity': quantity,
+        'unit': unit or "",
+        'unit_cost': unit_cost,
+        'markup_percentage': markup,
+        'notes': _text(raw, columns, 'notes') or "",
+        'is_common_item': 1 if common_item_id else 0,
+        'common_item_id': common_item_id,
+        'cost_code_id': cost_code_id,
+    }, None
+
+
+def default_rejects_path(path):
+    """takeoff.csv -> takeoff.rejected.csv, next to the imported file."""
+    return f"{os.path.splitext(path)[0]}.rejected.csv"
+
+
+class _RejectsReport:
+    """Streams rejected rows to a CSV file, opened on the first rejection."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    def write(self, number, reason, raw):
+        if self.path is None:
+            return
+        if self._writer is None:
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, ['row', 'reason'] + [str(h) for h in raw], extrasaction='ignore')
+            self._writer.writeheader()
+        self._writer.writerow(dict({str(h): v for h, v in raw.items()}, row=number, reason=reason))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def import_takeoff(project_id, path, column_map=None, rejects_path=None, bind=None):
+    """
+    Imports every valid row of a takeoff file as line items of a project, in one transaction.
+
+    Args:
+        project_id (int): Project receiving the line items.
+        path (str): Takeoff file (.csv, .xlsx, .xlsm, .json or .jsonl).
+        column_map (dict): field -> header overrides (fields are IMPORT_FIELDS).
+        rejects_path (str): Where to write the rejected-rows report. None writes no report.
+        bind: Engine to import into. Defaults to the application engine.
+
+    Returns:
+        dict: 'imported', 'rejected', 'rejects' (the first REJECT_SAMPLE (row, reason) pairs),
+        'rejects_path' (None if no row was rejected), 'totals' and 'seconds'.
+
+    Raises:
+        ValueError: Unknown project, unsupported file or missing required columns. Nothing is imported.
+    """
+    bind = bind if bind is not None else engine
+    start = time.perf_counter()
+    stats = {'imported': 0, 'rejected': 0, 'rejects': [], 'rejects_path': None, 'totals': None, 'seconds': 0.0}
+    rows = iter_takeoff_rows(path)
+    first = next(rows, None)
+    report = _RejectsReport(rejects_path)
+    try:
+        with bind.begin() as connection:
+            if connection.execute(select(Project.id).where(Project.id == project_id)).first() is None:
+                raise ValueError(f"Project {project_id} not found.")
+            if first is not None:
+                columns = resolve_columns(first[1].keys(), column_map)
+                lookups = load_lookups(connection)
+                stmt = insert(LineItem.__table__)
+                chunk = []
+                for number, raw in chain([first], rows):
+                    values, reason = line_item_from_row(raw, columns, lookups, project_id)
+                    if values is None:
+                        stats['rejected'] += 1
+                        if len(stats['rejects']) < REJECT_SAMPLE:
+                            stats['rejects'].append((number, reason))
+                        report.write(number, reason, raw)
+                        continue
+                    chunk.append(values)
+                    if len(chunk) >= CHUNK_SIZE:
+                        connection.execute(stmt, chunk)
+                        stats['imported'] += len(chunk)
+                        chunk = []
+                if chunk:
+                    connection.execute(stmt, chunk)
+                    stats['imported'] += len(chunk)
+            stats['totals'] = store_rollup_totals(connection, project_id)
+    finally:
+        report.close()
+    if stats['rejected'] and rejects_path is not None:
+        stats['rejects_path'] = rejects_path
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def _parse_column_map(pairs):
+    column_map = {}
+    for pair in pairs or ():
+        field, sep, header = pair.partition('=')
+        if not sep:
+            raise ValueError(f"Expected field=Header, got '{pair}'.")
+        column_map[field.strip()] = header.strip()
+    return column_map
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import a takeoff file as line items of a project.")
+    parser.add_argument('project_id', type=int)
+    parser.add_argument('path')
+    parser.add_argument('--map', action='append', metavar='FIELD=HEADER',
+                        help=f"Column for a field (repeat for several); fields: {', '.join(IMPORT_FIELDS)}")
+    parser.add_argument('--rejects', help="Rejected-rows report (default: FILE.rejected.csv next to the file)")
+    args = parser.parse_args(argv)
+
+    from src.database import create_db_and_tables
+    create_db_and_tables()
+    try:
+        stats = import_takeoff(args.project_id, args.path, _parse_column_map(args.map),
+                               rejects_path=args.rejects or default_rejects_path(args.path))
+    except ValueError as e:
+        print(f"Import failed: {e}")
+        return 1
+    print(f"Imported {stats['imported']} line items in {stats['seconds']:.2f} s; "
+          f"final estimate now ${stats['totals']['final_project_estimate']:,.2f}.")
+    if stats['rejected']:
+        print(f"{stats['rejected']} rows rejected, see {stats['rejects_path']}:")
+        for number, reason in stats['rejects'][:10]:
+            print(f"  row {number}: {reason}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())